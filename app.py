@@ -1,10 +1,15 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-from sklearn.preprocessing import LabelEncoder
-import plotly.express as px
-import plotly.graph_objects as go
+from cleaning import clean_form
+from comparables import load_comparables_index
+from conformal import load_conformal_table
+from market_stats import load_market_stats
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_predictor, load_shared_model, predictor_stat
+from option_index import load_option_index
+from prediction_cache import load_prediction_cache
+from sensitivity import CURVES, price_curves
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -371,74 +376,82 @@ with col2:
     if st.button("🔍 Exper Online", use_container_width=True):
         st.switch_page("pages/exper_online.py")
 
-# Model yükleme fonksiyonu
-@st.cache_data
+# Model yükleme fonksiyonu (süreç genelinde tek kopya)
+@st.cache_resource
 def load_model():
     try:
-        model = joblib.load('best_car_price_model.pkl')
+        model = load_shared_model()
         return model
     except FileNotFoundError:
         st.error("Model dosyası bulunamadı! Lütfen 'best_car_price_model.pkl' dosyasının mevcut olduğundan emin olun.")
         return None
 
-# Veri setinden unique değerleri al
-@st.cache_data
-def load_unique_values():
+# Tahmin nesnesi: yerel XGBoost modeli varsa Booster.inplace_predict hızlı yolu
+# (model dosyalarının stat değeri anahtarda olduğu için dosya değişince yeniden yüklenir)
+@st.cache_resource(max_entries=1)
+def load_price_predictor(model_stat):
     try:
-        df = pd.read_csv('cars_tr.csv')
-        
-        # Sütun isimlerini düzelt
-        df = df.rename(columns={
-            'kilometre(Km)': 'yıl_temp',
-            'yıl': 'kilometre(Km)',
-            'hasarGecmisi': 'tramer'
-        })
-        df = df.rename(columns={'yıl_temp': 'yıl'})
-        
-        # Unique değerleri çıkar
-        unique_values = {
-            'marka': sorted(df['marka'].dropna().unique().tolist()),
-            'seri': sorted(df['seri'].dropna().unique().tolist()),
-            'model': sorted(df['model'].dropna().unique().tolist()),
-            'vitesTipi': sorted(df['vitesTipi'].dropna().unique().tolist()),
-            'yakitTuru': sorted(df['yakitTuru'].dropna().unique().tolist()),
-            'kasaTipi': sorted(df['kasaTipi'].dropna().unique().tolist()),
-            'renk': sorted(df['renk'].dropna().unique().tolist()),
-            'cekisTipi': sorted(df['cekisTipi'].dropna().unique().tolist())
-        }
-        return unique_values, df
+        return load_predictor()
+    except FileNotFoundError:
+        return None
+
+# Filtreli seçenek indeksi (marka → seri → model → teknik özellikler)
+@st.cache_resource
+def load_options():
+    try:
+        return load_option_index()
     except FileNotFoundError:
         st.error("Veri seti dosyası bulunamadı!")
-        return None, None
+        return None
 
-# Filtrelenmiş seçenekleri getir
-@st.cache_data
-def get_filtered_options(df, marka=None, seri=None, model=None):
-    filtered_df = df.copy()
-    
-    if marka:
-        filtered_df = filtered_df[filtered_df['marka'] == marka]
-    if seri:
-        filtered_df = filtered_df[filtered_df['seri'] == seri]
-    if model:
-        filtered_df = filtered_df[filtered_df['model'] == model]
-    
-    return {
-        'seri': sorted(filtered_df['seri'].dropna().unique().tolist()) if marka else [],
-        'model': sorted(filtered_df['model'].dropna().unique().tolist()) if seri else [],
-        'vitesTipi': sorted(filtered_df['vitesTipi'].dropna().unique().tolist()) if model else [],
-        'yakitTuru': sorted(filtered_df['yakitTuru'].dropna().unique().tolist()) if model else [],
-        'kasaTipi': sorted(filtered_df['kasaTipi'].dropna().unique().tolist()) if model else [],
-        'cekisTipi': sorted(filtered_df['cekisTipi'].dropna().unique().tolist()) if model else []
-    }
-
-# Model ve veri yükle
-model = load_model()
-unique_values, df_main = load_unique_values()
-
-if model is None or unique_values is None or df_main is None:
+# Tahmin önbelleği (PREDICTION_CACHE_DB ile süreçler arası paylaşılabilir;
+# kayıtlar tahmini yapan nesnenin model özetiyle işaretlenir)
+@st.cache_resource
+def load_cache():
+    return load_prediction_cache()
+
+# Konformal tahmin aralığı tablosu (test bölümünden kalibre edilmiş)
+@st.cache_resource
+def load_intervals():
+    try:
+        return load_conformal_table()
+    except FileNotFoundError:
+        return None
+
+# Benzer ilanlar indeksi (model bölümlü normalize matris)
+@st.cache_resource
+def load_comparables():
+    try:
+        return load_comparables_index()
+    except FileNotFoundError:
+        return None
+
+# Piyasa istatistikleri küpü (istek anında groupby yapılmaz)
+@st.cache_resource
+def load_market():
+    try:
+        return load_market_stats()
+    except FileNotFoundError:
+        return None
+
+# Fiyat duyarlılık eğrileri (her yapılandırma ve model için bir kez hesaplanır;
+# model özeti anahtarda olduğu için model değişince eski eğriler kullanılmaz)
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_price_curves(form_items, model_sha256, _predict_forms):
+    return price_curves(dict(form_items), _predict_forms)
+
+# Model ve veri yükle (pickle'daki regressor yalnızca özellik önem grafiğinde yüklenir)
+predictor = load_price_predictor(predictor_stat())
+option_index = load_options()
+market = load_market()
+feature_pipeline = load_feature_pipeline()
+prediction_cache = load_cache()
+
+if predictor is None or option_index is None:
     st.stop()
 
+unique_values = option_index.unique_values
+
 # Sidebar - Araç bilgileri girişi
 st.sidebar.markdown('<h2 class="sub-header">🔧 Araç Bilgileri</h2>', unsafe_allow_html=True)
 
@@ -450,7 +463,7 @@ marka = st.sidebar.selectbox(
 )
 
 # Filtrelenmiş seçenekleri al
-filtered_options = get_filtered_options(df_main, marka, None, None)
+filtered_options = option_index.filtered_options(marka, None, None)
 
 # Seri seçimi (markaya göre filtrelenmiş)
 if marka and len(filtered_options['seri']) > 0:
@@ -466,7 +479,7 @@ else:
 
 # Model seçimi (marka ve seriye göre filtrelenmiş)
 if seri:
-    filtered_options = get_filtered_options(df_main, marka, seri, None)
+    filtered_options = option_index.filtered_options(marka, seri, None)
     if len(filtered_options['model']) > 0:
         model_name = st.sidebar.selectbox(
             "Model",
@@ -506,7 +519,7 @@ st.sidebar.markdown('<h3 class="sub-header">⚙️ Teknik Özellikler</h3>', uns
 
 # Teknik özellikler (seçilen modele göre filtrelenmiş)
 if model_name:
-    filtered_options = get_filtered_options(df_main, marka, seri, model_name)
+    filtered_options = option_index.filtered_options(marka, seri, model_name)
     
     # Vites tipi
     if len(filtered_options['vitesTipi']) > 0:
@@ -662,123 +675,40 @@ predict_button = st.sidebar.button(
     use_container_width=True
 )
 
+# Önbellek sayaçları tahminden sonra doldurulur
+cache_status = st.sidebar.empty()
+
 # Ana sayfa içeriği
 if predict_button:
     try:
         # Veri hazırlama
         def prepare_data():
-            # Güçlü veri temizleme fonksiyonu
-            def clean_numeric_value(value, default=0):
-                """Sayısal değeri temizle ve float'a dönüştür"""
-                if pd.isna(value) or value is None:
-                    return default
-                
-                if isinstance(value, (int, float)):
-                    return float(value)
-                
-                if isinstance(value, str):
-                    # String'den sayısal değeri çıkar
-                    import re
-                    # Sadece sayıları ve nokta/virgülü al
-                    cleaned = re.sub(r'[^\d.,]', '', str(value))
-                    if cleaned:
-                        # Nokta ve virgülü temizle (Türkçe sayı formatı)
-                        cleaned = cleaned.replace('.', '').replace(',', '.')
-                        try:
-                            return float(cleaned)
-                        except:
-                            return default
-                return default
-            
-            # Label encoders oluştur
-            le_marka = LabelEncoder()
-            le_seri = LabelEncoder()
-            le_model = LabelEncoder()
-            le_kasa = LabelEncoder()
-            le_cekis = LabelEncoder()
-            
-            # Veri setinden fit et
-            df_temp = pd.read_csv('cars_tr.csv')
-            df_temp = df_temp.rename(columns={
-                'kilometre(Km)': 'yıl_temp',
-                'yıl': 'kilometre(Km)',
-                'hasarGecmisi': 'tramer'
-            })
-            df_temp = df_temp.rename(columns={'yıl_temp': 'yıl'})
-            
-            le_marka.fit(df_temp['marka'])
-            le_seri.fit(df_temp['seri'])
-            le_model.fit(df_temp['model'])
-            le_kasa.fit(df_temp['kasaTipi'])
-            le_cekis.fit(df_temp['cekisTipi'])
-            
-            # Kullanıcı verilerini encode et
-            marka_encoded = le_marka.transform([marka])[0]
-            seri_encoded = le_seri.transform([seri])[0]
-            model_encoded = le_model.transform([model_name])[0]
-            kasa_encoded = le_kasa.transform([kasa_tipi])[0]
-            cekis_encoded = le_cekis.transform([cekis_tipi])[0]
-            
-            # Hasar skoru hesapla
-            hasar_skoru = 0
-            if boya_durumu == "Lokal Boyalı":
-                hasar_skoru = 1
-            elif boya_durumu == "Boyalı":
-                hasar_skoru = 1
-            elif boya_durumu == "Değişmiş":
-                hasar_skoru = 2
-            elif boya_durumu == "Belirtilmemiş":
-                hasar_skoru = 1
-            
-            # One-hot encoding için vites, yakıt ve renk
-            vites_encoded = {
-                'vites_Düz': 1 if vites_tipi == 'Düz' else 0,
-                'vites_Otomatik': 1 if vites_tipi == 'Otomatik' else 0,
-                'vites_Yarı Otomatik': 1 if vites_tipi == 'Yarı Otomatik' else 0
-            }
-            
-            yakit_encoded = {
-                'yakit_Benzin': 1 if yakit_turu == 'Benzin' else 0,
-                'yakit_Dizel': 1 if yakit_turu == 'Dizel' else 0,
-                'yakit_Elektrik': 1 if yakit_turu == 'Elektrik' else 0,
-                'yakit_Hibrit': 1 if yakit_turu == 'Hibrit' else 0,
-                'yakit_LPG & Benzin': 1 if yakit_turu == 'LPG & Benzin' else 0
+            # Kenar çubuğu alanları tahmin servisiyle aynı form kaydını oluşturur
+            return {
+                'marka': marka,
+                'seri': seri,
+                'model': model_name,
+                'yil': yil,
+                'kilometre': kilometre,
+                'vites_tipi': vites_tipi,
+                'yakit_turu': yakit_turu,
+                'kasa_tipi': kasa_tipi,
+                'renk': renk,
+                'cekis_tipi': cekis_tipi,
+                'motor_hacmi': motor_hacmi,
+                'motor_gucu': motor_gucu,
+                'arac_vergisi': arac_vergisi,
+                'tramer': tramer,
+                'boya_durumu': boya_durumu
             }
-            
-            # Renk encoding - tüm renk kategorileri için
-            renk_encoded = {}
-            for color in unique_values['renk']:
-                renk_encoded[f'renk_{color}'] = 1 if color == renk else 0
-            
-            # Tüm özellikleri birleştir - güçlü veri temizleme ile
-            clean_kilometre = clean_numeric_value(kilometre, 100000)
-            clean_yil = clean_numeric_value(yil, 2020)
-            clean_motor_hacmi = clean_numeric_value(motor_hacmi, 1600)
-            clean_motor_gucu = clean_numeric_value(motor_gucu, 120)
-            clean_arac_vergisi = clean_numeric_value(arac_vergisi, 2000)
-            clean_tramer = clean_numeric_value(tramer, 0)
-            
-            features = [
-                clean_kilometre, clean_yil, clean_motor_hacmi, clean_motor_gucu, 
-                clean_arac_vergisi, clean_tramer,
-                marka_encoded, seri_encoded, model_encoded, kasa_encoded, cekis_encoded,
-                hasar_skoru
-            ]
-            
-            # One-hot encoded özellikler
-            features.extend(list(vites_encoded.values()))
-            features.extend(list(yakit_encoded.values()))
-            features.extend(list(renk_encoded.values()))
-            
-            # Eksik özellikleri 0 ile doldur (toplam 43 özellik olmalı)
-            while len(features) < 43:
-                features.append(0)
-            
-            return np.array(features).reshape(1, -1)
         
-        # Tahmin yap
-        features = prepare_data()
-        prediction = model.predict(features)[0]
+        def predict_forms(forms):
+            features = feature_pipeline.transform(clean_form(pd.DataFrame(forms)))
+            return predictor.predict(features)
+        
+        # Tahmin yap (aynı yapılandırma önbellekten gelir)
+        form = prepare_data()
+        prediction = prediction_cache.predict([form], predict_forms, predictor.source_sha256)[0]
         
         # Dataset hakkında bilgi
         st.markdown("""
@@ -789,10 +719,10 @@ if predict_button:
             </h3>
             <p style="color: #495057; font-size: 1.1rem; line-height: 1.6; margin: 0; font-weight: 500;">
                 Makine öğrenmesi algoritması, girdiğiniz araç özelliklerini analiz ederek aşağıdaki fiyat tahminini hesaplamıştır. 
-                Bu tahmin, <strong>6,675+ araç verisi</strong> üzerinde eğitilmiş <strong>XGBoost modeli</strong> kullanılarak oluşturulmuştur.
+                Bu tahmin, <strong>{} araç verisi</strong> üzerinde eğitilmiş <strong>XGBoost modeli</strong> kullanılarak oluşturulmuştur.
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """.format(f"{market.rows:,}" if market is not None else "binlerce"), unsafe_allow_html=True)
         
         # Tahmin sonucu - Basit tasarım
         st.markdown("""
@@ -851,38 +781,84 @@ if predict_button:
             </div>
             """.format(motor_hacmi, motor_gucu, arac_vergisi, tramer, boya_durumu), unsafe_allow_html=True)
         
+        # Fiyat duyarlılığı: üç eğrinin tüm noktaları tek predict çağrısıyla hesaplanır
+        st.markdown('<h3 class="sub-header">📈 Fiyat Duyarlılığı</h3>', unsafe_allow_html=True)
+        
+        try:
+            import plotly.express as px
+            
+            curves = load_price_curves(tuple(sorted(form.items())), predictor.source_sha256, predict_forms)
+            for column, (field, (grid, prices)) in zip(st.columns(len(curves)), curves.items()):
+                spec = CURVES[field]
+                fig = px.line(
+                    x=grid,
+                    y=prices,
+                    title=f"{spec['baslik']} - Fiyat",
+                    labels={'x': f"{spec['baslik']} {spec['birim']}".strip(), 'y': 'Tahmini Fiyat (TL)'}
+                )
+                fig.add_vline(x=form[field], line_dash='dash', line_color='#2E86AB')
+                fig.update_layout(height=320, margin=dict(l=10, r=10, t=50, b=10))
+                column.plotly_chart(fig, use_container_width=True)
+        except Exception as e:
+            st.warning(f"Fiyat duyarlılık eğrileri gösterilemedi: {e}")
+        
+        # Aynı modelin en benzer gerçek ilanları
+        comparables = load_comparables()
+        if comparables is not None:
+            neighbours = comparables.query(form)
+            if len(neighbours):
+                st.markdown('<h3 class="sub-header">🚘 Benzer İlanlar</h3>', unsafe_allow_html=True)
+                st.dataframe(
+                    neighbours.drop(columns='mesafe').round().astype('Int64').rename(columns={
+                        'ilanID': 'İlan No', 'yıl': 'Yıl', 'kilometre(Km)': 'Kilometre',
+                        'motorGucu(HP)': 'Motor Gücü (HP)', 'motorHacmi(Cc)': 'Motor Hacmi (cc)',
+                        'fiyat(TRY)': 'İlan Fiyatı (TL)'
+                    }),
+                    hide_index=True, use_container_width=True
+                )
+                st.caption(f"{form['marka']} {form['seri']} {form['model']} ilanları yıl, kilometre, motor gücü "
+                           f"ve motor hacmine göre en yakından uzağa sıralanmıştır.")
+        
+        # Seçilen modelin piyasa özeti (küpten hücre araması)
+        model_stats = market.summary('model', form['marka'], form['seri'], form['model']) if market is not None else None
+        if model_stats is not None:
+            st.markdown('<h3 class="sub-header">💹 Piyasa Özeti</h3>', unsafe_allow_html=True)
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("İlan Sayısı", f"{model_stats['adet']:,}")
+            with col2:
+                st.metric("Ortalama Fiyat", f"{model_stats['ortalama']:,.0f} TL")
+            with col3:
+                st.metric("Medyan Fiyat", f"{model_stats['medyan']:,.0f} TL")
+            with col4:
+                st.metric("Fiyat Aralığı", f"{model_stats['en_dusuk']:,.0f} - {model_stats['en_yuksek']:,.0f} TL")
+            
+            by_year = market.breakdown('model_yil', form['marka'], form['seri'], form['model'])
+            by_fuel = market.breakdown('model_yakit', form['marka'], form['seri'], form['model'])
+            columns = {'adet': 'İlan', 'ortalama': 'Ortalama (TL)', 'medyan': 'Medyan (TL)',
+                       'en_dusuk': 'En Düşük (TL)', 'en_yuksek': 'En Yüksek (TL)'}
+            col1, col2 = st.columns(2)
+            with col1:
+                st.dataframe(by_year.rename(columns={'yıl': 'Yıl', **columns}).round(), hide_index=True,
+                             use_container_width=True)
+            with col2:
+                st.dataframe(by_fuel.rename(columns={'yakitTuru': 'Yakıt Türü', **columns}).round(), hide_index=True,
+                             use_container_width=True)
+        
         # Model açıklanabilirliği
         st.markdown('<h3 class="sub-header">🔍 Model Açıklanabilirliği</h3>', unsafe_allow_html=True)
         
         # Özellik önem grafiği
+        model = load_model()
         if hasattr(model, 'feature_importances_'):
             try:
-                importance = model.feature_importances_
-                
-                # 43 özellik için isim listesi
-                feature_names = [
-                    'Kilometre', 'Yıl', 'Motor Hacmi', 'Motor Gücü', 'Araç Vergisi', 'Tramer',
-                    'Marka', 'Seri', 'Model', 'Kasa Tipi', 'Çekiş Tipi', 'Hasar Skoru',
-                    'Vites_Düz', 'Vites_Otomatik', 'Vites_Yarı Otomatik',
-                    'Yakıt_Benzin', 'Yakıt_Dizel', 'Yakıt_Elektrik', 'Yakıt_Hibrit', 'Yakıt_LPG & Benzin'
-                ]
-                
-                # Renk kategorileri ekle
-                try:
-                    renk_categories = unique_values['renk']
-                    feature_names.extend([f'Renk_{color}' for color in renk_categories])
-                except:
-                    # Varsayılan renkler
-                    default_colors = ['Beyaz', 'Siyah', 'Gri', 'Mavi', 'Kırmızı', 'Yeşil', 'Sarı', 'Turuncu', 'Mor', 'Kahverengi']
-                    feature_names.extend([f'Renk_{color}' for color in default_colors])
+                import plotly.express as px
                 
-                # Eksik özellik isimlerini tamamla
-                while len(feature_names) < len(importance):
-                    feature_names.append(f'Özellik_{len(feature_names)}')
+                importance = model.feature_importances_
                 
-                # Fazla özellik isimlerini kırp
-                if len(feature_names) > len(importance):
-                    feature_names = feature_names[:len(importance)]
+                # Model sırasıyla özellik isimleri
+                feature_names = feature_pipeline.display_names()
                 
                 # En önemli 10 özellik
                 top_n = min(10, len(importance))
@@ -913,16 +889,25 @@ if predict_button:
         # Tahmin güven aralığı
         st.markdown("### 📊 Tahmin Güvenilirliği")
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric("Tahmin Doğruluğu", "90%", "5%")
-        
-        with col2:
-            st.metric("Güven Aralığı", "±15%", "2%")
-        
-        with col3:
-            st.metric("Model Güvenilirliği", "Yüksek", "↑")
+        conformal_table = load_intervals()
+        if conformal_table is not None:
+            low, high = conformal_table.interval(prediction, marka)
+            report = conformal_table.report
+            
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric(f"Tahmin Aralığı (%{conformal_table.coverage * 100:.0f})", f"{low:,.0f} - {high:,.0f} TL")
+            
+            with col2:
+                st.metric("Göreli Aralık", f"±{(high - low) / prediction / 2:.1%}")
+            
+            with col3:
+                st.metric("Test Kümesinde Kapsama", f"{report.get('kapsama', 0):.1%}",
+                          f"hedef {report.get('hedef', conformal_table.coverage):.0%}", delta_color="off")
+            
+            st.caption("Aralık, eğitimde ayrılan test ilanlarının marka ve fiyat bandına göre "
+                       "göreli hatalarından (konformal tahmin) hesaplanmıştır.")
         
         # Bilgi kutusu
         st.markdown("""
@@ -963,19 +948,28 @@ else:
     # İstatistikler
     st.markdown('<h3 class="sub-header">📊 Veri Seti İstatistikleri</h3>', unsafe_allow_html=True)
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Toplam Araç", "6,675")
-    
-    with col2:
-        st.metric("Marka Sayısı", "31")
-    
-    with col3:
-        st.metric("Model Sayısı", "1,021")
-    
-    with col4:
-        st.metric("Ortalama Fiyat", "786,610 TL")
+    if market is not None:
+        overall = market.summary('genel')
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Toplam Araç", f"{overall['adet']:,}")
+        
+        with col2:
+            st.metric("Marka Sayısı", f"{market.cell_count('marka'):,}")
+        
+        with col3:
+            st.metric("Model Sayısı", f"{market.cell_count('model'):,}")
+        
+        with col4:
+            st.metric("Ortalama Fiyat", f"{overall['ortalama']:,.0f} TL")
+
+# Önbellek sayaçları
+cache_stats = prediction_cache.stats()
+cache_status.caption(
+    f"⚡ Önbellek: {cache_stats['isabet']} isabet · {cache_stats['kayip']} kayıp · "
+    f"{cache_stats['cikarma']} çıkarma (%{cache_stats['isabet_orani'] * 100:.0f})"
+)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Toplu Fiyat Tahmini
+
+cars_tr.csv şemasındaki ilan dosyasını sabit boyutlu parçalar halinde okur,
+ham alanları temizler, modelin özellik düzenine çevirir ve tahminleri CSV
+veya Parquet dosyasına akıtır. Bellek kullanımı girdi boyutundan bağımsızdır.
+
+Kullanım:
+    python batch_predict.py ilanlar.csv tahminler.csv
+    python batch_predict.py ilanlar.csv tahminler.parquet --chunk-size 50000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_listings, read_listings
+from conformal import load_conformal_table
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_predictor
+
+# Çıktıya taşınan kimlik ve özet sütunları
+OUTPUT_COLUMNS = ['ilanID', 'marka', 'seri', 'model', 'yıl', 'kilometre(Km)', 'fiyat(TRY)']
+TEXT_COLUMNS = ['marka', 'seri', 'model']
+PREDICTION_COLUMN = 'tahmini_fiyat'
+# Konformal tahmin aralığının sınırları
+INTERVAL_COLUMNS = ('alt_sinir', 'ust_sinir')
+
+
+_predictor = None
+
+
+def init_worker():
+    """Her süreçte modeli ve pipeline'ı bir kez yükle"""
+    global _predictor
+    _predictor = load_predictor()
+    load_feature_pipeline()
+    load_conformal_table()
+
+
+def predict_chunk(chunk):
+    """Bir parçayı temizle, kodla ve tahmin et"""
+    if _predictor is None:
+        init_worker()
+
+    cleaned = clean_listings(chunk)
+    features = load_feature_pipeline().transform(cleaned)
+
+    result = pd.DataFrame(index=cleaned.index)
+    for column in OUTPUT_COLUMNS:
+        if column in cleaned:
+            result[column] = cleaned[column]
+    for column in TEXT_COLUMNS:
+        result[column] = result[column].astype('string')
+    predictions = np.round(_predictor.predict(features)).astype(np.float64)
+    low, high = load_conformal_table().intervals(predictions, result['marka'].to_numpy(dtype=object, na_value=None))
+    result[PREDICTION_COLUMN] = predictions
+    result[INTERVAL_COLUMNS[0]] = np.round(low)
+    result[INTERVAL_COLUMNS[1]] = np.round(high)
+    return result
+
+
+class ResultWriter:
+    """Tahminleri parça parça CSV veya Parquet dosyasına yazar"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.lower().endswith('.parquet')
+        self.writer = None
+        self.rows = 0
+
+    def write(self, result):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self.writer is None:
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(result, schema=self.writer.schema, preserve_index=False)
+            self.writer.write_table(table)
+        else:
+            result.to_csv(self.path, mode='w' if self.rows == 0 else 'a',
+                          header=self.rows == 0, index=False)
+        self.rows += len(result)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def iter_results(chunks, workers):
+    """Parçaları sırayla veya süreç havuzunda işle (sıra korunur)"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield predict_chunk(chunk)
+        return
+
+    # Bellekte en fazla 2 x workers parça bekler
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(predict_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def run_batch(input_path, output_path, chunk_size=20000, workers=1, verbose=True):
+    """Toplu tahmini çalıştır ve işlenen satır sayısını döndür"""
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    start = time.perf_counter()
+    writer = ResultWriter(output_path)
+    try:
+        chunks = read_listings(input_path, chunksize=chunk_size)
+        for result in iter_results(chunks, workers):
+            writer.write(result)
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"   {writer.rows:,} satır | {writer.rows / elapsed:,.0f} satır/sn", file=sys.stderr)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    if verbose:
+        print(f"✅ {writer.rows:,} satır {elapsed:.2f} sn'de tahmin edildi "
+              f"({writer.rows / max(elapsed, 1e-9):,.0f} satır/sn) → {output_path}")
+    return writer.rows
+
+
+def main():
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description="cars_tr.csv şemasındaki ilanlar için toplu fiyat tahmini")
+    parser.add_argument('input', help="Girdi CSV dosyası (cars_tr.csv şeması)")
+    parser.add_argument('output', help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument('--chunk-size', type=int, default=20000, help="Parça başına satır sayısı")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel süreç sayısı")
+    args = parser.parse_args()
+
+    run_batch(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
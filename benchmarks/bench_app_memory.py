@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Uygulama belleği benchmark'ı: oturum başına kopyalanan tam `df_main` ile
+süreç başına paylaşılan dar/tipli tablo ve seçenek indeksi
+
+Her senaryo ayrı bir süreçte çalışır ve RSS artışı ölçülür. Eski uygulama
+cars_tr.csv dosyasının tüm sütunlarını nesne tipli metinler olarak
+`st.cache_data` ile tutuyordu; bu önbellek her çağrıda tablonun bir
+kopyasını döndürdüğü için her eş zamanlı oturum kendi kopyasını taşır.
+`st.cache_resource` ile tutulan nesneler ise süreçte tektir.
+
+Çalıştırma:
+    python benchmarks/bench_app_memory.py --sessions 20
+"""
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# Kenar çubuğu filtrelerinin ve piyasa istatistiklerinin ihtiyaç duyduğu sütunlar
+APP_COLUMNS = ['marka', 'seri', 'model', 'vitesTipi', 'yakitTuru', 'kasaTipi',
+               'renk', 'cekisTipi', 'fiyat(TRY)', 'yıl', 'kilometre(Km)']
+
+SCENARIOS = {
+    'df_main': "Tam CSV, nesne metinler (st.cache_data)",
+    'dar_tablo': "Dar, kategorik tablo (st.cache_resource)",
+    'indeks': "Yalnızca seçenek indeksi (st.cache_resource)"
+}
+
+
+def rss_mb():
+    """Sürecin anlık RSS değeri (MB)"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    raise OSError("VmRSS okunamadı")
+
+
+def run_scenario(name, sessions):
+    """Senaryoyu bu süreçte çalıştırıp ölçümleri JSON olarak yaz"""
+    import pandas as pd
+
+    from dataset import load_dataset
+    from option_index import load_option_index
+    from preprocessing import DATA_PATH
+
+    # Kütüphane içe aktarmaları ölçüme dahil edilmez
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        pass
+
+    before = rss_mb()
+    if name == 'df_main':
+        # Eski pandas sürümlerindeki gibi metinler Python nesnesi olarak tutulur
+        pd.set_option('future.infer_string', False)
+        shared = pd.read_csv(DATA_PATH)
+        # st.cache_data her oturuma tablonun serileştirilmiş kopyasını verir
+        payload = pickle.dumps(shared)
+        copies = [pickle.loads(payload) for _ in range(sessions)]
+        frame_kb = shared.memory_usage(deep=True).sum() / 1024
+    elif name == 'dar_tablo':
+        shared = load_dataset(APP_COLUMNS)
+        copies = [shared] * sessions
+        frame_kb = shared.memory_usage(deep=True).sum() / 1024
+    else:
+        shared = load_option_index()
+        copies = [shared] * sessions
+        frame_kb = os.path.getsize(os.path.join(BASE_DIR, 'car_options_index.json')) / 1024
+    after = rss_mb()
+
+    print(json.dumps({'rss_mb': after - before, 'frame_kb': frame_kb, 'sessions': len(copies)}))
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Uygulama belleği benchmark'ı")
+    parser.add_argument('--sessions', type=int, default=20, help="Eş zamanlı oturum sayısı")
+    parser.add_argument('--scenario', choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_scenario(args.scenario, args.sessions)
+        return
+
+    print("🧠 Uygulama Belleği Benchmark'ı")
+    print("=" * 78)
+    for name, title in SCENARIOS.items():
+        results = {}
+        for sessions in (1, args.sessions):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--scenario', name, '--sessions', str(sessions)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results[sessions] = json.loads(output.strip().splitlines()[-1])
+
+        growth = results[args.sessions]['rss_mb'] - results[1]['rss_mb']
+        per_session = max(growth / max(args.sessions - 1, 1), 0.0)
+        print(f"{title:<46} | nesne {results[1]['frame_kb']:7,.0f} KB | "
+              f"RSS {results[args.sessions]['rss_mb']:6.1f} MB ({args.sessions} oturum) | "
+              f"oturum başına {per_session:5.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
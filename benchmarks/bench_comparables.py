@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benzer ilanlar benchmark'ı: her istekte DataFrame filtreleyip mesafeye göre
+sıralamak ve model bölümlü indeks
+
+Veri seti, kilometre ve yıl değerleri hafifçe oynatılarak 10 bin ve 1 milyon
+ilana çoğaltılır.
+
+Çalıştırma:
+    python benchmarks/bench_comparables.py
+    python benchmarks/bench_comparables.py --sizes 10000 1000000 --queries 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comparables import (DEFAULT_NEIGHBOURS, FORM_FIELDS, NUMERIC_COLUMNS, PARTITION_COLUMNS, PRICE_COLUMN,
+                         build_comparables_index, load_comparables_file)
+from dataset import load_dataset
+
+
+def synthetic_listings(df, n_rows, seed=0):
+    """Veri setini n_rows ilana çoğalt"""
+    rng = np.random.default_rng(seed)
+    sample = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    sample['ilanID'] = np.arange(n_rows, dtype=np.int32)
+    sample['kilometre(Km)'] = sample['kilometre(Km)'] * rng.uniform(0.9, 1.1, n_rows).astype(np.float32)
+    sample['yıl'] = sample['yıl'] + rng.integers(-1, 2, n_rows).astype(np.float32)
+    return sample
+
+
+def filter_and_sort(df, form, scale, k=DEFAULT_NEIGHBOURS):
+    """Eski yol: modeli DataFrame'den filtrele, mesafeyi hesapla, sırala"""
+    subset = df[(df['marka'] == form['marka']) & (df['seri'] == form['seri']) & (df['model'] == form['model'])]
+    target = np.array([form[field] for field in FORM_FIELDS], dtype=np.float64)
+    diff = (subset[NUMERIC_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan) - target) / scale
+    distances = np.sqrt(np.nansum(diff ** 2, axis=1))
+    return subset.assign(mesafe=distances).nsmallest(k, 'mesafe')
+
+
+def measure(func, items, repeat):
+    """Sorgu başına en iyi ortalama süre (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(items) * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Benzer ilanlar sorgu benchmark'ı")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000], help="İlan sayıları")
+    parser.add_argument('--queries', type=int, default=200, help="Sorgu sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    base = load_dataset(['ilanID'] + PARTITION_COLUMNS + NUMERIC_COLUMNS + [PRICE_COLUMN])
+    base = base.dropna(subset=PARTITION_COLUMNS + NUMERIC_COLUMNS + [PRICE_COLUMN])
+
+    print("🚘 Benzer İlanlar Benchmark'ı")
+    print("=" * 64)
+    for n_rows in args.sizes:
+        df = synthetic_listings(base, n_rows)
+        rows = df.sample(args.queries, random_state=1)
+        forms = [
+            {**{column: row[column] for column in PARTITION_COLUMNS},
+             **{field: float(row[column]) for field, column in FORM_FIELDS.items()}}
+            for _, row in rows.iterrows()
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'comparables.npz')
+            start = time.perf_counter()
+            build_comparables_index(df, data_path=os.path.join(directory, 'yok.csv'), output_path=path)
+            build_s = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1024 ** 2
+
+            start = time.perf_counter()
+            index = load_comparables_file(path)
+            load_ms = (time.perf_counter() - start) * 1000
+
+        indexed_ms = measure(index.query, forms, args.repeat)
+        filter_ms = measure(lambda form: filter_and_sort(df, form, index.scale), forms,
+                            1 if n_rows > 100000 else args.repeat)
+
+        same = all(
+            np.array_equal(np.sort(index.query(form)['ilanID'].to_numpy()),
+                           np.sort(filter_and_sort(df, form, index.scale)['ilanID'].to_numpy()))
+            for form in forms[:20]
+        )
+
+        print(f"{n_rows:>9,} ilan, {len(index.partitions):,} model bölümü "
+              f"(en büyük {np.diff(index.offsets).max():,})")
+        print(f"   İndeks oluşturma      : {build_s:8.2f} sn ({size_mb:.1f} MB)")
+        print(f"   İndeks yükleme        : {load_ms:8.1f} ms")
+        print(f"   Filtrele + sırala     : {filter_ms:8.3f} ms/sorgu")
+        print(f"   Bölümlü indeks        : {indexed_ms:8.3f} ms/sorgu ({filter_ms / indexed_ms:.0f}x)")
+        print(f"   Aynı komşular (20)    : {'evet' if same else 'hayır'}")
+
+
+if __name__ == "__main__":
+    main()
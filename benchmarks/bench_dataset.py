@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Veri seti yükleme benchmark'ı: ham CSV'yi okuyup temizleme ve tipli Feather
+dosyasını (tüm sütunlar / yalnızca gereken sütunlar) bellek eşlemeyle okuma
+
+Çalıştırma:
+    python benchmarks/bench_dataset.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleaning import clean_listings, read_listings
+from dataset import build_dataset, load_dataset
+from option_index import UNIQUE_COLUMNS
+from preprocessing import DATA_PATH
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (ms) ve son sonuç"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def frame_kb(df):
+    return df.memory_usage(deep=True).sum() / 1024
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    raw = read_listings(DATA_PATH)
+
+    print("📦 Veri Seti Yükleme Benchmark'ı")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in (1, 10):
+            csv_path = os.path.join(tmp, f'cars_{copies}x.csv')
+            feather_path = os.path.join(tmp, f'cars_{copies}x.feather')
+            pd.concat([raw] * copies, ignore_index=True).to_csv(csv_path, index=False)
+            build_dataset(csv_path, feather_path)
+
+            repeat = 10 if copies == 1 else 3
+            paths = {'path': feather_path, 'data_path': csv_path}
+            cases = {
+                'CSV + temizleme': lambda: clean_listings(read_listings(csv_path)),
+                'Feather (tümü)': lambda: load_dataset(**paths),
+                'Feather (seçenek sütunları)': lambda: load_dataset(UNIQUE_COLUMNS, **paths)
+            }
+
+            print(f"{len(raw) * copies:,} satır | CSV {os.path.getsize(csv_path) / 1024:,.0f} KB, "
+                  f"Feather {os.path.getsize(feather_path) / 1024:,.0f} KB")
+            baseline = None
+            for name, func in cases.items():
+                ms, df = measure(func, repeat)
+                baseline = baseline or ms
+                print(f"   {name:<28} {ms:8.1f} ms {baseline / ms:6.1f}x | bellek {frame_kb(df):8,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Toplu hasar tespiti benchmark'ı: CPU'da toplu tespit boyutuna göre
+fotoğraf/sn
+
+Fotoğraf klasörü verilmezse rastgele 1280x960 görüntüler kullanılır (bir
+aracın 10-30 fotoğrafı gibi).
+
+Çalıştırma:
+    python benchmarks/bench_detection_batch.py --model model/best.pt
+    python benchmarks/bench_detection_batch.py --model model/best.pt --images fotograflar/ --batch-sizes 1 4 8 16
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection import BATCH_SIZES, detect_batch, summarize_vehicle
+
+
+def load_images(directory, count, seed=0):
+    """Klasördeki fotoğraflar veya rastgele görüntüler"""
+    if directory is None:
+        rng = np.random.default_rng(seed)
+        return [rng.integers(0, 256, (960, 1280, 3), dtype=np.uint8) for _ in range(count)]
+    from PIL import Image
+
+    paths = sorted(glob.glob(os.path.join(directory, '*.jp*g')) + glob.glob(os.path.join(directory, '*.png')))
+    return [np.array(Image.open(path).convert('RGB')) for path in paths[:count]]
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (sn)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Toplu hasar tespiti benchmark'ı")
+    parser.add_argument('--model', default='model/best.pt', help="YOLO model dosyası")
+    parser.add_argument('--images', default=None, help="Fotoğraf klasörü (varsayılan: rastgele görüntüler)")
+    parser.add_argument('--count', type=int, default=32, help="Fotoğraf sayısı")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=BATCH_SIZES, help="Toplu tespit boyutları")
+    parser.add_argument('--repeat', type=int, default=3, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    model = YOLO(args.model)
+    images = load_images(args.images, args.count)
+    # Model ilk çağrıda ısınır; ölçümlere dahil edilmez
+    detect_batch(images[:1], model, device='cpu')
+
+    print("🔍 Toplu Hasar Tespiti Benchmark'ı (CPU)")
+    print("=" * 60)
+    print(f"Fotoğraf sayısı: {len(images)}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        seconds = measure(lambda: detect_batch(images, model, batch_size, device='cpu'), args.repeat)
+        throughput = len(images) / seconds
+        baseline = baseline or throughput
+        print(f"   Toplu boyut {batch_size:>3}: {throughput:7.2f} fotoğraf/sn ({throughput / baseline:.2f}x)")
+
+    summary = summarize_vehicle(detect_batch(images, model, max(args.batch_sizes), device='cpu'))
+    counts = ', '.join(f"{name} {entry['adet']}" for name, entry in summary.items())
+    print(f"Araç özeti: {counts or 'tespit yok'}")
+
+
+if __name__ == "__main__":
+    main()
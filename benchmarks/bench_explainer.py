@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Açıklayıcı benchmark'ı: XGBoost'un yerel `pred_contribs` arka ucu ve shap
+TreeExplainer için içe aktarma maliyeti, ilk açıklamaya kadar geçen süre ve
+açıklama başına gecikme
+
+shap kurulu değilse yalnızca yerel arka uç ölçülür.
+
+Çalıştırma:
+    python benchmarks/bench_explainer.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import load_dataset
+from explanations import BACKENDS, explain, load_explainer
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_sklearn_model
+from preprocessing import REQUIRED_COLUMNS
+
+# Arka uçların yüklediği paketler
+BACKEND_MODULES = {'native': 'xgboost', 'shap': 'shap'}
+
+IMPORT_PROBE = """
+import json, sys, time
+def rss():
+    with open('/proc/self/status') as f:
+        return next(int(l.split()[1]) for l in f if l.startswith('VmRSS:')) / 1024
+before = rss()
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'ms': (time.perf_counter() - start) * 1000, 'mb': rss() - before}}))
+"""
+
+
+def import_cost(module):
+    """Paketin yeni bir süreçte içe aktarma süresi (ms) ve RSS artışı (MB)"""
+    result = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def sample_features(df, n, seed):
+    """Veri setinden n satırlık özellik matrisi"""
+    return load_feature_pipeline().transform(df.dropna(subset=REQUIRED_COLUMNS).sample(n, random_state=seed))
+
+
+def render_path(features):
+    """Önbelleksiz eski yol: her çizimde model ve TreeExplainer yeniden kurulur"""
+    import shap
+
+    explainer = shap.TreeExplainer(load_sklearn_model())
+    return explainer.shap_values(features)
+
+
+def timed(func, repeat=1):
+    """En iyi çağrı süresi (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    df = load_dataset()
+    single = sample_features(df, 1, 0)
+    batch = sample_features(df, 100, 1)
+
+    print("🔍 Açıklama Arka Uçları Benchmark'ı")
+    print("=" * 72)
+    for backend in BACKENDS:
+        cost = import_cost(BACKEND_MODULES[backend])
+        if cost is None:
+            print(f"{backend:<7} | {BACKEND_MODULES[backend]} kurulu değil, atlandı")
+            continue
+
+        first_ms = timed(lambda: explain(single, backend))
+        single_ms = timed(lambda: explain(single, backend), repeat=20)
+        batch_ms = timed(lambda: explain(batch, backend), repeat=3)
+        print(f"{backend:<7} | içe aktarma {cost['ms']:7.0f} ms, {cost['mb']:6.1f} MB | "
+              f"ilk açıklama {first_ms:7.1f} ms | 1 satır {single_ms:7.2f} ms | "
+              f"100 satır {batch_ms / 100:7.2f} ms/satır")
+
+    if import_cost('shap') is not None:
+        render_ms = timed(lambda: render_path(single), repeat=3)
+        print(f"Önbelleksiz shap (her çizimde kurulum): {render_ms:,.1f} ms")
+
+    # Yerel katkılar ve beklenen değer tahmini tam olarak verir
+    explainer = load_explainer('native')
+    total = explain(single, 'native').sum() + explainer.expected_value
+    print(f"Yerel katkı toplamı: {total:,.0f} TL "
+          f"(tahmin {explainer.booster.inplace_predict(single)[0]:,.0f} TL)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tespit sonucu görüntü yolu benchmark'ı: fotoğraf başına bellek ayırma ve süre
+
+Eski yol: PIL ile çöz → numpy kopyası → kopya üzerine çiz → BGR/RGB
+çevirip yeni PIL görüntüsü → geçici JPEG dosyası yaz, oku, sil.
+Yeni yol: ölçekli JPEG çözümüyle modelin girdi boyutunda tek BGR tampon →
+yerinde çizim → bellekte JPEG.
+
+Tespit süresi dahil değildir. Bellek tracemalloc ile ölçülür: numpy/OpenCV
+dizileri sayılır, PIL'in iç görüntü belleği sayılmaz (eski yol için alt
+sınırdır). Fotoğraf verilmezse 4000x3000 sentetik JPEG kullanılır (telefon
+kamerası boyutu).
+
+Çalıştırma:
+    python benchmarks/bench_image_path.py
+    python benchmarks/bench_image_path.py --images fotograflar/ --repeat 5
+"""
+
+import argparse
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection import decode_image, draw_detections, encode_jpeg
+
+DETECTIONS = [
+    {'bbox': [100 + 90 * i, 80 + 60 * i, 260 + 90 * i, 220 + 60 * i], 'confidence': 0.8, 'class_id': 0,
+     'class_name': 'hasar'}
+    for i in range(5)
+]
+
+
+def synthetic_jpegs(count, size=(3000, 4000)):
+    """Yumuşak geçişli sentetik fotoğraflar (JPEG baytları)"""
+    import cv2
+
+    height, width = size
+    y, x = np.mgrid[0:height, 0:width]
+    jpegs = []
+    for i in range(count):
+        image = np.stack([(x + 40 * i) % 256, (y // 2) % 256, (x + y) // 24 % 256], axis=-1).astype(np.uint8)
+        jpegs.append(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return jpegs
+
+
+def load_jpegs(directory, count):
+    paths = sorted(glob.glob(os.path.join(directory, '*.jp*g')))[:count]
+    return [open(path, 'rb').read() for path in paths]
+
+
+def legacy_path(data):
+    """Eski sayfa akışı"""
+    import cv2
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image_array = np.array(image)
+    image_with_detections = draw_detections(image_array, DETECTIONS)
+    result_image = Image.fromarray(cv2.cvtColor(image_with_detections, cv2.COLOR_BGR2RGB))
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
+        result_image.save(tmp_file.name)
+        with open(tmp_file.name, 'rb') as f:
+            payload = f.read()
+    os.unlink(tmp_file.name)
+    return payload
+
+
+def in_memory_path(data):
+    """Yeni akış"""
+    image = decode_image(memoryview(data))
+    draw_detections(image, DETECTIONS, inplace=True)
+    return encode_jpeg(image)
+
+
+def profile(func, jpegs, repeat):
+    """Fotoğraf başına en iyi süre (ms) ve en yüksek ayrılan bellek (MB)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in jpegs:
+            func(data)
+        timings.append((time.perf_counter() - start) / len(jpegs))
+
+    peaks = []
+    for data in jpegs:
+        tracemalloc.start()
+        func(data)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return min(timings) * 1000, max(peaks) / 1024 ** 2
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Tespit sonucu görüntü yolu benchmark'ı")
+    parser.add_argument('--images', default=None, help="JPEG klasörü (varsayılan: sentetik 12 MP fotoğraflar)")
+    parser.add_argument('--count', type=int, default=8, help="Fotoğraf sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    jpegs = load_jpegs(args.images, args.count) if args.images else synthetic_jpegs(args.count)
+
+    legacy_ms, legacy_mb = profile(legacy_path, jpegs, args.repeat)
+    memory_ms, memory_mb = profile(in_memory_path, jpegs, args.repeat)
+
+    print("🖼️ Tespit Sonucu Görüntü Yolu Benchmark'ı")
+    print("=" * 60)
+    print(f"Fotoğraf sayısı: {len(jpegs)} (ortalama {np.mean([len(data) for data in jpegs]) / 1024:,.0f} KB)")
+    print(f"Geçici dosyalı eski yol  : {legacy_ms:8.1f} ms/fotoğraf, en yüksek {legacy_mb:7.1f} MB")
+    print(f"Bellekte tek tampon      : {memory_ms:8.1f} ms/fotoğraf, en yüksek {memory_mb:7.1f} MB "
+          f"({legacy_ms / memory_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
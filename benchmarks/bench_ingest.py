@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Artımlı ilan ekleme benchmark'ı: yeni ilan dosyasını `ingest.py` ile
+eklemek ve CSV'den tüm artefaktları baştan oluşturmak
+
+Ham veri seti yeni ilan numaralarıyla çoğaltılarak büyük bir kanonik CSV
+üretilir; eklenen dosyaların bir kısmı fiyatı değişmiş bilinen ilanlardır.
+
+Çalıştırma:
+    python benchmarks/bench_ingest.py
+    python benchmarks/bench_ingest.py --base-rows 100000 --deltas 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleaning import read_listings
+from comparables import build_comparables_index
+from dataset import build_dataset
+from ingest import ingest_files
+from market_stats import build_market_stats
+from option_index import build_option_index
+from preprocessing import DATA_PATH
+
+# Eklenen dosyalarda fiyatı değişmiş bilinen ilanların oranı
+UPDATE_FRACTION = 0.1
+
+
+def synthetic_raw(raw, n_rows, first_id, seed):
+    """Ham satırları yeni ilan numaralarıyla n_rows satıra çoğalt"""
+    rng = np.random.default_rng(seed)
+    sample = raw.iloc[rng.integers(0, len(raw), n_rows)].reset_index(drop=True)
+    sample['ilanID'] = (first_id + np.arange(n_rows)).astype(str)
+    return sample
+
+
+def rebuild_all(directory, data_path):
+    """Eski yol: CSV'yi ayrıştırıp tüm artefaktları baştan oluştur"""
+    df = build_dataset(data_path, os.path.join(directory, 'cars_tr.feather'))
+    build_option_index(df, data_path, os.path.join(directory, 'car_options_index.json'))
+    build_market_stats(df, data_path, os.path.join(directory, 'car_market_stats.npz'))
+    build_comparables_index(df, data_path, os.path.join(directory, 'car_comparables.npz'))
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Artımlı ilan ekleme benchmark'ı")
+    parser.add_argument('--base-rows', type=int, default=100000, help="Kanonik CSV'deki ilan sayısı")
+    parser.add_argument('--deltas', type=int, nargs='+', default=[100, 1000, 10000], help="Eklenen dosya boyutları")
+    args = parser.parse_args()
+
+    raw = read_listings(DATA_PATH)
+    base = synthetic_raw(raw, args.base_rows, 10 ** 8, seed=0)
+
+    print("📥 Artımlı İlan Ekleme Benchmark'ı")
+    print("=" * 64)
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = os.path.join(directory, 'cars_tr.csv')
+        base.to_csv(data_path, index=False)
+        start = time.perf_counter()
+        rebuild_all(directory, data_path)
+        rebuild_s = time.perf_counter() - start
+        print(f"Kanonik CSV: {args.base_rows:,} ilan ({os.path.getsize(data_path) / 1024 ** 2:.0f} MB)")
+        print(f"Tüm artefaktları baştan oluşturma: {rebuild_s:8.2f} sn")
+
+        next_id = 2 * 10 ** 8
+        for i, n_rows in enumerate([10] + args.deltas):
+            n_updates = int(n_rows * UPDATE_FRACTION)
+            delta = synthetic_raw(raw, n_rows - n_updates, next_id, seed=n_rows)
+            updates = base.sample(n_updates, random_state=n_rows).assign(**{'fiyat(TRY)': '1.234.567 TL'})
+            delta_path = os.path.join(directory, f'yeni_{n_rows}.csv')
+            pd.concat([delta, updates], ignore_index=True).to_csv(delta_path, index=False)
+            next_id += n_rows
+
+            # İlk küçük dosya ilan kümesini oluşturur; ölçümlere dahil edilmez
+            if i == 0:
+                ingest_files([delta_path], base_dir=directory)
+                continue
+
+            start = time.perf_counter()
+            summary = ingest_files([delta_path], base_dir=directory)
+            ingest_s = time.perf_counter() - start
+            steps = ', '.join(f"{name} {seconds * 1000:.0f}" for name, seconds in summary['sure'].items())
+            print(f"{n_rows:>7,} satır ekleme: {ingest_s:8.2f} sn "
+                  f"({summary['yeni']:,} yeni, {summary['guncel']:,} güncel) [{steps} ms]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Piyasa istatistikleri benchmark'ı: istek anında DataFrame groupby ile küp
+hücre araması, ve yeni ilanların küpe eklenmesi ile küpün baştan kurulması
+
+Çalıştırma:
+    python benchmarks/bench_market_stats.py
+    python benchmarks/bench_market_stats.py --rows 1000000 --append 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import load_dataset
+from market_stats import PRICE_COLUMN, build_market_stats, listing_columns, load_market_stats_file, update_market_stats
+
+MODEL = ('Fiat', 'Egea', '1.3 Multijet Easy')
+
+
+def synthetic_listings(df, n_rows, seed=0):
+    """Veri setini n_rows ilana çoğalt"""
+    rng = np.random.default_rng(seed)
+    sample = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    sample[PRICE_COLUMN] = (sample[PRICE_COLUMN] * rng.uniform(0.9, 1.1, n_rows)).round().astype('Int32')
+    return sample
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Piyasa istatistikleri küpü benchmark'ı")
+    parser.add_argument('--rows', type=int, default=1000000, help="Küpteki ilan sayısı")
+    parser.add_argument('--append', type=int, default=10000, help="Eklenen yeni ilan sayısı")
+    args = parser.parse_args()
+
+    base = load_dataset(listing_columns())
+    df = synthetic_listings(base, args.rows)
+    new = synthetic_listings(base, args.append, seed=1)
+    marka, seri, model = MODEL
+
+    def groupby_request():
+        # Eski yol: her istekte genel ve model özetleri için tablo taranır
+        prices = df[PRICE_COLUMN]
+        subset = df[(df['marka'] == marka) & (df['seri'] == seri) & (df['model'] == model)]
+        by_year = subset.groupby('yıl')[PRICE_COLUMN].agg(['count', 'mean', 'median', 'min', 'max'])
+        return (len(df), df['marka'].nunique(), prices.mean(),
+                subset[PRICE_COLUMN].agg(['count', 'mean', 'median', 'min', 'max']), by_year)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'market.npz')
+        missing = os.path.join(directory, 'yok.csv')
+
+        start = time.perf_counter()
+        build_market_stats(df, data_path=missing, output_path=path)
+        build_s = time.perf_counter() - start
+        size_kb = os.path.getsize(path) / 1024
+
+        load_ms = measure(lambda: load_market_stats_file(path), 3)
+        cube = load_market_stats_file(path)
+
+        def cube_request():
+            return (cube.rows, cube.cell_count('marka'), cube.summary('genel'),
+                    cube.summary('model', *MODEL), cube.breakdown('model_yil', *MODEL))
+
+        groupby_ms = measure(groupby_request, 5)
+        cube_ms = measure(cube_request, 50)
+
+        combined = pd.concat([df, new], ignore_index=True)
+        rebuild_s = measure(lambda: build_market_stats(combined, data_path=missing, output_path=path), 1) / 1000
+        build_market_stats(df, data_path=missing, output_path=path)
+        update_s = measure(lambda: update_market_stats(new, data_path=missing, path=path), 1) / 1000
+
+        updated = load_market_stats_file(path)
+        full_total = df[PRICE_COLUMN].sum() + new[PRICE_COLUMN].sum()
+
+    print("💹 Piyasa İstatistikleri Küpü Benchmark'ı")
+    print("=" * 60)
+    print(f"İlan sayısı             : {args.rows:,} (+{args.append:,} yeni)")
+    print(f"Küp oluşturma           : {build_s:8.2f} sn ({size_kb:,.0f} KB)")
+    print(f"Küp yükleme             : {load_ms:8.1f} ms")
+    print(f"İstek başına groupby    : {groupby_ms:8.2f} ms")
+    print(f"İstek başına küp arama  : {cube_ms:8.3f} ms ({groupby_ms / cube_ms:.0f}x)")
+    print(f"Yeni ilanlarla baştan   : {rebuild_s:8.2f} sn")
+    print(f"Yeni ilanları ekleme    : {update_s:8.2f} sn ({rebuild_s / update_s:.1f}x)")
+    print(f"Toplamlar tutarlı       : "
+          f"{'evet' if np.isclose(updated.stats['genel'][0, 1], full_total) else 'hayır'}")
+
+
+if __name__ == "__main__":
+    main()
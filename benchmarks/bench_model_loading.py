@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Model yükleme benchmark'ı: joblib pickle (XGBRegressor) ve yerel UBJ (Booster)
+
+Her format ayrı bir Python sürecinde ölçülür: soğuk başlangıç (import +
+yükleme), tek satır ve 1.000 satır tahmin gecikmesi ve yükleme sonrası RSS.
+
+Çalıştırma:
+    python model_loader.py                # yerel modeli üret
+    python benchmarks/bench_model_loading.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = r'''
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+sys.path.insert(0, {root!r})
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+import numpy as np
+baseline_rss = rss_mb()
+
+start = time.perf_counter()
+if {mode!r} == 'pickle':
+    from model_loader import load_sklearn_model
+    predictor = load_sklearn_model()
+else:
+    from model_loader import NativePricePredictor
+    predictor = NativePricePredictor()
+cold_ms = (time.perf_counter() - start) * 1000
+load_rss = rss_mb()
+
+rng = np.random.default_rng(0)
+single = rng.random((1, 43), dtype=np.float32)
+batch = rng.random((1000, 43), dtype=np.float32)
+predictor.predict(single)
+
+def measure(features, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predictor.predict(features)
+    return (time.perf_counter() - start) / repeat * 1000
+
+print(json.dumps({{
+    'cold_ms': cold_ms,
+    'single_ms': measure(single, 500),
+    'batch_ms': measure(batch, 50),
+    'rss_mb': load_rss - baseline_rss,
+}}))
+'''
+
+
+def run(mode):
+    """Ölçümü ayrı bir süreçte çalıştır"""
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER.format(root=ROOT, mode=mode)],
+        capture_output=True, text=True, check=True, cwd=ROOT
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    results = {'joblib pickle': run('pickle'), 'yerel UBJ': run('native')}
+
+    print("🚗 Model Yükleme Benchmark'ı")
+    print("=" * 72)
+    print(f"{'Format':<14} | {'Soğuk başlangıç':>16} | {'1 satır':>10} | {'1.000 satır':>12} | {'RSS artışı':>10}")
+    print("-" * 72)
+    for name, r in results.items():
+        print(f"{name:<14} | {r['cold_ms']:>13.1f} ms | {r['single_ms']:>7.3f} ms | "
+              f"{r['batch_ms']:>9.3f} ms | {r['rss_mb']:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
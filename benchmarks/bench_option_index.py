@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Seçenek indeksi benchmark'ı: DataFrame filtreleme ve indeks araması
+
+Çalıştırma:
+    python benchmarks/bench_option_index.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from option_index import OPTION_INDEX_PATH, TECHNICAL_COLUMNS, load_option_index
+from preprocessing import read_raw_dataset
+
+
+def filter_dataframe(df, marka=None, seri=None, model=None):
+    """Eski yol: DataFrame kopyala, maskele ve unique değerleri sırala"""
+    filtered_df = df.copy()
+    if marka:
+        filtered_df = filtered_df[filtered_df['marka'] == marka]
+    if seri:
+        filtered_df = filtered_df[filtered_df['seri'] == seri]
+    if model:
+        filtered_df = filtered_df[filtered_df['model'] == model]
+    options = {
+        'seri': sorted(filtered_df['seri'].dropna().unique().tolist()) if marka else [],
+        'model': sorted(filtered_df['model'].dropna().unique().tolist()) if seri else []
+    }
+    for column in TECHNICAL_COLUMNS:
+        options[column] = sorted(filtered_df[column].dropna().unique().tolist()) if model else []
+    return options
+
+
+def sidebar_rerun(lookup, marka, seri, model):
+    """Kenar çubuğunun bir yeniden çalıştırmada yaptığı üç sorgu"""
+    lookup(marka, None, None)
+    lookup(marka, seri, None)
+    lookup(marka, seri, model)
+
+
+def measure(func, repeat):
+    """Ortalama çağrı süresi (ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    df = read_raw_dataset()
+    selection = ('Fiat', 'Egea', '1.3 Multijet Easy')
+
+    start = time.perf_counter()
+    load_option_index.__wrapped__()
+    load_ms = (time.perf_counter() - start) * 1000
+    index = load_option_index()
+
+    dataframe_ms = measure(lambda: sidebar_rerun(lambda *a: filter_dataframe(df, *a), *selection), 50)
+    index_ms = measure(lambda: sidebar_rerun(index.filtered_options, *selection), 50_000)
+
+    print("🚗 Seçenek İndeksi Benchmark'ı")
+    print("=" * 48)
+    print(f"İndeks dosyası        : {os.path.getsize(OPTION_INDEX_PATH) / 1024:8.0f} KB")
+    print(f"İndeks yükleme        : {load_ms:8.2f} ms (süreç başına bir kez)")
+    print(f"DataFrame filtreleme  : {dataframe_ms:8.3f} ms/yeniden çalıştırma")
+    print(f"İndeks araması        : {index_ms:8.4f} ms/yeniden çalıştırma")
+    print(f"Hızlanma              : {dataframe_ms / index_ms:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
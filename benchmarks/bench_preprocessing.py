@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Ön işleme benchmark'ı: CSV + LabelEncoder fit yoluna karşı artefakt sözlük araması
+
+Çalıştırma:
+    python benchmarks/bench_preprocessing.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.preprocessing import LabelEncoder
+
+from preprocessing import LABEL_COLUMNS, load_preprocessing, read_raw_dataset
+
+SAMPLE = {
+    'marka': 'Fiat',
+    'seri': 'Egea',
+    'model': '1.3 Multijet Easy',
+    'kasaTipi': 'Sedan',
+    'cekisTipi': 'Önden Çekiş'
+}
+
+
+def encode_with_csv():
+    """Eski yol: her tahminde CSV oku ve encoder'ları fit et"""
+    df = read_raw_dataset()
+    codes = {}
+    for column in LABEL_COLUMNS:
+        encoder = LabelEncoder().fit(df[column])
+        codes[column] = encoder.transform([SAMPLE[column]])[0]
+    return codes
+
+
+def encode_with_artifact():
+    """Yeni yol: işlem başına yüklenen artefakttan sözlük araması"""
+    preprocessing = load_preprocessing()
+    return {column: preprocessing.encode(column, SAMPLE[column]) for column in LABEL_COLUMNS}
+
+
+def measure(func, repeat):
+    """Ortalama çağrı süresi (ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    load_preprocessing()  # İlk yükleme süreç başına bir kez yapılır
+
+    csv_ms = measure(encode_with_csv, 10)
+    artifact_ms = measure(encode_with_artifact, 10000)
+
+    print("🚗 Ön İşleme Benchmark'ı")
+    print("=" * 40)
+    print(f"CSV + LabelEncoder : {csv_ms:10.3f} ms/istek")
+    print(f"Artefakt araması   : {artifact_ms:10.4f} ms/istek")
+    print(f"Hızlanma           : {csv_ms / artifact_ms:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Fiyat duyarlılık eğrileri benchmark'ı: üç eğri için tek toplu `predict`
+çağrısı ve nokta başına tek satırlık çağrılar
+
+Çalıştırma:
+    python benchmarks/bench_sensitivity.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleaning import clean_form
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_predictor
+from sensitivity import CURVES, price_curves, sensitivity_forms
+
+FORM = {
+    'marka': 'Fiat', 'seri': 'Egea', 'model': '1.3 Multijet Easy', 'yil': 2018,
+    'kilometre': 120000, 'vites_tipi': 'Düz', 'yakit_turu': 'Dizel', 'kasa_tipi': 'Sedan',
+    'renk': 'Beyaz', 'cekis_tipi': 'Önden Çekiş', 'motor_hacmi': 1248, 'motor_gucu': 95,
+    'arac_vergisi': 2000, 'tramer': 0, 'boya_durumu': 'Orjinal (Hatasız)'
+}
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    predictor = load_predictor()
+    pipeline = load_feature_pipeline()
+
+    def predict_forms(forms):
+        return predictor.predict(pipeline.transform(clean_form(pd.DataFrame(forms))))
+
+    def row_by_row():
+        forms, _, _ = sensitivity_forms(FORM)
+        return np.array([predict_forms(forms.iloc[[i]])[0] for i in range(len(forms))])
+
+    forms, grids, _ = sensitivity_forms(FORM)
+    batched_ms = measure(lambda: price_curves(FORM, predict_forms), 20)
+    loop_ms = measure(row_by_row, 2)
+
+    curves = price_curves(FORM, predict_forms)
+    same = np.allclose(np.concatenate([prices for _, prices in curves.values()]), row_by_row())
+
+    print("📈 Fiyat Duyarlılık Eğrileri Benchmark'ı")
+    print("=" * 56)
+    print(f"Noktalar             : {', '.join(f'{field} {len(grid)}' for field, grid in grids.items())} "
+          f"(toplam {len(forms)})")
+    print(f"Tek toplu predict    : {batched_ms:8.1f} ms")
+    print(f"Satır satır predict  : {loop_ms:8.1f} ms ({loop_ms / batched_ms:.0f}x)")
+    print(f"Sonuçlar aynı        : {'evet' if same else 'hayır'}")
+    for field, (grid, prices) in curves.items():
+        print(f"   {CURVES[field]['baslik']:<14} {prices.min():>12,.0f} - {prices.max():>12,.0f} TL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Karolu hasar tespiti benchmark'ı: karo boyutu / örtüşme / iş parçacığı
+sayısına göre fotoğraf başına karo sayısı, gecikme ve recall
+
+Temel ölçüm tek geçişli tespittir (fotoğraf modelin girdi boyutuna
+küçültülür). Recall, YOLO txt etiketlerindeki kutuların aynı sınıftan bir
+tespitle IoU >= 0.5 eşleşme oranıdır; "küçük" kutular modelin girdi
+boyutuna küçültülmüş fotoğrafta uzun kenarı 32 px'ten kısa olanlardır.
+
+Çalıştırma:
+    python benchmarks/bench_tiled_detection.py --images val/images --labels val/labels
+    python benchmarks/bench_tiled_detection.py --images val/images --labels val/labels \\
+        --tile-sizes 480 640 960 --overlaps 0.1 0.2 0.3 --workers 1 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_yolo_backends import load_labels
+from detection import (DEFAULT_BATCH_SIZE, DEFAULT_TILE_OVERLAP, DEFAULT_TILE_SIZE, DEFAULT_TILE_WORKERS,
+                       TiledDetector, box_iou, decode_image, detect_batch)
+from yolo_export import IMAGE_SIZE, resolve_yolo_model
+
+MATCH_IOU = 0.5
+SMALL_SIDE = 32
+
+
+def load_images(directory, count):
+    """Klasördeki fotoğraflar (tam çözünürlük, BGR) ve dosya isimleri"""
+    paths = sorted(
+        path for pattern in ('*.jpg', '*.jpeg', '*.png')
+        for path in glob.glob(os.path.join(directory, pattern))
+    )[:count]
+    return [decode_image(open(path, 'rb').read(), max_side=None) for path in paths], paths
+
+
+def is_small(box, image):
+    """Kutu, modelin girdi boyutuna küçültülmüş fotoğrafta küçük mü"""
+    scale = min(1.0, IMAGE_SIZE / max(image.shape[:2]))
+    return max(box[2] - box[0], box[3] - box[1]) * scale < SMALL_SIDE
+
+
+def recall(detections, references, images):
+    """(tüm kutular, küçük kutular) recall değerleri"""
+    found, total, small_found, small_total = 0, 0, 0, 0
+    for image_detections, image_references, image in zip(detections, references, images):
+        for class_id, box in image_references:
+            boxes = np.array([d['bbox'] for d in image_detections if d['class_id'] == class_id], dtype=np.float64)
+            hit = bool(len(boxes)) and box_iou(np.array(box, dtype=np.float64), boxes).max() >= MATCH_IOU
+            small = is_small(box, image)
+            found, total = found + hit, total + 1
+            small_found, small_total = small_found + (hit and small), small_total + small
+    return (found / total if total else float('nan'),
+            small_found / small_total if small_total else float('nan'))
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (sn)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="Karolu hasar tespiti benchmark'ı (CPU)")
+    parser.add_argument('--images', required=True, help="Yüksek çözünürlüklü fotoğraf klasörü")
+    parser.add_argument('--labels', required=True, help="YOLO txt etiket klasörü")
+    parser.add_argument('--model', default=None, help="YOLO model dosyası (varsayılan: Exper Online'ın arka ucu)")
+    parser.add_argument('--count', type=int, default=16, help="Fotoğraf sayısı")
+    parser.add_argument('--tile-sizes', type=int, nargs='+', default=[DEFAULT_TILE_SIZE], help="Karo boyutları")
+    parser.add_argument('--overlaps', type=float, nargs='+', default=[DEFAULT_TILE_OVERLAP], help="Örtüşme oranları")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, DEFAULT_TILE_WORKERS], help="İş parçacığı sayıları")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Toplu tespit boyutu (karo)")
+    parser.add_argument('--repeat', type=int, default=2, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    model_path = args.model or resolve_yolo_model()[0]
+    images, paths = load_images(args.images, args.count)
+    references = load_labels(args.labels, paths, images)
+    n_small = sum(is_small(box, image) for image_references, image in zip(references, images)
+                  for _, box in image_references)
+
+    print("🔬 Karolu Hasar Tespiti Benchmark'ı (CPU)")
+    print("=" * 76)
+    print(f"Fotoğraf sayısı: {len(images)}, etiketli kutu: {sum(map(len, references))} ({n_small} küçük)")
+    print(f"{'Yöntem':<26} {'Karo/foto':>9} {'ms/foto':>9} {'Hız':>6} {'Recall':>7} {'Küçük':>7}")
+
+    model = YOLO(model_path, task='detect')
+    # Model ilk çağrıda ısınır; ölçümlere dahil edilmez
+    detect_batch(images[:1], model, device='cpu')
+    seconds = measure(lambda: detect_batch(images, model, args.batch_size, device='cpu'), args.repeat)
+    baseline_ms = seconds / len(images) * 1000
+    all_recall, small_recall = recall(detect_batch(images, model, args.batch_size, device='cpu'), references, images)
+    print(f"{'Tek geçiş (küçültülmüş)':<26} {1:9.1f} {baseline_ms:9.1f} {1:5.2f}x {all_recall:7.3f} {small_recall:7.3f}")
+
+    for tile_size in args.tile_sizes:
+        for overlap in args.overlaps:
+            for workers in args.workers:
+                detector = TiledDetector(lambda: YOLO(model_path, task='detect'), workers)
+                settings = (tile_size, overlap, args.batch_size)
+                detector.detect_many(images[:1], *settings)
+                seconds = measure(lambda: detector.detect_many(images, *settings), args.repeat)
+                tiled_ms = seconds / len(images) * 1000
+                all_recall, small_recall = recall(detector.detect_many(images, *settings), references, images)
+                tiles = np.mean([detector.tile_count(image, tile_size, overlap) for image in images])
+                label = f"Karo {tile_size} / %{overlap * 100:.0f} / {workers} iş"
+                print(f"{label:<26} {tiles:9.1f} {tiled_ms:9.1f} {baseline_ms / tiled_ms:5.2f}x "
+                      f"{all_recall:7.3f} {small_recall:7.3f}")
+                detector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+YOLO arka uç benchmark'ı: PyTorch (eager), ONNX FP32 ve INT8 için CPU'da
+gecikme, toplu tespit hızı ve mAP50-95 farkı
+
+ONNX modelleri önce `python yolo_export.py [--int8 --calibration ...]` ile
+üretilmelidir; bulunmayan veya best.pt ile uyumsuz arka uçlar atlanır.
+Etiket klasörü (YOLO txt) verilmezse mAP, PyTorch modelinin tahminlerine
+göre hesaplanır (uyum ölçüsü).
+
+Çalıştırma:
+    python benchmarks/bench_yolo_backends.py --images fotograflar/
+    python benchmarks/bench_yolo_backends.py --images val/images --labels val/labels --batch-size 8
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection import DEFAULT_BATCH_SIZE, box_iou, detect_batch
+from yolo_export import BACKENDS, resolve_yolo_model
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+RECALL_POINTS = np.linspace(0, 1, 101)
+
+
+def load_images(directory, count):
+    """Klasördeki fotoğraflar (RGB) ve dosya isimleri"""
+    from PIL import Image
+
+    paths = sorted(
+        path for pattern in ('*.jpg', '*.jpeg', '*.png')
+        for path in glob.glob(os.path.join(directory, pattern))
+    )[:count]
+    return [np.array(Image.open(path).convert('RGB')) for path in paths], paths
+
+
+def load_labels(directory, paths, images):
+    """YOLO txt etiketlerini (sınıf, [x1, y1, x2, y2]) piksel kutularına çevir"""
+    references = []
+    for path, image in zip(paths, images):
+        height, width = image.shape[:2]
+        label_path = os.path.join(directory, os.path.splitext(os.path.basename(path))[0] + '.txt')
+        boxes = []
+        if os.path.exists(label_path):
+            for line in open(label_path, encoding='utf-8').read().split('\n'):
+                if line.strip():
+                    class_id, cx, cy, w, h = line.split()[:5]
+                    cx, cy, w, h = float(cx) * width, float(cy) * height, float(w) * width, float(h) * height
+                    boxes.append((int(class_id), [cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2]))
+        references.append(boxes)
+    return references
+
+
+def average_precision(detections, references, class_id, threshold):
+    """Bir sınıf ve IoU eşiği için COCO tarzı (101 noktalı) AP"""
+    scores, hits, n_references = [], [], 0
+    for image_detections, image_references in zip(detections, references):
+        reference_boxes = np.array([box for k, box in image_references if k == class_id], dtype=np.float64)
+        n_references += len(reference_boxes)
+        used = np.zeros(len(reference_boxes), dtype=bool)
+        predicted = sorted((d for d in image_detections if d['class_id'] == class_id),
+                           key=lambda d: -d['confidence'])
+        for detection in predicted:
+            hit = False
+            if len(reference_boxes):
+                ious = np.where(used, 0.0, box_iou(np.array(detection['bbox'], dtype=np.float64), reference_boxes))
+                best = ious.argmax()
+                if ious[best] >= threshold:
+                    used[best] = hit = True
+            scores.append(detection['confidence'])
+            hits.append(hit)
+    if not n_references or not scores:
+        return 0.0
+
+    hits = np.array(hits)[np.argsort(-np.array(scores), kind='stable')]
+    true_positives, false_positives = np.cumsum(hits), np.cumsum(~hits)
+    recall = true_positives / n_references
+    precision = np.maximum.accumulate((true_positives / (true_positives + false_positives))[::-1])[::-1]
+    positions = np.searchsorted(recall, RECALL_POINTS, side='left')
+    return float(np.where(positions < len(precision), precision[np.minimum(positions, len(precision) - 1)], 0).mean())
+
+
+def mean_average_precision(detections, references):
+    """Referanstaki sınıflar ve 0.50:0.95 IoU eşikleri üzerinden mAP"""
+    classes = sorted({class_id for image_references in references for class_id, _ in image_references})
+    if not classes:
+        return float('nan')
+    return float(np.mean([
+        average_precision(detections, references, class_id, threshold)
+        for class_id in classes for threshold in IOU_THRESHOLDS
+    ]))
+
+
+def measure(func, repeat):
+    """En iyi çağrı süresi (sn)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Benchmark'ı çalıştır"""
+    parser = argparse.ArgumentParser(description="YOLO arka uç benchmark'ı (CPU)")
+    parser.add_argument('--images', required=True, help="Fotoğraf klasörü")
+    parser.add_argument('--labels', default=None, help="YOLO txt etiket klasörü (varsayılan: PyTorch tahminleri)")
+    parser.add_argument('--count', type=int, default=64, help="Fotoğraf sayısı")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Toplu tespit boyutu")
+    parser.add_argument('--repeat', type=int, default=3, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    images, paths = load_images(args.images, args.count)
+    references = load_labels(args.labels, paths, images) if args.labels else None
+
+    print("⚙️ YOLO Arka Uç Benchmark'ı (CPU)")
+    print("=" * 72)
+    print(f"Fotoğraf sayısı: {len(images)}, mAP referansı: {'etiketler' if args.labels else 'PyTorch tahminleri'}")
+    print(f"{'Arka uç':<8} {'Gecikme p50':>12} {'p95':>8} {'Fotoğraf/sn':>12} {'mAP50-95':>9} {'Fark':>7}")
+    baseline_map = None
+    for backend in reversed(BACKENDS):
+        path, resolved = resolve_yolo_model(backend)
+        if resolved != backend:
+            print(f"{backend:<8} atlandı (dosya yok veya best.pt ile uyumsuz)")
+            continue
+        model = YOLO(path, task='detect')
+        # Model ilk çağrıda ısınır; ölçümlere dahil edilmez
+        detect_batch(images[:1], model, device='cpu')
+
+        latencies = []
+        for image in images:
+            start = time.perf_counter()
+            detect_batch([image], model, 1, device='cpu')
+            latencies.append((time.perf_counter() - start) * 1000)
+        seconds = measure(lambda: detect_batch(images, model, args.batch_size, device='cpu'), args.repeat)
+
+        detections = detect_batch(images, model, args.batch_size, device='cpu')
+        if references is None:
+            references = [[(d['class_id'], d['bbox']) for d in image_detections] for image_detections in detections]
+        score = mean_average_precision(detections, references)
+        baseline_map = score if baseline_map is None else baseline_map
+        print(f"{backend:<8} {np.percentile(latencies, 50):9.1f} ms {np.percentile(latencies, 95):5.1f} ms "
+              f"{len(images) / seconds:12.2f} {score:9.3f} {score - baseline_map:+7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Giriş noktalarının içe aktarma süresi raporu ve bütçe kontrolü
+
+Her giriş betiğinin modül düzeyindeki `import` satırları yeni bir Python
+sürecinde `-X importtime` ile çalıştırılır. Rapor, en pahalı üst düzey
+paketleri ve toplam süreyi gösterir; toplam süre import_budget.json'daki
+bütçeyi aşarsa veya yasaklı bir paket yüklenirse çıkış kodu 1 olur.
+Kurulu olmayan paketler atlanır ve raporda belirtilir.
+
+Çalıştırma:
+    python benchmarks/import_report.py
+    python benchmarks/import_report.py --top 15 --repeat 5
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_budget.json')
+
+PROBE = """
+import sys
+missing = []
+for statement in {statements!r}:
+    try:
+        exec(statement, {{}})
+    except ImportError as e:
+        missing.append(e.name or statement)
+print('MISSING', ','.join(sorted(set(missing))), file=sys.stderr)
+"""
+
+
+def module_imports(path):
+    """Betiğin modül düzeyinde (try blokları dahil) çalışan import satırları"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+
+    statements = []
+    nodes = list(tree.body)
+    while nodes:
+        node = nodes.pop(0)
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(ast.unparse(node))
+        elif isinstance(node, ast.Try):
+            nodes[:0] = node.body
+    return statements
+
+
+def parse_importtime(stderr):
+    """
+    `-X importtime` çıktısını üst düzey paket başına kümülatif süreye (ms)
+    ve yüklenen tüm modül isimlerine çevir
+    """
+    packages = {}
+    modules = set()
+    missing = []
+    for line in stderr.splitlines():
+        if line.startswith('MISSING'):
+            missing = [name for name in line[len('MISSING'):].strip().split(',') if name]
+            continue
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # "import time:  self [us] | cumulative | paket"; girinti iç içe içe aktarmayı gösterir
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        module = name.strip()
+        modules.add(module)
+        # Girintisiz satırlar doğrudan betiğin tetiklediği içe aktarmalardır
+        if name[1:2] != ' ':
+            top = module.split('.')[0]
+            packages[top] = packages.get(top, 0) + int(cumulative_us) / 1000
+    return packages, modules, missing
+
+
+def measure(path, repeat):
+    """Betiğin içe aktarmalarını `repeat` kez ölç; en hızlı çalıştırmayı döndür"""
+    code = PROBE.format(statements=module_imports(path))
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': BASE_DIR}
+        )
+        packages, modules, missing = parse_importtime(result.stderr)
+        total = sum(packages.values())
+        if best is None or total < best[0]:
+            best = (total, packages, modules, missing)
+    return best
+
+
+def main():
+    """Raporu yazdır ve bütçeyi kontrol et"""
+    parser = argparse.ArgumentParser(description="Giriş noktaları için içe aktarma süresi raporu")
+    parser.add_argument('--budget', default=BUDGET_PATH, help="Bütçe dosyası")
+    parser.add_argument('--top', type=int, default=8, help="Gösterilecek paket sayısı")
+    parser.add_argument('--repeat', type=int, default=3, help="Ölçüm tekrarı (en hızlısı alınır)")
+    args = parser.parse_args()
+
+    with open(args.budget, encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    failures = []
+    print("⏱️ İçe Aktarma Süresi Raporu (-X importtime)")
+    print("=" * 64)
+    for entry, budget in budgets.items():
+        total, packages, modules, missing = measure(os.path.join(BASE_DIR, entry), args.repeat)
+        over = total > budget['budget_ms']
+        forbidden = sorted(name for name in budget.get('forbidden', [])
+                           if name in modules or any(m.startswith(name + '.') for m in modules))
+
+        status = "❌" if over or forbidden else "✅"
+        print(f"{status} {entry}: {total:,.0f} ms (bütçe {budget['budget_ms']:,} ms)")
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"     {name:<28} {ms:8.1f} ms")
+        if missing:
+            print(f"     kurulu değil: {', '.join(missing)}")
+        if forbidden:
+            print(f"     yasaklı paketler yüklendi: {', '.join(forbidden)}")
+
+        if over:
+            failures.append(f"{entry} bütçeyi aştı ({total:,.0f} > {budget['budget_ms']:,} ms)")
+        if forbidden:
+            failures.append(f"{entry} yasaklı paketleri yükledi: {', '.join(forbidden)}")
+
+    if failures:
+        print("\n".join(["", "Bütçe aşımları:"] + [f"  - {failure}" for failure in failures]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
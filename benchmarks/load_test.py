@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tahmin servisi yük testi: eş zamanlı istemcilerle p50/p99 gecikme ve istek/sn
+
+Çalıştırma (servis ayrı bir terminalde açıkken):
+    python benchmarks/load_test.py --concurrency 32 --requests 5000
+
+Servisi test için kendisi başlatsın:
+    python benchmarks/load_test.py --start-server --max-batch-size 64 --max-wait-ms 5
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from cleaning import FORM_FIELDS
+from dataset import load_dataset
+from preprocessing import REQUIRED_COLUMNS
+
+
+def sample_payloads(n=500, seed=42):
+    """Veri setindeki ilanlardan form alanlarıyla istek gövdeleri üret"""
+    columns = {column: field for field, column in FORM_FIELDS.items()}
+    listings = load_dataset(columns).dropna(subset=REQUIRED_COLUMNS)
+    sample = listings.sample(min(n, len(listings)), random_state=seed)
+
+    payloads = []
+    for record in sample[list(columns)].to_dict('records'):
+        payload = {columns[column]: value for column, value in record.items() if value == value}
+        payloads.append(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    return payloads
+
+
+def wait_for_server(url, timeout=60):
+    """Servis /health yanıtı verene kadar bekle"""
+    target = urlparse(url)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            return get_health(target)
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Servis {timeout} sn içinde hazır olmadı: {url}")
+
+
+def get_health(target):
+    """Servisin grup istatistikleri"""
+    connection = http.client.HTTPConnection(target.hostname, target.port, timeout=5)
+    try:
+        connection.request('GET', '/health')
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def run_load(url, payloads, concurrency, total_requests):
+    """İstekleri eş zamanlı gönder; gecikmeleri (ms) ve hata sayısını döndür"""
+    target = urlparse(url)
+    counter = itertools.count()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local = []
+        failed = 0
+        while True:
+            i = next(counter)
+            if i >= total_requests:
+                break
+            body = payloads[i % len(payloads)]
+            start = time.perf_counter()
+            try:
+                connection.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+                continue
+            local.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), sum(errors), elapsed
+
+
+def main():
+    """Yük testini çalıştır"""
+    parser = argparse.ArgumentParser(description="Tahmin servisi yük testi")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="Servis adresi")
+    parser.add_argument('--concurrency', type=int, default=32, help="Eş zamanlı istemci sayısı")
+    parser.add_argument('--requests', type=int, default=5000, help="Toplam istek sayısı")
+    parser.add_argument('--start-server', action='store_true', help="Servisi test için başlat")
+    parser.add_argument('--max-batch-size', type=int, default=64, help="--start-server ile grup boyutu")
+    parser.add_argument('--max-wait-ms', type=float, default=5, help="--start-server ile bekleme süresi")
+    parser.add_argument('--cache-size', type=int, default=0, help="--start-server ile önbellek boyutu (0: kapalı)")
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        target = urlparse(args.url)
+        server = subprocess.Popen([
+            sys.executable, os.path.join(BASE_DIR, 'prediction_service.py'),
+            '--host', target.hostname, '--port', str(target.port),
+            '--max-batch-size', str(args.max_batch_size), '--max-wait-ms', str(args.max_wait_ms),
+            '--cache-size', str(args.cache_size)
+        ], stdout=subprocess.DEVNULL)
+
+    try:
+        before = wait_for_server(args.url)
+        payloads = sample_payloads()
+        latencies, errors, elapsed = run_load(args.url, payloads, args.concurrency, args.requests)
+        after = get_health(urlparse(args.url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    batches = after['gruplar'] - before['gruplar']
+    records = after['kayitlar'] - before['kayitlar']
+
+    print("🚀 Tahmin Servisi Yük Testi")
+    print("=" * 48)
+    print(f"Eş zamanlı istemci    : {args.concurrency:8d}")
+    print(f"Başarılı / hatalı     : {len(latencies):8d} / {errors}")
+    print(f"İstek/sn              : {len(latencies) / elapsed:8.0f}")
+    print(f"Gecikme p50           : {np.percentile(latencies, 50):8.2f} ms")
+    print(f"Gecikme p99           : {np.percentile(latencies, 99):8.2f} ms")
+    print(f"Ortalama grup boyutu  : {records / max(batches, 1):8.1f} kayıt "
+          f"(en fazla {after['max_batch_size']}, {after['max_wait_ms']:g} ms)")
+    if 'onbellek' in after:
+        cache = after['onbellek']
+        print(f"Önbellek isabet oranı : {cache['isabet_orani']:8.1%} "
+              f"({cache['isabet']} isabet, {cache['kayip']} kayıp, {cache['cikarma']} çıkarma)")
+
+
+if __name__ == "__main__":
+    main()
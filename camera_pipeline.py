@@ -0,0 +1,270 @@
+"""
+Kamera Tespit Boru Hattı
+
+Canlı kamera sekmesinde kare okuma, tespit ve çizim/gösterim aynı döngüde
+sırayla çalışınca FPS tüm aşamaların toplamıyla sınırlanır ve eski kareler
+birikir. Boru hattında:
+
+- okuma iş parçacığı kareleri tek elemanlı bir tampona yazar; tüketilmemiş
+  eski kare yenisiyle değiştirilir (düşürülür),
+- tespit iş parçacığı her seferinde en son kareyi işler,
+- çizim ve gösterim çağıranın iş parçacığında yapılır (Streamlit öğeleri
+  yalnızca betik iş parçacığından güncellenebilir).
+
+Her aşamanın FPS ve gecikmesi kayan pencereyle ölçülür. Kaynak kamera
+numarası veya video dosyası olabilir; dosyalar varsayılan olarak kendi FPS
+değerleriyle okunur, böylece kamera çevrimdışı taklit edilir.
+"""
+
+import collections
+import threading
+import time
+
+# FPS ve gecikmenin hesaplandığı kayan pencere (saniye)
+STATS_WINDOW = 2.0
+
+# Video dosyası FPS bilgisi vermezse kullanılan okuma hızı
+DEFAULT_SOURCE_FPS = 30.0
+
+STAGE_LABELS = {
+    'okuma': 'Kare okuma',
+    'tespit': 'Tespit',
+    'cizim': 'Çizim + gösterim',
+    'uctan_uca': 'Uçtan uca'
+}
+
+Frame = collections.namedtuple('Frame', ['index', 'image', 'captured_at'])
+Result = collections.namedtuple('Result', ['frame', 'detections'])
+
+
+class LatestFrame:
+    """Tek elemanlı tampon: yeni öğe tüketilmemiş eskisinin yerine geçer"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._item = None
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._condition.notify_all()
+
+    def take(self, timeout=None):
+        """Bekleyen öğeyi al ve tamponu boşalt; zaman aşımında veya kapanınca None"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._item is not None or self.closed, timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class StageStats:
+    """Bir aşamanın kayan penceredeki FPS ve ortalama gecikmesi"""
+
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self.count = 0
+        self._events = collections.deque()
+        self._lock = threading.Lock()
+
+    def record(self, latency, now=None):
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self.count += 1
+            self._events.append((now, latency))
+            while self._events and now - self._events[0][0] > self.window:
+                self._events.popleft()
+
+    def snapshot(self):
+        with self._lock:
+            events = list(self._events)
+        if not events:
+            return {'fps': 0.0, 'gecikme_ms': 0.0, 'adet': self.count}
+        span = max(events[-1][0] - events[0][0], 1e-9)
+        fps = (len(events) - 1) / span if len(events) > 1 else 0.0
+        latency = sum(latency for _, latency in events) / len(events)
+        return {'fps': fps, 'gecikme_ms': latency * 1000, 'adet': self.count}
+
+
+def open_capture(source):
+    """Kamera numarası veya video dosyası için VideoCapture"""
+    import cv2
+
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    return cv2.VideoCapture(source)
+
+
+class CameraPipeline:
+    """
+    Okuma ve tespit iş parçacıkları; sonuçlar `next_result` ile alınır
+
+    `detect(image)` tespit listesini döndürür. Bir aşamada hata olursa boru
+    hattı durur ve hata `error` alanında saklanır.
+    """
+
+    def __init__(self, source, detect, realtime=None):
+        self.source = source
+        self.detect = detect
+        # Dosyalar kendi FPS değerleriyle okunur; kamera okuması zaten bloklar
+        self.realtime = not (isinstance(source, int) or str(source).isdigit()) if realtime is None else realtime
+        self.frames = LatestFrame()
+        self.results = LatestFrame()
+        self.stats = {name: StageStats() for name in STAGE_LABELS}
+        self.error = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        capture = open_capture(self.source)
+        if not capture.isOpened():
+            capture.release()
+            raise RuntimeError(f"Kaynak açılamadı: {self.source}")
+        self._threads = [
+            threading.Thread(target=self._capture, args=(capture,), name='kamera-okuma', daemon=True),
+            threading.Thread(target=self._infer, name='kamera-tespit', daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _capture(self, capture):
+        interval = 0.0
+        if self.realtime:
+            import cv2
+
+            interval = 1.0 / (capture.get(cv2.CAP_PROP_FPS) or DEFAULT_SOURCE_FPS)
+        index, next_at = 0, time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                ok, image = capture.read()
+                if not ok:
+                    break
+                now = time.perf_counter()
+                self.stats['okuma'].record(now - start, now)
+                self.frames.put(Frame(index, image, now))
+                index += 1
+                if interval:
+                    next_at += interval
+                    self._stop.wait(max(next_at - time.perf_counter(), 0))
+        except Exception as e:
+            self.error = e
+        finally:
+            capture.release()
+            self.frames.close()
+
+    def _infer(self):
+        try:
+            while not self._stop.is_set():
+                frame = self.frames.take(timeout=0.5)
+                if frame is None:
+                    if self.frames.closed:
+                        break
+                    continue
+                start = time.perf_counter()
+                detections = self.detect(frame.image)
+                now = time.perf_counter()
+                self.stats['tespit'].record(now - start, now)
+                self.results.put(Result(frame, detections))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.results.close()
+
+    def next_result(self, timeout=0.5):
+        """En son tespit sonucu; kaynak bittiğinde veya hata olduğunda None"""
+        return self.results.take(timeout)
+
+    @property
+    def finished(self):
+        return self.results.closed
+
+    def record_render(self, result, started):
+        """Çağıranın çizim/gösterim süresini ve kareden ekrana gecikmeyi kaydet"""
+        now = time.perf_counter()
+        self.stats['cizim'].record(now - started, now)
+        self.stats['uctan_uca'].record(now - result.frame.captured_at, now)
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def summary(self):
+        """Aşama başına FPS/gecikme ve düşürülen kare sayıları"""
+        stages = {name: stats.snapshot() for name, stats in self.stats.items()}
+        return {'asamalar': stages, 'dusurulen_kare': self.frames.dropped, 'dusurulen_sonuc': self.results.dropped}
+
+
+class SequentialPipeline(CameraPipeline):
+    """
+    Karşılaştırma için eski sıralı döngü: okuma ve tespit `next_result`
+    içinde, çağıranın iş parçacığında yapılır
+
+    Video dosyasında işlem sürerken geçen kareler atlanır (canlı kamerada
+    olduğu gibi) ve düşürülmüş sayılır.
+    """
+
+    def start(self):
+        self._capture = open_capture(self.source)
+        if not self._capture.isOpened():
+            self._capture.release()
+            raise RuntimeError(f"Kaynak açılamadı: {self.source}")
+        self._interval = 0.0
+        if self.realtime:
+            import cv2
+
+            self._interval = 1.0 / (self._capture.get(cv2.CAP_PROP_FPS) or DEFAULT_SOURCE_FPS)
+        self._index, self._started = 0, time.perf_counter()
+        return self
+
+    def next_result(self, timeout=None):
+        if self.finished:
+            return None
+        start = time.perf_counter()
+        if self._interval:
+            due = int((start - self._started) / self._interval)
+            while self._index < due and self._capture.grab():
+                self._index += 1
+                self.frames.dropped += 1
+        ok, image = self._capture.read()
+        if not ok:
+            self.stop()
+            return None
+        now = time.perf_counter()
+        self.stats['okuma'].record(now - start, now)
+        frame = Frame(self._index, image, now)
+        self._index += 1
+
+        detections = self.detect(image)
+        done = time.perf_counter()
+        self.stats['tespit'].record(done - now, done)
+        return Result(frame, detections)
+
+    def stop(self):
+        if not self.finished:
+            self._capture.release()
+            self.results.close()
+
+
+PIPELINES = {'paralel': CameraPipeline, 'sirali': SequentialPipeline}
+
+
+def summary_markdown(summary):
+    """Özetin Markdown tablosu"""
+    lines = ['| Aşama | FPS | Gecikme (ms) | Kare |', '|---|---:|---:|---:|']
+    for name, stats in summary['asamalar'].items():
+        lines.append(f"| {STAGE_LABELS[name]} | {stats['fps']:.1f} | {stats['gecikme_ms']:.0f} | {stats['adet']:,} |")
+    lines.append('')
+    lines.append(f"Düşürülen kare: {summary['dusurulen_kare']:,} okuma, {summary['dusurulen_sonuc']:,} tespit sonucu")
+    return '\n'.join(lines)
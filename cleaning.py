@@ -0,0 +1,279 @@
+"""
+Ham İlan Temizleme
+
+cars_tr.csv şemasındaki ham metin alanlarını sayısal değerlere çevirir.
+Ayrıştırıcılar main.ipynb'deki temizleyicilerin aynısıdır; yalnızca her
+değer için bir kez çalışırlar. İlan alanları çok tekrar ettiğinden (6.675
+satırda 49 farklı MTV, 153 farklı motor hacmi) her sütun `pd.factorize`
+ile farklı değerlere ayrılır, ayrıştırıcı bu değerlerde çalışır ve sonuç
+kodlar üzerinden satırlara yayılır.
+"""
+
+import re
+from functools import partial, wraps
+
+import numpy as np
+import pandas as pd
+
+# Ham dosyada yer değiştirmiş sütun isimlerinin düzeltmesi
+RAW_COLUMN_RENAMES = {
+    'kilometre(Km)': 'yıl',
+    'yıl': 'kilometre(Km)',
+    'hasarGecmisi': 'tramer'
+}
+
+# Temizlenmiş kayda olduğu gibi taşınan kategorik sütunlar
+CATEGORICAL_COLUMNS = ['marka', 'seri', 'model', 'kasaTipi', 'cekisTipi', 'vitesTipi', 'yakitTuru', 'renk']
+
+# Modelde kullanılmayan, piyasa istatistikleri için taşınan sütunlar
+LOCATION_COLUMNS = ['il']
+
+# Form sayılarında atılacak karakterler (rakam yalnızca ASCII)
+NON_NUMERIC = re.compile(r'[^\d.,]+', re.ASCII)
+
+# Kenar çubuğu (ve tahmin servisi) alanlarının kayıt sütunlarına karşılığı
+FORM_FIELDS = {
+    'marka': 'marka',
+    'seri': 'seri',
+    'model': 'model',
+    'yil': 'yıl',
+    'kilometre': 'kilometre(Km)',
+    'vites_tipi': 'vitesTipi',
+    'yakit_turu': 'yakitTuru',
+    'kasa_tipi': 'kasaTipi',
+    'renk': 'renk',
+    'cekis_tipi': 'cekisTipi',
+    'motor_hacmi': 'motorHacmi(Cc)',
+    'motor_gucu': 'motorGucu(HP)',
+    'arac_vergisi': 'aracVergisi(TRY)',
+    'tramer': 'tramer'
+}
+
+# Boş bırakılan sayısal form alanlarının varsayılanları
+FORM_DEFAULTS = {
+    'kilometre(Km)': 100000,
+    'yıl': 2020,
+    'motorHacmi(Cc)': 1600,
+    'motorGucu(HP)': 120,
+    'aracVergisi(TRY)': 2000,
+    'tramer': 0
+}
+
+# Formdaki boya parça durumu seçeneklerinin hasar puanları
+PAINT_DAMAGE_SCORES = {
+    'Orjinal (Hatasız)': 0,
+    'Lokal Boyalı': 1,
+    'Boyalı': 1,
+    'Değişmiş': 2,
+    'Belirtilmemiş': 1
+}
+
+# boyaParcaDurumu metnindeki ifadeler ve eğitimdeki hasar puanları
+DAMAGE_WEIGHTS = {
+    'boyalı': 1,
+    'lokal boyalı': 1,
+    'değişmiş': 2,
+    'belirtilmemiş': 1
+}
+
+# Tutarı olmayan tramer kayıtları; hasar tutarı 0 sayılır
+TRAMER_ZERO_PHRASES = ['tutarı belirtilmemiş', 'tutarı yok', 'ağır hasar']
+
+def _per_unique(parser=None, missing=np.nan, dtype='float64'):
+    """
+    Tek değer ayrıştırıcısını sütunun farklı değerlerinde çalıştırıp sonucu satırlara yay
+
+    Eksik değerler ayrıştırıcıya gitmez, `missing` değerini alır.
+    """
+    if parser is None:
+        return partial(_per_unique, missing=missing, dtype=dtype)
+
+    @wraps(parser)
+    def wrapper(series):
+        codes, uniques = pd.factorize(series)
+        parsed = np.array([parser(value) for value in uniques.tolist()] + [missing], dtype=dtype)
+        # Eksik değerlerin kodu -1'dir ve sondaki `missing` değerine düşer
+        return pd.Series(parsed[codes], index=series.index)
+    return wrapper
+
+
+def _as_float(text):
+    """float() çevrimi; çözülemeyen metinler NaN"""
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+@_per_unique
+def parse_number(value):
+    """Türkçe sayı biçimini çöz ("1.250,5 TL" → 1250.5); sayısal girdiler olduğu gibi kalır"""
+    # JSON gibi karışık girdilerde sayı olarak gelen değerler metin gibi çözülmez
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    text = value if isinstance(value, str) else str(value)
+    return _as_float(NON_NUMERIC.sub('', text).replace('.', '').replace(',', '.'))
+
+
+# İlan ayrıştırıcıları main.ipynb'deki temizleyicilerle birebir aynıdır; model bu
+# çözümlemeyle eğitildiği için buradaki her fark tahminlere yansır
+
+@_per_unique
+def parse_price(value):
+    """Fiyat: "1.169.000 TL" → 1169000"""
+    if not isinstance(value, str):
+        return np.nan
+    return _as_float(value.replace(' TL', '').replace('.', ''))
+
+
+def parse_listing_id(series):
+    """İlan numarası; sayı olmayan değerler eksik sayılır"""
+    try:
+        return series.astype('Int64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(series, errors='coerce').astype('Int64')
+
+
+@_per_unique
+def parse_year(value):
+    """Model yılı: "2018" → 2018"""
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    # pd.to_numeric gibi; Python'un kabul ettiği "1_000" ve Unicode rakamlar sayı sayılmaz
+    text = value if isinstance(value, str) else str(value)
+    return _as_float(text) if text.isascii() and '_' not in text else np.nan
+
+
+@_per_unique
+def parse_km(value):
+    """Kilometre: "120.000 km" → 120000; "km" içermeyen değerler NaN"""
+    if not isinstance(value, str) or 'km' not in value:
+        return np.nan
+    return _as_float(value.replace(' km', '').replace('.', ''))
+
+
+@_per_unique
+def parse_engine_cc(value):
+    """Motor hacmi: "1968 cc", "1401 - 1600 cm3" → 1968, 1600; "1200 cm3' e kadar" → NaN"""
+    if not isinstance(value, str):
+        return np.nan
+    if '-' in value and 'cm3' in value:
+        parts = value.split(' - ')
+        if len(parts) != 2:
+            return np.nan
+        return _as_float(parts[1].replace(' cm3', '').replace(" cm3' e kadar", ''))
+    if 'cc' in value:
+        return _as_float(value.replace(' cc', '').replace(' cm3', ''))
+    return _as_float(value)
+
+
+@_per_unique
+def parse_engine_hp(value):
+    """Motor gücü: "190 hp", "101 - 125 HP" → 190, 125; "50 HP'ye kadar" → NaN"""
+    if not isinstance(value, str):
+        return np.nan
+    if '-' in value and ('HP' in value or 'hp' in value):
+        parts = value.split(' - ')
+        if len(parts) != 2:
+            return np.nan
+        return _as_float(parts[1].replace(' HP', '').replace(' hp', '').replace('HP', '').replace('hp', ''))
+    if 'hp' in value.lower():
+        return _as_float(value.replace(' hp', '').replace(' HP', '').replace('HP', '').replace('hp', ''))
+    return _as_float(value)
+
+
+@_per_unique
+def parse_mtv(value):
+    """Araç vergisi: "Yıllık MTV 1.606 TL" → 1606; yalnız sayı olan "1.606" → 1.606"""
+    if not isinstance(value, str):
+        return np.nan
+    if 'Yıllık MTV' in value and 'TL' in value:
+        return _as_float(value.replace('Yıllık MTV ', '').replace(' TL', '').replace('.', ''))
+    return _as_float(value)
+
+
+@_per_unique(missing=0)
+def parse_tramer(value):
+    """Tramer: "Tramer 7.000 TL" veya "7.000" → 7000; "tutarı yok" gibi metinler → 0"""
+    if not isinstance(value, str):
+        return 0
+    if 'Tramer' in value and 'TL' in value:
+        text = value.replace('Tramer ', '').replace(' TL', '').replace('.', '')
+    elif any(phrase in value for phrase in TRAMER_ZERO_PHRASES):
+        return 0
+    else:
+        text = value.replace('.', '')
+    try:
+        return float(text)
+    except ValueError:
+        return 0
+
+
+@_per_unique(missing=0, dtype=np.int64)
+def damage_score(value):
+    """boyaParcaDurumu metninden eğitimdeki hasar skorunu hesapla"""
+    text = str(value).lower()
+    return sum(weight for phrase, weight in DAMAGE_WEIGHTS.items() if phrase in text)
+
+
+def clean_listings(raw):
+    """Ham ilan tablosunu (cars_tr.csv şeması) model girdisi kayıtlara çevir"""
+    # Tablo yeniden adlandırılıp kopyalanmaz; sütunlar ham adlarıyla okunur
+    raw_names = {cleaned: name for name, cleaned in RAW_COLUMN_RENAMES.items()}
+
+    def column(name):
+        return raw[raw_names.get(name, name)]
+
+    cleaned = {}
+    if 'ilanID' in raw:
+        cleaned['ilanID'] = parse_listing_id(column('ilanID'))
+    for name in CATEGORICAL_COLUMNS + LOCATION_COLUMNS:
+        if name in raw:
+            cleaned[name] = column(name)
+
+    if 'fiyat(TRY)' in raw:
+        cleaned['fiyat(TRY)'] = parse_price(column('fiyat(TRY)'))
+    cleaned['yıl'] = parse_year(column('yıl'))
+    cleaned['kilometre(Km)'] = parse_km(column('kilometre(Km)'))
+    cleaned['motorHacmi(Cc)'] = parse_engine_cc(column('motorHacmi(Cc)'))
+    cleaned['motorGucu(HP)'] = parse_engine_hp(column('motorGucu(HP)'))
+    cleaned['aracVergisi(TRY)'] = parse_mtv(column('aracVergisi(TRY)'))
+    cleaned['tramer'] = parse_tramer(column('tramer'))
+    cleaned['hasar_skoru'] = damage_score(column('boyaParcaDurumu'))
+
+    # Sütunları tek tek eklemek yerine tablo bir kez kurulur
+    return pd.DataFrame(cleaned, index=raw.index)
+
+
+def clean_form(form):
+    """
+    Form alanlarını (kenar çubuğu veya servis isteği) model girdisi kayıtlara çevir
+
+    Sütunlar FORM_FIELDS isimleriyle gelir; `boya_durumu` PAINT_DAMAGE_SCORES
+    seçeneklerinden biridir. Eksik veya çözülemeyen sayısal alanlar
+    FORM_DEFAULTS değerlerini alır.
+    """
+    df = form.rename(columns=FORM_FIELDS)
+    cleaned = {column: df[column] for column in CATEGORICAL_COLUMNS if column in df}
+
+    for column, default in FORM_DEFAULTS.items():
+        values = parse_number(df[column]) if column in df else pd.Series(np.nan, index=df.index)
+        cleaned[column] = values.fillna(default)
+
+    if 'boya_durumu' in df:
+        cleaned['hasar_skoru'] = df['boya_durumu'].map(PAINT_DAMAGE_SCORES).fillna(0).astype(np.int64)
+    else:
+        cleaned['hasar_skoru'] = pd.Series(0, index=df.index, dtype=np.int64)
+
+    return pd.DataFrame(cleaned, index=df.index)
+
+
+def read_listings(path, **kwargs):
+    """
+    Ham ilan dosyasını metin olarak oku
+
+    Tüm alanlar metin olarak okunur; ayrıştırıcılar notebook'taki gibi metin
+    bekler ve yalnızca sayılardan oluşan bir parça (ör. ingest edilen birkaç
+    satırlık MTV sütunu) sayı olarak okunsaydı NaN'a düşerdi.
+    """
+    return pd.read_csv(path, dtype=str, **kwargs)
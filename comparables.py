@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benzer İlanlar İndeksi
+
+Aynı marka/seri/model içindeki gerçek ilanları yıl, kilometre, motor gücü
+ve motor hacmine göre en yakından uzağa sıralar. İlanlar model
+bölümlerine göre sıralanmış tek bir normalize sayısal matris olarak
+kaydedilir; sorgu yalnızca ilgili bölümün satırları üzerinde mesafe
+hesaplar ve DataFrame filtrelemez.
+
+İndeksi yeniden oluşturmak için:
+    python comparables.py
+"""
+
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import BASE_DIR, DATA_PATH, data_stamp
+
+COMPARABLES_PATH = os.path.join(BASE_DIR, 'car_comparables.npz')
+
+# İndeks formatı değiştiğinde artırılır
+INDEX_VERSION = 2
+
+# Bölüm anahtarı ve mesafede kullanılan sayısal sütunlar
+PARTITION_COLUMNS = ['marka', 'seri', 'model']
+NUMERIC_COLUMNS = ['yıl', 'kilometre(Km)', 'motorGucu(HP)', 'motorHacmi(Cc)']
+PRICE_COLUMN = 'fiyat(TRY)'
+
+# Uygulama formundaki alanların sütun karşılıkları
+FORM_FIELDS = {
+    'yil': 'yıl',
+    'kilometre': 'kilometre(Km)',
+    'motor_gucu': 'motorGucu(HP)',
+    'motor_hacmi': 'motorHacmi(Cc)'
+}
+
+DEFAULT_NEIGHBOURS = 8
+
+
+def partition_frame(df):
+    """Fiyatı ve model anahtarı olan ilanları bölüm sırasına diz"""
+    df = df.dropna(subset=PARTITION_COLUMNS + [PRICE_COLUMN])
+    df = df.sort_values(PARTITION_COLUMNS, kind='stable').reset_index(drop=True)
+
+    keys = df[PARTITION_COLUMNS].astype(str)
+    starts = np.flatnonzero((keys != keys.shift()).any(axis=1).to_numpy())
+    return df, keys.iloc[starts], np.append(starts, len(df))
+
+
+def normalize(values, partition, scale, fill=None):
+    """
+    Sütunları standart sapmaya böl; eksik değerleri önce bölüm, sonra genel
+    medyanla doldur. `fill` verilmezse genel medyan bu satırlardan hesaplanır.
+    Sonuç (normalize matris, genel medyan)'dır.
+    """
+    normalized = pd.DataFrame(values / scale)
+    normalized = normalized.fillna(normalized.groupby(partition).transform('median'))
+    if fill is None:
+        fill = normalized.median().to_numpy()
+    return normalized.fillna(pd.Series(fill)).fillna(0).to_numpy(dtype=np.float32), fill
+
+
+def save_index(path, meta, keys, offsets, scale, fill, matrix, values, ilan_id, price):
+    np.savez(
+        path,
+        meta=np.array(json.dumps({**meta, 'rows': len(matrix), 'partitions': len(keys)}, ensure_ascii=False)),
+        marka=keys['marka'].to_numpy(dtype=str),
+        seri=keys['seri'].to_numpy(dtype=str),
+        model=keys['model'].to_numpy(dtype=str),
+        offsets=offsets.astype(np.int64),
+        scale=scale,
+        fill=fill,
+        matrix=matrix,
+        values=values.astype(np.float32),
+        ilan_id=ilan_id,
+        price=price
+    )
+
+
+def build_comparables_index(df=None, data_path=DATA_PATH, output_path=COMPARABLES_PATH):
+    """İndeksi veri setinden oluşturup kaydet"""
+    if df is None:
+        from dataset import load_dataset
+        df = load_dataset(['ilanID'] + PARTITION_COLUMNS + NUMERIC_COLUMNS + [PRICE_COLUMN], data_path=data_path)
+
+    df, keys, offsets = partition_frame(df)
+    values = df[NUMERIC_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    scale = np.nanstd(values, axis=0)
+    scale[~(scale > 0)] = 1.0
+    matrix, fill = normalize(values, np.repeat(np.arange(len(keys)), np.diff(offsets)), scale)
+
+    meta = {
+        'version': INDEX_VERSION,
+        'data_sha256': data_stamp(data_path) if os.path.exists(data_path) else None,
+        'numeric_columns': NUMERIC_COLUMNS
+    }
+    save_index(output_path, meta, keys, offsets, scale, fill, matrix, values,
+               df['ilanID'].to_numpy(dtype=np.int64, na_value=-1),
+               df[PRICE_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    return load_comparables_file(output_path)
+
+
+def update_comparables_index(changed_listings, data_sha256, data_path=DATA_PATH, path=COMPARABLES_PATH):
+    """
+    Eklenen ve fiyatı güncellenen ilanların model bölümlerini yeniden oluştur
+
+    Dokunulmayan bölümlerin satırları olduğu gibi kalır; değişen bölümler
+    sona eklenir. Ölçek ve genel medyan kayıtlı değerlerinden alınır ve
+    yalnızca tam yeniden oluşturmada (python comparables.py) güncellenir.
+    """
+    if not os.path.exists(path):
+        return build_comparables_index(data_path=data_path, output_path=path)
+
+    with np.load(path) as stored:
+        arrays = dict(stored)
+    meta = json.loads(str(arrays['meta']))
+    if meta.get('version') != INDEX_VERSION:
+        return build_comparables_index(data_path=data_path, output_path=path)
+
+    keys = pd.DataFrame({column: arrays[column] for column in PARTITION_COLUMNS})
+    offsets = arrays['offsets']
+    partition = np.repeat(np.arange(len(keys)), np.diff(offsets))
+    cells = {key: i for i, key in enumerate(keys.itertuples(index=False, name=None))}
+
+    # Değişen ilanların eski satırları ve yeni değerlerinin düştüğü bölümler
+    stale = np.isin(arrays['ilan_id'], changed_listings['ilanID'].dropna().to_numpy(dtype=np.int64))
+    changed = changed_listings.dropna(subset=PARTITION_COLUMNS + [PRICE_COLUMN])
+    touched = set(partition[stale].tolist())
+    for key in changed[PARTITION_COLUMNS].astype(str).drop_duplicates().itertuples(index=False, name=None):
+        if key in cells:
+            touched.add(cells[key])
+    touched = np.isin(partition, list(touched))
+
+    # Değişen bölümler kalan eski satırlar ve değişen ilanlarla yeniden kurulur
+    rebuilt = touched & ~stale
+    old_rows = pd.DataFrame({
+        'ilanID': arrays['ilan_id'][rebuilt],
+        **{column: keys[column].to_numpy()[partition[rebuilt]] for column in PARTITION_COLUMNS},
+        **{column: arrays['values'][rebuilt, i] for i, column in enumerate(NUMERIC_COLUMNS)},
+        PRICE_COLUMN: arrays['price'][rebuilt]
+    })
+    new_rows = pd.DataFrame({
+        'ilanID': changed['ilanID'].to_numpy(dtype=np.int64, na_value=-1),
+        **{column: changed[column].astype(str).to_numpy() for column in PARTITION_COLUMNS},
+        **{column: changed[column].to_numpy(dtype=np.float32, na_value=np.nan) for column in NUMERIC_COLUMNS},
+        PRICE_COLUMN: changed[PRICE_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+    })
+    df, new_keys, new_offsets = partition_frame(pd.concat([old_rows, new_rows], ignore_index=True))
+    values = df[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+    matrix, _ = normalize(values, np.repeat(np.arange(len(new_keys)), np.diff(new_offsets)),
+                          arrays['scale'], arrays['fill'])
+
+    kept = ~touched
+    kept_partitions = np.flatnonzero(np.bincount(partition[kept], minlength=len(keys)))
+    sizes = np.append(np.diff(offsets)[kept_partitions], np.diff(new_offsets))
+    save_index(
+        path, {**meta, 'data_sha256': data_sha256},
+        pd.concat([keys.iloc[kept_partitions], new_keys], ignore_index=True),
+        np.append(0, np.cumsum(sizes)), arrays['scale'], arrays['fill'],
+        np.concatenate([arrays['matrix'][kept], matrix]),
+        np.concatenate([arrays['values'][kept], values.astype(np.float32)]),
+        np.append(arrays['ilan_id'][kept], df['ilanID'].to_numpy(dtype=np.int64)),
+        np.append(arrays['price'][kept], df[PRICE_COLUMN].to_numpy(dtype=np.float64))
+    )
+    load_comparables_index.cache_clear()
+    return load_comparables_file(path)
+
+
+class ComparablesIndex:
+    """Model bölümlerine ayrılmış normalize ilan matrisi"""
+
+    def __init__(self, arrays):
+        self.meta = json.loads(str(arrays['meta']))
+        self.scale = arrays['scale']
+        self.matrix = arrays['matrix']
+        self.values = arrays['values']
+        self.ilan_id = arrays['ilan_id']
+        self.price = arrays['price']
+
+        self.offsets = arrays['offsets']
+        self.partitions = {
+            key: (int(start), int(end))
+            for key, start, end in zip(zip(arrays['marka'], arrays['seri'], arrays['model']),
+                                       self.offsets[:-1], self.offsets[1:])
+        }
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def query(self, form, k=DEFAULT_NEIGHBOURS):
+        """
+        Formdaki araca en yakın k ilan
+
+        Formda boş bırakılan sayısal alanlar mesafeye katılmaz. Sonuç
+        mesafeye göre sıralı; model verisetinde yoksa boş DataFrame döner.
+        """
+        start, end = self.partitions.get((form.get('marka'), form.get('seri'), form.get('model')), (0, 0))
+
+        target = np.array([np.nan if form.get(field) is None else float(form[field]) for field in FORM_FIELDS])
+        used = ~np.isnan(target)
+        diff = self.matrix[start:end, used] - (target[used] / self.scale[used]).astype(np.float32)
+        distances = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+        if len(distances) > k:
+            nearest = np.argpartition(distances, k)[:k]
+            nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        else:
+            nearest = np.argsort(distances, kind='stable')
+
+        rows = start + nearest
+        values = self.values[rows]
+        return pd.DataFrame({
+            'ilanID': self.ilan_id[rows],
+            **{column: values[:, i] for i, column in enumerate(NUMERIC_COLUMNS)},
+            PRICE_COLUMN: self.price[rows],
+            'mesafe': distances[nearest]
+        })
+
+
+def load_comparables_file(path):
+    with np.load(path) as arrays:
+        return ComparablesIndex(arrays)
+
+
+@lru_cache(maxsize=None)
+def load_comparables_index(path=COMPARABLES_PATH, data_path=DATA_PATH):
+    """İndeksi işlem başına bir kez yükle; yoksa veya veri değiştiyse oluştur"""
+    if os.path.exists(path):
+        index = load_comparables_file(path)
+        if index.meta.get('version') == INDEX_VERSION and (
+            not os.path.exists(data_path) or index.meta.get('data_sha256') == data_stamp(data_path)
+        ):
+            return index
+
+    return build_comparables_index(data_path=data_path, output_path=path)
+
+
+def main():
+    """İndeksi yeniden oluştur"""
+    index = build_comparables_index()
+    sizes = np.diff(index.offsets)
+    print(f"✅ Benzer ilanlar indeksi kaydedildi: {COMPARABLES_PATH}")
+    print(f"   İlan: {len(index):,}, Model bölümü: {len(index.partitions):,} "
+          f"(en büyük {sizes.max() if len(sizes) else 0} ilan)")
+    print(f"   Boyut: {os.path.getsize(COMPARABLES_PATH) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
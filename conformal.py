@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Konformal Tahmin Aralıkları
+
+Eğitimde ayrılan test bölümü (main.ipynb: train_test_split, %20,
+random_state=42) üzerinde göreli hataların (|y - ŷ| / ŷ) konformal
+kantilleri hesaplanır. Kantiller marka ve tahmini fiyat bandına göre
+katmanlanır ve modelin yanına küçük bir JSON tablo olarak kaydedilir.
+Tahmin sırasında aralık yalnızca bir tablo aramasıdır: ŷ · (1 ± q).
+
+Yeterli kaydı olmayan marka × bant hücreleri sırasıyla marka, bant ve
+genel kantile düşer. Kalibrasyonu ve ulaşılan kapsama oranını yeniden
+üretmek için:
+    python conformal.py --coverage 0.9
+"""
+
+import argparse
+import json
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import BASE_DIR, DATA_PATH, MODEL_PATH, REQUIRED_COLUMNS, data_stamp, file_sha256
+
+CONFORMAL_PATH = os.path.join(BASE_DIR, 'car_price_conformal.json')
+
+# Tablo formatı değiştiğinde artırılır
+TABLE_VERSION = 1
+
+# Varsayılan hedef kapsama, fiyat bandı sayısı ve hücre başına en az kayıt
+DEFAULT_COVERAGE = 0.9
+DEFAULT_BANDS = 4
+MIN_CELL_SIZE = 30
+
+# Eğitimdeki test bölümü
+HOLDOUT_FRACTION = 0.2
+HOLDOUT_SEED = 42
+
+# Kapsama raporunda kalibrasyon / değerlendirme yarıları için tohum
+REPORT_SEED = 0
+
+
+def holdout_indices(n_rows, test_size=HOLDOUT_FRACTION, seed=HOLDOUT_SEED):
+    """sklearn train_test_split ile aynı test satırları (scikit-learn gerekmeden)"""
+    permutation = np.random.RandomState(seed).permutation(n_rows)
+    return permutation[:math.ceil(test_size * n_rows)]
+
+
+def holdout_predictions(data_path=DATA_PATH):
+    """Test bölümünün marka, gerçek fiyat ve tahminleri"""
+    from dataset import load_dataset
+    from feature_pipeline import load_feature_pipeline
+    from model_loader import load_predictor
+
+    # Eğitimde eksik kategorili satırlar bölmeden önce atılmıştı
+    df = load_dataset(data_path=data_path).dropna(subset=REQUIRED_COLUMNS).reset_index(drop=True)
+    holdout = df.iloc[holdout_indices(len(df))]
+    predictions = load_predictor().predict(load_feature_pipeline().transform(holdout))
+    return pd.DataFrame({
+        'marka': holdout['marka'].astype(str).to_numpy(),
+        'fiyat': holdout['fiyat(TRY)'].to_numpy(dtype=np.float64),
+        'tahmin': np.asarray(predictions, dtype=np.float64)
+    })
+
+
+def conformal_quantile(scores, coverage):
+    """Sonlu örnek düzeltmeli kantil: ⌈(n + 1)·kapsama⌉ / n"""
+    scores = np.sort(np.asarray(scores))
+    rank = math.ceil((len(scores) + 1) * coverage)
+    if rank > len(scores):
+        return math.inf
+    return float(scores[rank - 1])
+
+
+def calibrate(calibration, coverage=DEFAULT_COVERAGE, n_bands=DEFAULT_BANDS, min_cell_size=MIN_CELL_SIZE):
+    """Kalibrasyon kayıtlarından (marka, fiyat, tahmin) katmanlı kantil tablosu"""
+    scores = (calibration['fiyat'] - calibration['tahmin']).abs() / calibration['tahmin']
+    edges = np.quantile(calibration['tahmin'], np.linspace(0, 1, n_bands + 1)[1:-1]).tolist()
+    bands = np.searchsorted(edges, calibration['tahmin'], side='right')
+
+    def quantiles(groups):
+        return {
+            str(key): conformal_quantile(group, coverage)
+            for key, group in scores.groupby(groups)
+            if len(group) >= min_cell_size
+        }
+
+    return {
+        'coverage': coverage,
+        'band_edges': edges,
+        'global': conformal_quantile(scores, coverage),
+        'bands': quantiles(bands),
+        'marka': quantiles(calibration['marka'].to_numpy()),
+        'cells': quantiles(calibration['marka'] + '|' + bands.astype(str)),
+        'rows': len(calibration)
+    }
+
+
+class ConformalTable:
+    """Kalibre edilmiş kantil tablosu; aralıklar tablo aramasıyla hesaplanır"""
+
+    def __init__(self, table):
+        if table.get('version') != TABLE_VERSION:
+            raise ValueError(f"Konformal tablo sürümü uyumsuz: {table.get('version')} (beklenen {TABLE_VERSION})")
+        self.table = table
+        self.coverage = table['coverage']
+        self.band_edges = np.asarray(table['band_edges'])
+        self.model_sha256 = table.get('model_sha256')
+        self.report = table.get('report', {})
+
+    def quantiles(self, predictions, markas=None):
+        """Her tahmin için göreli kantil (hücre → marka → bant → genel)"""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        bands = np.searchsorted(self.band_edges, predictions, side='right').astype(str)
+        if markas is None:
+            markas = np.full(len(predictions), '', dtype=object)
+        markas = pd.Series(markas, dtype=object).fillna('').astype(str).to_numpy()
+
+        result = pd.Series(np.nan, index=range(len(predictions)))
+        for level, keys in (('cells', pd.Series(markas) + '|' + bands),
+                            ('marka', pd.Series(markas)),
+                            ('bands', pd.Series(bands))):
+            missing = result.isna()
+            if missing.any():
+                result[missing] = keys[missing].map(self.table[level])
+        return result.fillna(self.table['global']).to_numpy()
+
+    def intervals(self, predictions, markas=None):
+        """Vektörel alt/üst sınırlar"""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        q = self.quantiles(predictions, markas)
+        return np.maximum(predictions * (1 - q), 0), predictions * (1 + q)
+
+    def interval(self, prediction, marka=None):
+        """Tek tahmin için (alt, üst)"""
+        low, high = self.intervals([prediction], [marka])
+        return float(low[0]), float(high[0])
+
+
+def coverage_report(data, coverage=DEFAULT_COVERAGE, n_bands=DEFAULT_BANDS,
+                    min_cell_size=MIN_CELL_SIZE, seed=REPORT_SEED):
+    """
+    Test bölümünü ikiye ayırıp bir yarıda kalibre et, diğer yarıda ulaşılan
+    kapsamayı ve ortalama göreli aralık genişliğini ölç
+    """
+    order = np.random.RandomState(seed).permutation(len(data))
+    half = len(data) // 2
+    calibration, evaluation = data.iloc[order[:half]], data.iloc[order[half:]]
+
+    table = ConformalTable({'version': TABLE_VERSION,
+                            **calibrate(calibration, coverage, n_bands, min_cell_size)})
+    low, high = table.intervals(evaluation['tahmin'], evaluation['marka'])
+    covered = (evaluation['fiyat'] >= low) & (evaluation['fiyat'] <= high)
+    width = (high - low) / evaluation['tahmin'] / 2
+
+    bands = np.searchsorted(table.band_edges, evaluation['tahmin'], side='right')
+    return {
+        'hedef': coverage,
+        'kapsama': float(covered.mean()),
+        'ortalama_genislik': float(width.mean()),
+        'degerlendirme_satiri': len(evaluation),
+        'bant_kapsama': {str(band): float(covered[bands == band].mean()) for band in np.unique(bands)}
+    }
+
+
+def build_conformal_table(coverage=DEFAULT_COVERAGE, n_bands=DEFAULT_BANDS, min_cell_size=MIN_CELL_SIZE,
+                          data_path=DATA_PATH, model_path=MODEL_PATH, output_path=CONFORMAL_PATH):
+    """Tabloyu tüm test bölümüyle kalibre edip kapsama raporuyla birlikte kaydet"""
+    data = holdout_predictions(data_path)
+    table = {
+        'version': TABLE_VERSION,
+        'model_sha256': file_sha256(model_path),
+        'data_sha256': data_stamp(data_path),
+        **calibrate(data, coverage, n_bands, min_cell_size),
+        'report': coverage_report(data, coverage, n_bands, min_cell_size)
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=1)
+
+    return ConformalTable(table)
+
+
+@lru_cache(maxsize=None)
+def load_conformal_table(path=CONFORMAL_PATH, model_path=MODEL_PATH):
+    """Tabloyu işlem başına bir kez yükle; yoksa veya model değiştiyse yeniden kalibre et"""
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        if table.get('version') == TABLE_VERSION and (
+            not os.path.exists(model_path) or table.get('model_sha256') == file_sha256(model_path)
+        ):
+            return ConformalTable(table)
+
+    return build_conformal_table(model_path=model_path, output_path=path)
+
+
+def main():
+    """Tabloyu kalibre et ve kapsama raporunu yazdır"""
+    parser = argparse.ArgumentParser(description="Konformal tahmin aralığı kalibrasyonu")
+    parser.add_argument('--coverage', type=float, default=DEFAULT_COVERAGE, help="Hedef kapsama (0-1)")
+    parser.add_argument('--bands', type=int, default=DEFAULT_BANDS, help="Fiyat bandı sayısı")
+    parser.add_argument('--min-cell-size', type=int, default=MIN_CELL_SIZE, help="Hücre başına en az kayıt")
+    args = parser.parse_args()
+
+    table = build_conformal_table(args.coverage, args.bands, args.min_cell_size)
+    report = table.report
+    print(f"✅ Konformal tablo kaydedildi: {CONFORMAL_PATH}")
+    print(f"   Kalibrasyon: {table.table['rows']} test satırı, "
+          f"{len(table.table['cells'])} marka×bant, {len(table.table['marka'])} marka, "
+          f"{len(table.table['bands'])} bant hücresi")
+    print(f"   Bant sınırları: {', '.join(f'{edge:,.0f}' for edge in table.band_edges)} TL")
+    print(f"   Genel kantil: ±{table.table['global']:.1%}")
+    print(f"   Kapsama (yarı kalibrasyon / yarı değerlendirme, {report['degerlendirme_satiri']} satır): "
+          f"{report['kapsama']:.1%} (hedef {report['hedef']:.0%}), "
+          f"ortalama genişlik ±{report['ortalama_genislik']:.1%}")
+    for band, value in report['bant_kapsama'].items():
+        print(f"     bant {band}: {value:.1%}")
+
+
+if __name__ == "__main__":
+    main()
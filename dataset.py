@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Tipli Veri Seti
+
+cars_tr.csv dosyası bir kez temizlenip (yer değiştirmiş sütunlar düzeltilmiş,
+metin alanları sayıya çevrilmiş) sütunlu Feather dosyasına yazılır.
+Kategorik sütunlar sözlük kodlu, sayısal sütunlar int32/float32 saklanır.
+Okuyucular yalnızca ihtiyaç duydukları sütunları bellek eşlemeli olarak
+yükler; ham CSV her sayfada yeniden ayrıştırılmaz.
+
+ingest.py ile eklenen ilanlar ana dosya yeniden yazılmadan sıralı parça
+dosyalarına (cars_tr.0001.feather, ...) yazılır; her parça satırlarının
+veri setindeki konumunu taşır ve okuma sırasında ana dosyayla birleştirilir.
+Parça sayısı MAX_PARTS'a ulaşınca veri seti tek dosyada toplanır.
+
+Veri setini yeniden oluşturmak için:
+    python dataset.py
+"""
+
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cleaning import CATEGORICAL_COLUMNS, LOCATION_COLUMNS, clean_listings, read_listings
+from preprocessing import BASE_DIR, DATA_PATH, data_stamp
+
+DATASET_PATH = os.path.join(BASE_DIR, 'cars_tr.feather')
+
+# Veri seti formatı değiştiğinde artırılır
+DATASET_VERSION = 4
+
+# Bu kadar parça birikince veri seti tek dosyada birleştirilir
+MAX_PARTS = 32
+
+# Parça satırlarının veri setindeki konumu
+POSITION_COLUMN = 'satir'
+
+# Sütun tipleri. Model özellikleri zaten float32 olduğundan float32 sütunlar
+# tahmini değiştirmez; 16,7 milyonu aşabilen tamsayılar (ilan no, fiyat) int32 kalır
+DATASET_DTYPES = {
+    'ilanID': 'Int32',
+    **{column: 'category' for column in CATEGORICAL_COLUMNS + LOCATION_COLUMNS},
+    'fiyat(TRY)': 'Int32',
+    'yıl': 'float32',
+    'kilometre(Km)': 'float32',
+    'motorHacmi(Cc)': 'float32',
+    'motorGucu(HP)': 'float32',
+    'aracVergisi(TRY)': 'float32',
+    'tramer': 'float32',
+    'hasar_skoru': 'int32'
+}
+
+
+def to_dataset_types(cleaned):
+    """Temizlenmiş kayıtları veri seti tiplerine çevir"""
+    return cleaned.astype({column: dtype for column, dtype in DATASET_DTYPES.items()
+                           if column in cleaned})
+
+
+def latest_listings(df):
+    """
+    Aynı ilan numarası birden çok kez geçiyorsa (sonradan eklenen fiyat
+    güncellemeleri) ilanı ilk konumunda, son satırın değerleriyle tut
+    """
+    ids = df['ilanID']
+    if not ids.dropna().duplicated().any():
+        return df
+
+    keyed = df[ids.notna()]
+    first = keyed[~keyed['ilanID'].duplicated(keep='first')]
+    latest = keyed.drop_duplicates('ilanID', keep='last').set_index('ilanID')
+    latest = latest.loc[first['ilanID']].reset_index().set_axis(first.index)[df.columns]
+    return pd.concat([latest, df[ids.isna()]]).sort_index()
+
+
+def dataset_parts(path=DATASET_PATH):
+    """Ana dosyaya eklenmiş parça dosyaları, eklenme sırasıyla"""
+    directory, name = os.path.split(path)
+    pattern = re.compile(re.escape(os.path.splitext(name)[0]) + r'\.(\d+)\.feather')
+    parts = []
+    for entry in os.listdir(directory or '.'):
+        match = pattern.fullmatch(entry)
+        if match:
+            parts.append((int(match.group(1)), os.path.join(directory, entry)))
+    return [part for _, part in sorted(parts)]
+
+
+def _metadata(path):
+    """Feather dosyasının şema meta kaydı"""
+    import pyarrow.feather as feather
+
+    return feather.read_table(path, columns=[], memory_map=True).schema.metadata or {}
+
+
+def _latest_metadata(path):
+    """Son yazılan dosyanın (son parça, yoksa ana dosya) meta kaydı"""
+    parts = dataset_parts(path)
+    return _metadata(parts[-1] if parts else path)
+
+
+def dataset_rows(path=DATASET_PATH):
+    """Veri setindeki ilan sayısı; dosyalar okunmadan meta kaydından"""
+    return int(_latest_metadata(path)[b'rows'])
+
+
+def _stamp(table, data_sha256, rows):
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'version': str(DATASET_VERSION).encode(),
+        b'data_sha256': data_sha256.encode(),
+        b'rows': str(rows).encode()
+    })
+
+
+def write_dataset(df, data_sha256, output_path=DATASET_PATH):
+    """Tipli tabloyu sürüm ve kaynak CSV özetiyle Feather dosyasına yaz; parçaları sil"""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    # Parçalar önce silinir; yarıda kalan yazımda eski özet yeniden oluşturmayı tetikler
+    for part in dataset_parts(output_path):
+        os.remove(part)
+    table = _stamp(pa.Table.from_pandas(df, preserve_index=False), data_sha256, len(df))
+    # Sıkıştırmasız dosya bellek eşlemeyle kopyalanmadan okunabilir
+    feather.write_feather(table, output_path, compression='uncompressed')
+
+
+def build_dataset(data_path=DATA_PATH, output_path=DATASET_PATH):
+    """Ham CSV'yi temizleyip tipli Feather dosyasına yaz"""
+    df = to_dataset_types(latest_listings(clean_listings(read_listings(data_path))))
+    write_dataset(df, data_stamp(data_path), output_path)
+    return df
+
+
+def _read_table(path, columns=None):
+    """
+    Ana dosya ve parçalardan güncel arrow tablosu
+
+    Güncellenen ilanların satırları parçadaki yeni değerleriyle yer değiştirir;
+    parça yoksa veya yalnızca yeni ilan eklendiyse tablo kopyalanmaz.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    parts = dataset_parts(path)
+    if not parts:
+        return table
+
+    tables, order, offset = [table], np.arange(table.num_rows), table.num_rows
+    for part_path in parts:
+        part = feather.read_table(part_path, columns=None if columns is None else columns + [POSITION_COLUMN],
+                                  memory_map=True)
+        positions = part[POSITION_COLUMN].to_numpy()
+        if len(positions) and positions.max() >= len(order):
+            order = np.append(order, np.arange(len(order), positions.max() + 1))
+        order[positions] = offset + np.arange(part.num_rows)
+        tables.append(part.drop_columns([POSITION_COLUMN]).replace_schema_metadata(table.schema.metadata))
+        offset += part.num_rows
+
+    table = pa.concat_tables(tables)
+    if len(order) == offset and np.array_equal(order, np.arange(offset)):
+        return table
+    return table.take(order)
+
+
+def _to_pandas(table):
+    import pyarrow as pa
+
+    # Eksik değerli tamsayılar float64'e değil, pandas'ın boş değer destekli tipine açılır
+    return table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+
+
+def append_dataset(new_rows, updated_positions, updated_rows, data_sha256, path=DATASET_PATH):
+    """
+    Temizlenmiş yeni ilanları sona ekle, güncellenen ilanları yerinde değiştir
+
+    Ham CSV ve mevcut dosyalar yeniden yazılmaz; satırlar konumlarıyla yeni
+    bir parça dosyasına yazılır. Parça sayısı MAX_PARTS'a ulaştıysa veri seti
+    tek dosyada toplanır. Sonuç yeni ilan sayısıdır.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    parts = dataset_parts(path)
+    schema = feather.read_table(path, columns=[], memory_map=True).schema
+    rows_before = dataset_rows(path)
+    rows = rows_before + len(new_rows)
+
+    part = to_dataset_types(pd.concat([new_rows[schema.names], updated_rows[schema.names]], ignore_index=True))
+    positions = np.concatenate([np.arange(rows_before, rows), np.asarray(updated_positions, dtype=np.int64)])
+    table = pa.Table.from_pandas(part, schema=schema.remove_metadata(), preserve_index=False)
+    table = _stamp(table.append_column(POSITION_COLUMN, pa.array(positions, pa.int64())), data_sha256, rows)
+
+    number = int(re.search(r'\.(\d+)\.feather$', parts[-1]).group(1)) + 1 if parts else 1
+    feather.write_feather(table, f'{os.path.splitext(path)[0]}.{number:04d}.feather', compression='uncompressed')
+
+    if len(parts) + 1 >= MAX_PARTS:
+        write_dataset(_to_pandas(_read_table(path)), data_sha256, path)
+    return rows
+
+
+@lru_cache(maxsize=None)
+def ensure_dataset(path=DATASET_PATH, data_path=DATA_PATH):
+    """Veri seti yoksa, sürümü eskiyse veya CSV değiştiyse işlem başına bir kez oluştur"""
+    if os.path.exists(path):
+        metadata = _latest_metadata(path)
+        if metadata.get(b'version') == str(DATASET_VERSION).encode() and (
+            not os.path.exists(data_path)
+            or metadata.get(b'data_sha256') == data_stamp(data_path).encode()
+        ):
+            return path
+
+    build_dataset(data_path, path)
+    return path
+
+
+def load_dataset(columns=None, path=DATASET_PATH, data_path=DATA_PATH, rows=None):
+    """
+    Temizlenmiş veri setini yükle
+
+    `columns` verilirse yalnızca bu sütunlar, `rows` verilirse yalnızca bu
+    konumlardaki ilanlar okunur. pyarrow kurulu değilse aynı tablo CSV'den
+    temizlenerek üretilir.
+    """
+    columns = list(columns) if columns is not None else None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        df = to_dataset_types(latest_listings(clean_listings(read_listings(data_path)))).reset_index(drop=True)
+        df = df if columns is None else df[columns]
+        return df if rows is None else df.iloc[rows].reset_index(drop=True)
+
+    table = _read_table(ensure_dataset(path, data_path), columns)
+    if rows is not None:
+        table = table.take(np.asarray(rows, dtype=np.int64))
+    return _to_pandas(table)
+
+
+def main():
+    """Veri setini yeniden oluştur"""
+    df = build_dataset()
+    print(f"✅ Tipli veri seti kaydedildi: {DATASET_PATH}")
+    print(f"   {len(df):,} satır, {len(df.columns)} sütun")
+    print(f"   Dosya: {os.path.getsize(DATASET_PATH) / 1024:.0f} KB "
+          f"(CSV: {os.path.getsize(DATA_PATH) / 1024:.0f} KB)")
+    print(f"   Bellek: {df.memory_usage(deep=True).sum() / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
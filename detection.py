@@ -0,0 +1,337 @@
+"""
+Exper Online YOLO Tespit Yardımcıları
+
+Streamlit'ten bağımsızdır: sayfa, kamera boru hattı ve benchmark'lar aynı
+sonuç dönüşümünü ve çizimi kullanır. cv2 ve ultralytics ilgili fonksiyon
+çalıştığında içe aktarılır.
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from yolo_export import IMAGE_SIZE
+
+# Kutu ve etiket rengi (BGR)
+BOX_COLOR = (0, 255, 0)
+
+JPEG_QUALITY = 90
+
+# Tek `model` çağrısında işlenen fotoğraf sayısı
+DEFAULT_BATCH_SIZE = 8
+BATCH_SIZES = [1, 4, 8, 16]
+
+# Karolu (yüksek çözünürlüklü) tespit ayarları
+DEFAULT_TILE_SIZE = 640
+TILE_SIZES = [320, 480, 640, 800, 960, 1280]
+DEFAULT_TILE_OVERLAP = 0.2
+DEFAULT_TILE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+NMS_IOU_THRESHOLD = 0.5
+
+
+def class_name(model, class_id):
+    """Sınıf numarasının model içindeki adı"""
+    names = getattr(model, 'names', None)
+    if names is not None and class_id < len(names):
+        return names[class_id]
+    return f'Class_{class_id}'
+
+
+def yolo_detections(results, model):
+    """YOLO sonuçlarını {'bbox', 'confidence', 'class_id', 'class_name'} sözlüklerine çevir"""
+    detections = []
+    for result in results:
+        boxes = result.boxes
+        if boxes is None or not len(boxes):
+            continue
+        # Kutular tek seferde CPU'ya alınır
+        coordinates = boxes.xyxy.cpu().numpy()
+        confidences = boxes.conf.cpu().numpy()
+        class_ids = boxes.cls.cpu().numpy().astype(int)
+        for (x1, y1, x2, y2), confidence, class_id in zip(coordinates, confidences, class_ids):
+            detections.append({
+                'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                'confidence': float(confidence),
+                'class_id': int(class_id),
+                'class_name': class_name(model, int(class_id))
+            })
+    return detections
+
+
+def detect(image, model):
+    """Görüntüde (numpy dizisi veya PIL görüntüsü) YOLO tespiti yap"""
+    results = model(np.asarray(image), verbose=False)
+    return yolo_detections(results, model), results
+
+
+def detect_batch(images, model, batch_size=DEFAULT_BATCH_SIZE, progress=None, **options):
+    """
+    Fotoğrafları `batch_size`'lık gruplar halinde tespit et
+
+    Her grup tek `model` çağrısıdır; sonuç her fotoğrafın tespit listesidir.
+    `progress(islenen, toplam)` her gruptan sonra çağrılır, `options`
+    modele aktarılır (ör. device='cpu').
+    """
+    images = [np.asarray(image) for image in images]
+    detections = []
+    for start in range(0, len(images), batch_size):
+        batch = images[start:start + batch_size]
+        results = model(batch, verbose=False, **options)
+        detections.extend(yolo_detections([result], model) for result in results)
+        if progress is not None:
+            progress(len(detections), len(images))
+    return detections
+
+
+def summarize_vehicle(detections_per_image):
+    """
+    Bir aracın tüm fotoğraflarındaki tespitleri sınıf bazında topla
+
+    Sonuç {sınıf: {'adet', 'fotograf', 'en_yuksek_guven'}} sözlüğüdür
+    (adet azalan sırada); 'fotograf' sınıfın görüldüğü fotoğraf sayısıdır.
+    """
+    summary = {}
+    for detections in detections_per_image:
+        seen = set()
+        for detection in detections:
+            name = detection['class_name']
+            entry = summary.setdefault(name, {'adet': 0, 'fotograf': 0, 'en_yuksek_guven': 0.0})
+            entry['adet'] += 1
+            entry['en_yuksek_guven'] = max(entry['en_yuksek_guven'], detection['confidence'])
+            if name not in seen:
+                entry['fotograf'] += 1
+                seen.add(name)
+    return dict(sorted(summary.items(), key=lambda item: -item[1]['adet']))
+
+
+def box_iou(box, boxes):
+    """Bir kutunun kutu dizisiyle IoU değerleri"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return intersection / np.maximum(area + areas - intersection, 1e-9)
+
+
+def class_aware_nms(detections, iou_threshold=NMS_IOU_THRESHOLD):
+    """Aynı sınıfın örtüşen kutularından yalnızca en güvenlisini tut (güven sırasıyla)"""
+    if not detections:
+        return []
+    boxes = np.array([detection['bbox'] for detection in detections], dtype=np.float64)
+    scores = np.array([detection['confidence'] for detection in detections])
+    classes = np.array([detection['class_id'] for detection in detections])
+
+    suppressed = np.zeros(len(detections), dtype=bool)
+    keep = []
+    for i in np.argsort(-scores, kind='stable'):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= (classes == classes[i]) & (box_iou(boxes[i], boxes) > iou_threshold)
+    return [detections[i] for i in keep]
+
+
+def tile_windows(height, width, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP):
+    """Görüntüyü örten (x1, y1, x2, y2) karoları; son karo kenara hizalanır"""
+    stride = max(1, int(tile_size * (1 - overlap)))
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        return list(range(0, length - tile_size, stride)) + [length - tile_size]
+
+    return [(x, y, min(x + tile_size, width), min(y + tile_size, height))
+            for y in starts(height) for x in starts(width)]
+
+
+def shift_detections(detections, dx=0, dy=0, scale=1.0):
+    """Tespit kutularını tam görüntü koordinatlarına taşı"""
+    shifted = []
+    for detection in detections:
+        x1, y1, x2, y2 = detection['bbox']
+        bbox = [x1 * scale + dx, y1 * scale + dy, x2 * scale + dx, y2 * scale + dy]
+        shifted.append({**detection, 'bbox': [int(round(value)) for value in bbox]})
+    return shifted
+
+
+class TiledDetector:
+    """
+    Yüksek çözünürlüklü fotoğraflarda küçük hasarlar için karolu tespit
+
+    Fotoğraf örtüşen karolara bölünür (kopyasız dilimler), karolar
+    `batch_size`'lık gruplar halinde `workers` iş parçacığında modelden
+    geçirilir ve tespitler sınıf bazında NMS ile tam görüntü koordinatlarında
+    birleştirilir. `include_full` ile büyük hasarlar için küçültülmüş tam
+    görüntü de tespit edilir. Karo boyutu, örtüşme ve grup boyutu çağrı
+    başına verilir; tek nesne tüm ayarlarda kullanılabilir.
+
+    ultralytics modelleri iş parçacıkları arasında paylaşılamadığından her
+    havuz iş parçacığı `load_model()` ile kendi modelini yükler. Tek iş
+    parçacığında tespit çağıranın iş parçacığında yapılır; çağıran iş
+    parçacığı değişebildiğinden (ör. Streamlit yeniden çalıştırmaları) tek
+    model bir kez yüklenir ve kilitle paylaşılır.
+    """
+
+    def __init__(self, load_model, workers=DEFAULT_TILE_WORKERS, include_full=True,
+                 iou_threshold=NMS_IOU_THRESHOLD):
+        self.load_model = load_model
+        self.workers = workers
+        self.include_full = include_full
+        self.iou_threshold = iou_threshold
+        self.local = threading.local()
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='karo-tespit') if workers > 1 else None
+        self.lock = threading.Lock()
+        self.shared_model = None
+
+    def model(self):
+        """Havuz iş parçacığının modeli (ilk kullanımda yüklenir)"""
+        model = getattr(self.local, 'model', None)
+        if model is None:
+            model = self.local.model = self.load_model()
+        return model
+
+    def _detect(self, crops, batch_size):
+        if self.executor is not None:
+            return detect_batch(crops, self.model(), batch_size)
+        with self.lock:
+            if self.shared_model is None:
+                self.shared_model = self.load_model()
+            return detect_batch(crops, self.shared_model, batch_size)
+
+    def detect(self, image, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP,
+               batch_size=DEFAULT_BATCH_SIZE):
+        """Tek fotoğrafın birleştirilmiş tespitleri"""
+        height, width = image.shape[:2]
+        windows = tile_windows(height, width, tile_size, overlap)
+        crops = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+        batches = [crops[start:start + batch_size] for start in range(0, len(crops), batch_size)]
+
+        full = self.include_full and len(windows) > 1
+        if full:
+            import cv2
+
+            # Küçültülmüş tam görüntü de aynı iş parçacıklarında tespit edilir
+            scale = IMAGE_SIZE / max(height, width)
+            batches.append([cv2.resize(image, (round(width * scale), round(height * scale)),
+                                       interpolation=cv2.INTER_AREA)])
+
+        mapper = self.executor.map if self.executor is not None else map
+        results = [detections for batch in mapper(partial(self._detect, batch_size=batch_size), batches)
+                   for detections in batch]
+
+        detections = []
+        for (x1, y1, _, _), tile_detections in zip(windows, results):
+            detections.extend(shift_detections(tile_detections, x1, y1))
+        if full:
+            detections.extend(shift_detections(results[-1], scale=1 / scale))
+        return class_aware_nms(detections, self.iou_threshold)
+
+    def detect_many(self, images, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP,
+                    batch_size=DEFAULT_BATCH_SIZE, progress=None, decode=None):
+        """
+        Fotoğrafların tespitleri; `progress(islenen, toplam)` fotoğraf başına çağrılır
+
+        `decode` verilirse `images` öğeleri (ör. yüklenen dosyalar) tespitten
+        hemen önce bu fonksiyonla görüntüye çevrilir; bellekte aynı anda
+        yalnızca bir tam çözünürlüklü kare bulunur.
+        """
+        results = []
+        for image in images:
+            if decode is not None:
+                image = decode(image)
+            results.append(self.detect(image, tile_size, overlap, batch_size))
+            if progress is not None:
+                progress(len(results), len(images))
+        return results
+
+    def tile_count(self, image, tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_TILE_OVERLAP):
+        return len(tile_windows(image.shape[0], image.shape[1], tile_size, overlap))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def image_size(data):
+    """Sıkıştırılmış görüntünün (genişlik, yükseklik) boyutu (yalnızca başlık okunur)"""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def image_long_side(data):
+    """Sıkıştırılmış görüntünün uzun kenarı (yalnızca başlık okunur)"""
+    size = image_size(data)
+    return max(size) if size else None
+
+
+def decode_image(data, max_side=IMAGE_SIZE):
+    """
+    Yüklenen dosyayı (bytes veya memoryview) bir kez BGR diziye çöz
+
+    Uzun kenarı `max_side`'dan büyük görüntüler modelin girdi boyutuna
+    küçültülür; JPEG'ler mümkünse libjpeg'in 1/2, 1/4, 1/8 ölçekli çözümüyle
+    okunduğundan tam boyutlu kare hiç oluşturulmaz.
+    """
+    import cv2
+
+    flag = cv2.IMREAD_COLOR
+    long_side = image_long_side(data) if max_side else None
+    if long_side:
+        for factor, reduced in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if long_side // factor >= max_side:
+                flag = reduced
+                break
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if image is None:
+        raise ValueError("Görüntü çözülemedi")
+
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width) if max_side else 1.0
+    if scale < 1.0:
+        image = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+    return image
+
+
+def encode_jpeg(image, quality=JPEG_QUALITY):
+    """BGR diziyi bellekte JPEG baytlarına kodla"""
+    import cv2
+
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Görüntü JPEG olarak kodlanamadı")
+    return encoded.tobytes()
+
+
+def draw_detections(image, detections, inplace=False):
+    """Tespit sonuçlarını görüntü (veya `inplace` değilse kopyası) üzerine çiz"""
+    import cv2
+
+    image_with_detections = image if inplace else image.copy()
+
+    for detection in detections:
+        x1, y1, x2, y2 = detection['bbox']
+        label = f"{detection['class_name']}: {detection['confidence']:.2f}"
+        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+
+        # Kutu, etiket arka planı ve etiket metni
+        cv2.rectangle(image_with_detections, (x1, y1), (x2, y2), BOX_COLOR, 2)
+        cv2.rectangle(image_with_detections, (x1, y1 - label_size[1] - 10),
+                      (x1 + label_size[0], y1), BOX_COLOR, -1)
+        cv2.putText(image_with_detections, label, (x1, y1 - 5),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+
+    return image_with_detections
@@ -0,0 +1,253 @@
+"""
+Tespit Önbelleği
+
+Streamlit her etkileşimde sayfayı yeniden çalıştırır ve ekspertizler aynı
+fotoğrafları farklı oturumlarda tekrar yükler. Tespit sonuçları (kutular,
+sınıflar, güven değerleri ve modelin özeti) fotoğraf içeriğinin SHA-256
+özeti ile saklanır; işaretli görüntü YOLO yeniden çalıştırılmadan
+önbellekteki kutulardan çizilir.
+
+İşlem içi katman, kayıtların JSON boyutuyla bayt olarak sınırlanan bir
+LRU'dur. İsteğe bağlı SQLite deposu (DETECTION_CACHE_DB) sonuçları
+süreçler ve oturumlar arasında paylaşır. Kayıtlar tespiti yapan modelin
+özetiyle işaretlenir; özet model dosyasından değil, çağıranın sunduğu model
+nesnesinden gelir. Böylece dosya değişip model henüz yeniden yüklenmediyse
+eski modelin sonuçları yeni özetle saklanmaz.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from yolo_export import IMAGE_SIZE
+
+# İşlem içi katmanın ve SQLite deposunun bayt sınırları
+DEFAULT_MAX_BYTES = 32 * 1024 ** 2
+DEFAULT_STORE_MAX_BYTES = 256 * 1024 ** 2
+
+# Süreçler arası paylaşılan önbellek için SQLite dosyası (boşsa yalnızca işlem içi)
+CACHE_DB_ENV = 'DETECTION_CACHE_DB'
+
+
+def content_key(data, max_side=IMAGE_SIZE, tiling=None):
+    """
+    Fotoğraf baytlarının anahtarı
+
+    Kutular çözülen (küçültülmüş) görüntünün koordinatlarında olduğundan
+    çözme boyutu, karolu tespitte de (karo boyutu, örtüşme) anahtara girer.
+    """
+    key = f"{hashlib.sha256(data).hexdigest()}:{max_side}"
+    if tiling is not None:
+        key += ':' + ':'.join(str(value) for value in tiling)
+    return key
+
+
+class SQLiteDetectionStore:
+    """Süreçler ve oturumlar arasında paylaşılan tespit deposu"""
+
+    def __init__(self, path, max_bytes=DEFAULT_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS detections ("
+                " key TEXT PRIMARY KEY, model_sha256 TEXT, value TEXT,"
+                " size INTEGER, used_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS detections_used ON detections(used_at)")
+
+    def connect(self):
+        """İş parçacığı başına bir bağlantı"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.local.connection = connection
+        return connection
+
+    def get(self, key, model_sha256, now):
+        connection = self.connect()
+        row = connection.execute(
+            "SELECT value FROM detections WHERE key = ? AND model_sha256 = ?",
+            (key, model_sha256)
+        ).fetchone()
+        if row is not None:
+            connection.execute("UPDATE detections SET used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+        return None
+
+    def put(self, items, model_sha256, now):
+        """Sonuçları yaz; bayt sınırı aşılınca eski modelin ve en eski kullanılan kayıtları sil"""
+        connection = self.connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?)",
+                [(key, model_sha256, value, len(value), now) for key, value in items]
+            )
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM detections").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        with connection:
+            removed = connection.execute(
+                "DELETE FROM detections WHERE model_sha256 != ?", (model_sha256,)
+            ).rowcount
+            rows = connection.execute("SELECT key, size FROM detections ORDER BY used_at").fetchall()
+            total = sum(size for _, size in rows)
+            stale = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            connection.executemany("DELETE FROM detections WHERE key = ?", stale)
+        return removed + len(stale)
+
+    def clear(self):
+        with self.connect() as connection:
+            connection.execute("DELETE FROM detections")
+
+
+class DetectionCache:
+    """Bayt sınırlı LRU tespit önbelleği (iş parçacığı güvenli)"""
+
+    def __init__(self, model_sha256=None, max_bytes=DEFAULT_MAX_BYTES, store=None):
+        self.model_sha256 = model_sha256
+        self.max_bytes = max_bytes
+        self.store = store
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_model(self, model_sha256):
+        """Model değiştiyse işlem içi kayıtları temizle"""
+        with self.lock:
+            if model_sha256 != self.model_sha256:
+                self.model_sha256 = model_sha256
+                self.entries.clear()
+                self.size = 0
+
+    def get(self, key, now=None, model_sha256=None):
+        """Anahtarın verilen modelle (varsayılan: güncel model) tespit listesi; yoksa None"""
+        now = time.time() if now is None else now
+        model_sha256 = self.model_sha256 if model_sha256 is None else model_sha256
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] == model_sha256:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[0])
+
+        if self.store is not None:
+            value = self.store.get(key, model_sha256, now)
+            if value is not None:
+                with self.lock:
+                    self.hits += 1
+                    self._insert(key, value, model_sha256)
+                return json.loads(value)
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put_many(self, items, now=None, model_sha256=None):
+        """Verilen modelin (varsayılan: güncel model) (anahtar, tespit listesi) çiftlerini ekle"""
+        now = time.time() if now is None else now
+        model_sha256 = self.model_sha256 if model_sha256 is None else model_sha256
+        encoded = [(key, json.dumps(detections, ensure_ascii=False)) for key, detections in items]
+        with self.lock:
+            for key, value in encoded:
+                self._insert(key, value, model_sha256)
+        if self.store is not None:
+            removed = self.store.put(encoded, model_sha256, now)
+            with self.lock:
+                self.evictions += removed
+
+    def _insert(self, key, value, model_sha256):
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key)[0])
+        self.entries[key] = (value, model_sha256)
+        self.size += len(value)
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def detect(self, keys, images, detect_fn, model_sha256=None):
+        """
+        Fotoğrafları önbellekle tespit et
+
+        Önbellekte olmayan fotoğraflar tek listede `detect_fn`'e verilir;
+        aynı içerikli fotoğraflar bir kez tespit edilir. `model_sha256`,
+        `detect_fn`'in kullandığı modelin özetidir; verilirse önbelleğin
+        modeli buna geçer ve kayıtlar bu özetle okunup yazılır.
+        """
+        if model_sha256 is None:
+            model_sha256 = self.model_sha256
+        else:
+            self.set_model(model_sha256)
+        results = {}
+        missing = {}
+        for key, image in zip(keys, images):
+            if key in results or key in missing:
+                continue
+            detections = self.get(key, model_sha256=model_sha256)
+            if detections is None:
+                missing[key] = image
+            else:
+                results[key] = detections
+
+        if missing:
+            detected = detect_fn(list(missing.values()))
+            self.put_many(list(zip(missing, detected)), model_sha256=model_sha256)
+            results.update(zip(missing, detected))
+
+        return [results[key] for key in keys]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self):
+        """İsabet/kayıp/çıkarma sayaçları"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'isabet': self.hits,
+                'kayip': self.misses,
+                'cikarma': self.evictions,
+                'isabet_orani': round(self.hits / lookups, 4) if lookups else 0.0,
+                'kayit': len(self.entries),
+                'bayt': self.size,
+                'max_bayt': self.max_bytes,
+                'paylasimli': self.store is not None
+            }
+
+
+def load_detection_cache(model_sha256=None, max_bytes=DEFAULT_MAX_BYTES, db_path=None,
+                         store_max_bytes=DEFAULT_STORE_MAX_BYTES):
+    """
+    Model özetine bağlı önbellek oluştur
+
+    `model_sha256` sunulan modelin özetidir; verilmezse özet her `detect`
+    çağrısında verilmelidir. `db_path` verilmezse DETECTION_CACHE_DB ortam
+    değişkenine bakılır; ikisi de yoksa önbellek yalnızca işlem içidir.
+    """
+    db_path = db_path or os.environ.get(CACHE_DB_ENV)
+    store = SQLiteDetectionStore(db_path, max_bytes=store_max_bytes) if db_path else None
+    return DetectionCache(
+        model_sha256=model_sha256,
+        max_bytes=max_bytes,
+        store=store
+    )
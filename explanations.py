@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tahmin Açıklamaları
+
+Varsayılan arka uç, XGBoost'un kendi TreeSHAP hesabıdır
+(`pred_contribs` / `pred_interactions`); shap paketi hiç içe aktarılmaz
+ve N satır tek çağrıda açıklanır. İstenirse `backend='shap'` ile SHAP
+TreeExplainer kullanılır; bu açıklayıcı süreç başına bir kez, önbelleğe
+alınmış modelden ve diske kaydedilmiş sabit bir arka plan örneğinden
+kurulur. Her iki açıklayıcı da tüm oturumlar ve sayfalarca paylaşılır.
+
+Arka plan örneğini yeniden oluşturmak için:
+    python explanations.py
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from preprocessing import BASE_DIR, DATA_PATH, REQUIRED_COLUMNS, data_stamp
+
+BACKGROUND_PATH = os.path.join(BASE_DIR, 'shap_background.npz')
+
+# Açıklama arka uçları; varsayılan XGBoost'un yerel TreeSHAP hesabıdır
+BACKENDS = ('native', 'shap')
+DEFAULT_BACKEND = 'native'
+
+# Arka plan örneğinin satır sayısı ve örnekleme tohumu
+BACKGROUND_SIZE = 100
+BACKGROUND_SEED = 42
+
+
+def build_background(data_path=DATA_PATH, output_path=BACKGROUND_PATH,
+                     size=BACKGROUND_SIZE, seed=BACKGROUND_SEED):
+    """Veri setinden sabit tohumlu örnek seçip özellik matrisini kaydet"""
+    from dataset import load_dataset
+    from feature_pipeline import load_feature_pipeline
+
+    df = load_dataset(data_path=data_path).dropna(subset=REQUIRED_COLUMNS)
+    sample = df.sample(min(size, len(df)), random_state=seed)
+    features = load_feature_pipeline().transform(sample)
+
+    np.savez(output_path, features=features, data_sha256=data_stamp(data_path))
+    return features
+
+
+@lru_cache(maxsize=None)
+def load_background(path=BACKGROUND_PATH, data_path=DATA_PATH):
+    """Arka plan örneğini işlem başına bir kez yükle; yoksa veya veri değiştiyse oluştur"""
+    if os.path.exists(path):
+        with np.load(path) as stored:
+            if not os.path.exists(data_path) or str(stored['data_sha256']) == data_stamp(data_path):
+                return stored['features']
+
+    return build_background(data_path, path)
+
+
+@lru_cache(maxsize=None)
+def load_shap_explainer():
+    """
+    Süreç genelinde tek TreeExplainer
+
+    Arka plan örneği verildiği için SHAP değerleri "interventional" yöntemle
+    hesaplanır ve beklenen değer, örneğin ortalama tahminidir.
+    """
+    import shap
+
+    from model_loader import load_shared_model
+
+    return shap.TreeExplainer(
+        load_shared_model(),
+        data=load_background(),
+        feature_perturbation='interventional'
+    )
+
+
+class NativeExplainer:
+    """
+    XGBoost Booster üzerinden kesin TreeSHAP katkıları
+
+    shap.TreeExplainer ile aynı yöntemleri sunar. Katkılar ağaçlardaki
+    eğitim örneği sayılarıyla hesaplanır ("tree_path_dependent"); satır
+    katkılarının toplamı beklenen değerle birlikte tahmine eşittir.
+    """
+
+    def __init__(self, booster):
+        self.booster = booster
+        self.feature_names = booster.feature_names
+        self._expected_value = None
+
+    def dmatrix(self, features):
+        import xgboost as xgb
+
+        return xgb.DMatrix(features, feature_names=self.feature_names)
+
+    @property
+    def expected_value(self):
+        """Modelin ortalama çıktısı (katkı matrisinin son sütunu)"""
+        if self._expected_value is None:
+            contribs = self.booster.predict(
+                self.dmatrix(np.full((1, len(self.feature_names)), np.nan, dtype=np.float32)),
+                pred_contribs=True
+            )
+            self._expected_value = float(contribs[0, -1])
+        return self._expected_value
+
+    def shap_values(self, features):
+        """(N, 43) katkı matrisi"""
+        contribs = self.booster.predict(self.dmatrix(features), pred_contribs=True)
+        return contribs[:, :-1]
+
+    def shap_interaction_values(self, features):
+        """(N, 43, 43) etkileşim katkıları; köşegen ana etkilerdir"""
+        interactions = self.booster.predict(self.dmatrix(features), pred_interactions=True)
+        return interactions[:, :-1, :-1]
+
+
+@lru_cache(maxsize=None)
+def load_native_explainer():
+    """Süreç genelinde tek yerel açıklayıcı (yerel model yoksa pickle'daki Booster)"""
+    from model_loader import load_predictor
+
+    predictor = load_predictor()
+    booster = predictor.booster if hasattr(predictor, 'booster') else predictor.get_booster()
+    return NativeExplainer(booster)
+
+
+def load_explainer(backend=DEFAULT_BACKEND):
+    """Arka uca göre paylaşılan açıklayıcı"""
+    if backend == 'native':
+        return load_native_explainer()
+    if backend == 'shap':
+        return load_shap_explainer()
+    raise ValueError(f"Bilinmeyen açıklama arka ucu: {backend} (seçenekler: {', '.join(BACKENDS)})")
+
+
+def _as_matrix(features):
+    features = np.asarray(features, dtype=np.float32)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    return features
+
+
+def explain(features, backend=DEFAULT_BACKEND):
+    """Özellik matrisinin (N, 43) SHAP değerleri"""
+    return load_explainer(backend).shap_values(_as_matrix(features))
+
+
+def explain_interactions(features, backend=DEFAULT_BACKEND):
+    """Özellik matrisinin (N, 43, 43) SHAP etkileşim değerleri"""
+    return load_explainer(backend).shap_interaction_values(_as_matrix(features))
+
+
+def main():
+    """Arka plan örneğini yeniden oluştur"""
+    features = build_background()
+    print(f"✅ SHAP arka plan örneği kaydedildi: {BACKGROUND_PATH}")
+    print(f"   {features.shape[0]} satır × {features.shape[1]} özellik")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Özellik Pipeline'ı
+
+Temizlenmiş araç kayıtlarını modelin beklediği 43 sütunluk özellik
+matrisine dönüştürür. Uygulama, açıklanabilirlik ve toplu tahmin yolları
+aynı sınıfı kullanır; N satır tek geçişte, satır döngüsü olmadan kodlanır.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import LABEL_COLUMNS, ONE_HOT_COLUMNS, load_preprocessing
+
+# Sayısal model sütunları
+NUMERIC_COLUMNS = [
+    'kilometre(Km)', 'yıl', 'motorHacmi(Cc)', 'motorGucu(HP)',
+    'aracVergisi(TRY)', 'tramer', 'hasar_skoru'
+]
+
+# Grafiklerde kullanılan okunabilir isimler
+DISPLAY_NAMES = {
+    'kilometre(Km)': 'Kilometre',
+    'yıl': 'Yıl',
+    'motorHacmi(Cc)': 'Motor Hacmi',
+    'motorGucu(HP)': 'Motor Gücü',
+    'aracVergisi(TRY)': 'Araç Vergisi',
+    'tramer': 'Tramer',
+    'marka_encoded': 'Marka',
+    'seri_encoded': 'Seri',
+    'model_encoded': 'Model',
+    'kasaTipi_encoded': 'Kasa Tipi',
+    'cekisTipi_encoded': 'Çekiş Tipi',
+    'hasar_skoru': 'Hasar Skoru'
+}
+
+# One-hot sütun öneklerinin okunabilir karşılıkları
+DISPLAY_PREFIXES = {'vites': 'Vites', 'yakit': 'Yakıt', 'renk': 'Renk'}
+
+
+class FeaturePipeline:
+    """Kayıtları model özellik matrisine dönüştüren vektörel pipeline"""
+
+    def __init__(self, preprocessing=None):
+        self.preprocessing = preprocessing or load_preprocessing()
+        feature_index = self.preprocessing.feature_index
+        self.feature_columns = self.preprocessing.feature_columns
+
+        # Kategori tipleri bir kez oluşturulur; hash tabloları çağrılar arasında yeniden kullanılır
+        self.dtypes = {
+            column: pd.CategoricalDtype(values)
+            for column, values in {**self.preprocessing.vocabularies,
+                                   **self.preprocessing.one_hot}.items()
+        }
+
+        self.numeric_positions = {
+            column: feature_index[column] for column in NUMERIC_COLUMNS
+        }
+        self.label_positions = {
+            column: feature_index[f'{column}_encoded'] for column in LABEL_COLUMNS
+        }
+        # Her kategori kodunun one-hot sütun indeksi
+        self.one_hot_positions = {
+            column: np.array([feature_index[name]
+                              for name in self.preprocessing.one_hot_columns(column)])
+            for column in ONE_HOT_COLUMNS
+        }
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def display_names(self):
+        """Model sırasıyla okunabilir özellik isimleri"""
+        names = []
+        for column in self.feature_columns:
+            if column in DISPLAY_NAMES:
+                names.append(DISPLAY_NAMES[column])
+            else:
+                prefix, _, value = column.partition('_')
+                names.append(f'{DISPLAY_PREFIXES.get(prefix, prefix)}_{value}')
+        return names
+
+    def categorical_codes(self, column, values):
+        """Kategorileri eğitimdeki kodlara çevir (bilinmeyenler -1)"""
+        return self.dtypes[column].categories.get_indexer(values)
+
+    def transform(self, df):
+        """
+        DataFrame'i (N, 43) float32 özellik matrisine dönüştür
+
+        Eğitimde doldurulan sayısal sütunlardaki eksikler artefakttaki
+        değerlerle doldurulur. Diğer eksik sütunlar ve bilinmeyen kategoriler
+        XGBoost'un eksik değer yoluna düşmesi için NaN, one-hot sütunlarında
+        0 olarak kalır.
+        """
+        n_rows = len(df)
+        features = np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+        # Sayısal sütunlar (eğitimde doldurulan sütunlarda eksikler doldurulur)
+        fill_values = self.preprocessing.fill_values
+        for column, position in self.numeric_positions.items():
+            if column in df:
+                features[:, position] = pd.to_numeric(df[column], errors='coerce')
+            elif column == 'hasar_skoru':
+                features[:, position] = 0
+            else:
+                features[:, position] = np.nan
+            if column in fill_values:
+                values = features[:, position]
+                values[np.isnan(values)] = fill_values[column]
+
+        # Label encoded sütunlar
+        for column, position in self.label_positions.items():
+            if column not in df:
+                features[:, position] = np.nan
+                continue
+            codes = self.categorical_codes(column, df[column])
+            features[:, position] = np.where(codes >= 0, codes, np.nan)
+
+        # One-hot sütunlar: kod -> sütun indeksi ile tek seferde yaz
+        rows = np.arange(n_rows)
+        for column, positions in self.one_hot_positions.items():
+            if column not in df:
+                continue
+            codes = self.categorical_codes(column, df[column])
+            known = codes >= 0
+            features[rows[known], positions[codes[known]]] = 1
+
+        return features
+
+
+@lru_cache(maxsize=None)
+def load_feature_pipeline():
+    """Pipeline'ı işlem başına bir kez oluştur"""
+    return FeaturePipeline()
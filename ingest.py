@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Artımlı İlan Ekleme
+
+Yeni kazınmış ilan dosyalarını (cars_tr.csv şeması) kanonik veri setine
+ekler. İlan numaraları kalıcı bir SQLite tablosunda (birincil anahtar
+ilanID → fiyat, veri setindeki satır) tutulur:
+
+- bilinmeyen ilan numaraları yeni ilan olarak eklenir,
+- bilinen numarada fiyat değiştiyse ilan güncellenir (satır yerinde değişir),
+- aynı fiyatla tekrar gelen ilanlar atlanır.
+
+Yalnızca yeni ve güncellenen satırlar ayrıştırılır. Ham satırlar
+cars_tr.csv sonuna eklenir; tipli veri setine yeni bir parça dosyası
+yazılır, seçenek indeksi ve piyasa istatistikleri küpü bu satırlarla
+güncellenir, benzer ilanlar indeksinde yalnızca değişen model bölümleri
+yeniden kurulur. Artefaktlar, önceki özetten ve eklenen baytlardan
+zincirlenen CSV özetiyle işaretlenir; adımların hiçbiri tüm CSV'yi veya
+veri setini okumaz ve okuyucular hiçbir şeyi baştan oluşturmaz.
+
+Kullanım:
+    python ingest.py carsGuncel.csv merged_cars_data.csv
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_listings, read_listings
+from comparables import (COMPARABLES_PATH, build_comparables_index, load_comparables_index,
+                         update_comparables_index)
+from dataset import DATASET_PATH, append_dataset, dataset_rows, ensure_dataset, load_dataset, to_dataset_types
+from market_stats import (MARKET_STATS_PATH, build_market_stats, listing_columns, load_market_stats,
+                          update_market_stats)
+from option_index import (OPTION_INDEX_PATH, UNIQUE_COLUMNS, build_option_index, load_option_index,
+                          update_option_index)
+from preprocessing import BASE_DIR, DATA_PATH, LABEL_COLUMNS, data_stamp, extend_data_stamp, load_preprocessing
+
+LISTING_IDS_PATH = os.path.join(BASE_DIR, 'cars_tr_ids.db')
+
+# SQLite IN sorgusu başına ilan numarası
+LOOKUP_CHUNK_SIZE = 500
+
+
+class ListingIds:
+    """Kalıcı ilan numarası kümesi: ilanID → (fiyat, veri setindeki satır)"""
+
+    def __init__(self, path=LISTING_IDS_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS listings (ilanID INTEGER PRIMARY KEY, fiyat INTEGER, satir INTEGER)"
+        )
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    @property
+    def data_sha256(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'data_sha256'").fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def lookup(self, ids):
+        """Bilinen ilan numaralarının {ilanID: (fiyat, satır)} sözlüğü"""
+        ids = [int(value) for value in ids]
+        known = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.connection.execute(
+                f"SELECT ilanID, fiyat, satir FROM listings WHERE ilanID IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            known.update((ilan_id, (price, row)) for ilan_id, price, row in rows)
+        return known
+
+    def upsert(self, ids, prices, rows, data_sha256):
+        """Numaraları ekle veya fiyatlarını güncelle ve kümeyi veri setinin özetiyle işaretle"""
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO listings VALUES (?, ?, ?)",
+                ((int(ilan_id), None if pd.isna(price) else int(price), int(row))
+                 for ilan_id, price, row in zip(ids, prices, rows))
+            )
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('data_sha256', ?)", (data_sha256,))
+
+    def rebuild(self, df, data_sha256):
+        """Kümeyi tipli veri setinden baştan oluştur"""
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.execute("DELETE FROM listings")
+        keyed = df['ilanID'].notna().to_numpy()
+        self.upsert(df['ilanID'][keyed], df['fiyat(TRY)'][keyed], np.flatnonzero(keyed), data_sha256)
+
+    def close(self):
+        self.connection.close()
+
+
+def same_price(old, new):
+    return (old is None and pd.isna(new)) or (old is not None and not pd.isna(new) and int(new) == old)
+
+
+def append_raw(raw, data_path):
+    """Ham satırları CSV başlığının sütun sırasıyla dosyanın sonuna ekle; eklenen baytları döndür"""
+    header = read_listings(data_path, nrows=0).columns
+    needs_newline = False
+    with open(data_path, 'rb') as f:
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    appended = raw.reindex(columns=header).to_csv(header=False, index=False).encode('utf-8')
+    if needs_newline:
+        appended = b'\n' + appended
+    with open(data_path, 'ab') as f:
+        f.write(appended)
+    return appended
+
+
+def artifact_sha256(path):
+    """Artefaktın işaretlendiği CSV özeti (JSON veya .npz meta kaydı)"""
+    if not os.path.exists(path):
+        return None
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('data_sha256')
+    with np.load(path) as arrays:
+        return json.loads(str(arrays['meta'])).get('data_sha256')
+
+
+def unknown_categories(listings):
+    """Modelin eğitim sözlüklerinde olmayan kategoriler (seçenek indeksine eklenmez)"""
+    vocabularies = load_preprocessing().vocabularies
+    unknown = {}
+    for column in LABEL_COLUMNS:
+        values = set(listings[column].dropna().unique().tolist()) - set(vocabularies[column])
+        if values:
+            unknown[column] = sorted(values)
+    return unknown
+
+
+def ingest_files(paths, base_dir=BASE_DIR):
+    """
+    İlan dosyalarını kanonik veri setine ekle ve türetilmiş artefaktları güncelle
+
+    Artefaktlar `base_dir` altındaki standart dosya isimleriyle bulunur.
+    Sonuç sayılar, adım süreleri ve modelin tanımadığı kategorilerdir.
+    """
+    data_path = os.path.join(base_dir, os.path.basename(DATA_PATH))
+    dataset_path = os.path.join(base_dir, os.path.basename(DATASET_PATH))
+    ids_path = os.path.join(base_dir, os.path.basename(LISTING_IDS_PATH))
+    option_path = os.path.join(base_dir, os.path.basename(OPTION_INDEX_PATH))
+    market_path = os.path.join(base_dir, os.path.basename(MARKET_STATS_PATH))
+    comparables_path = os.path.join(base_dir, os.path.basename(COMPARABLES_PATH))
+    timings = {}
+    start = time.perf_counter()
+
+    def step(name):
+        nonlocal start
+        now = time.perf_counter()
+        timings[name] = now - start
+        start = now
+
+    # Artefaktlar mevcut CSV ile uyumlu değilse bir kez baştan oluşturulur
+    ensure_dataset(dataset_path, data_path)
+    current_sha256 = data_stamp(data_path)
+    if artifact_sha256(option_path) != current_sha256:
+        build_option_index(load_dataset(UNIQUE_COLUMNS, dataset_path, data_path), data_path, option_path)
+    if artifact_sha256(market_path) != current_sha256:
+        build_market_stats(load_dataset(listing_columns(), dataset_path, data_path), data_path, market_path)
+    if artifact_sha256(comparables_path) != current_sha256:
+        build_comparables_index(data_path=data_path, output_path=comparables_path)
+    ids = ListingIds(ids_path)
+    if ids.data_sha256 != current_sha256:
+        ids.rebuild(load_dataset(['ilanID', 'fiyat(TRY)'], dataset_path, data_path), current_sha256)
+    step('hazirlik')
+
+    # Yalnızca yeni dosyalar ayrıştırılır; dosyalar içindeki tekrarlarda son satır geçerlidir
+    raw = pd.concat([read_listings(path) for path in paths], ignore_index=True)
+    n_read = len(raw)
+    cleaned = to_dataset_types(clean_listings(raw))
+    keyed = cleaned['ilanID'].notna() & ~cleaned['ilanID'].duplicated(keep='last')
+    without_id = int(cleaned['ilanID'].isna().sum())
+    raw, cleaned = raw[keyed.to_numpy()], cleaned[keyed]
+
+    known = ids.lookup(cleaned['ilanID'])
+    state = [
+        'yeni' if ilan_id not in known else
+        'tekrar' if same_price(known[ilan_id][0], price) else 'guncel'
+        for ilan_id, price in zip(cleaned['ilanID'], cleaned['fiyat(TRY)'])
+    ]
+    state = np.array(state, dtype=object)
+    new, updated = state == 'yeni', state == 'guncel'
+    step('ayristirma')
+
+    summary = {
+        'okunan': n_read, 'yeni': int(new.sum()), 'guncel': int(updated.sum()),
+        'tekrar': int((state == 'tekrar').sum()), 'numarasiz': without_id, 'sure': timings
+    }
+    if not new.any() and not updated.any():
+        ids.close()
+        return summary
+
+    # Güncellenen ilanların yalnızca eski satırları, küpten geri alınmak üzere okunur
+    changed = new | updated
+    positions = np.array([known[ilan_id][1] for ilan_id in cleaned['ilanID'][updated]], dtype=np.int64)
+    removed = load_dataset(listing_columns(), dataset_path, data_path, rows=positions)
+    rows = np.zeros(len(cleaned), dtype=np.int64)
+    rows[new] = dataset_rows(dataset_path) + np.arange(new.sum())
+    rows[updated] = positions
+
+    data_sha256 = extend_data_stamp(data_path, current_sha256, append_raw(raw[changed], data_path))
+    step('csv')
+
+    n_rows = append_dataset(cleaned[new], positions, cleaned[updated], data_sha256, dataset_path)
+    step('veri_seti')
+
+    ids.upsert(cleaned['ilanID'][changed], cleaned['fiyat(TRY)'][changed], rows[changed], data_sha256)
+    ids.close()
+    step('ilan_kumesi')
+
+    update_option_index(cleaned[changed], data_sha256, option_path)
+    step('secenek_indeksi')
+
+    update_market_stats(cleaned[changed], removed, lambda: load_dataset(listing_columns(), dataset_path, data_path),
+                        data_sha256, data_path, market_path)
+    step('piyasa_kupu')
+
+    update_comparables_index(cleaned[changed], data_sha256, data_path, comparables_path)
+    step('benzer_ilanlar')
+
+    for loader in (ensure_dataset, load_option_index, load_market_stats, load_comparables_index):
+        loader.cache_clear()
+
+    summary['satir'] = n_rows
+    summary['bilinmeyen'] = unknown_categories(cleaned[changed])
+    return summary
+
+
+def main():
+    """Dosyaları ekle ve özeti yazdır"""
+    parser = argparse.ArgumentParser(description="Yeni ilan dosyalarını veri setine ekle")
+    parser.add_argument('paths', nargs='+', help="cars_tr.csv şemasındaki ilan dosyaları")
+    args = parser.parse_args()
+
+    summary = ingest_files(args.paths)
+    print(f"✅ {summary['okunan']:,} satır okundu: {summary['yeni']:,} yeni, {summary['guncel']:,} fiyatı güncellenen, "
+          f"{summary['tekrar']:,} tekrar, {summary['numarasiz']:,} ilan numarasız (atlandı)")
+    if 'satir' in summary:
+        print(f"   Veri seti: {summary['satir']:,} ilan")
+    for name, seconds in summary['sure'].items():
+        print(f"   {name:<16} {seconds * 1000:8.1f} ms")
+    for column, values in summary.get('bilinmeyen', {}).items():
+        print(f"⚠️ Modelin tanımadığı {column} değerleri seçeneklere eklenmedi ({len(values)}): "
+              f"{', '.join(values[:10])}{' ...' if len(values) > 10 else ''}")
+
+
+if __name__ == "__main__":
+    main()
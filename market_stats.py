@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Piyasa İstatistikleri Küpü
+
+İlan fiyatlarının adet, ortalama, medyan ve en düşük/en yüksek değerleri
+marka, seri, model, yıl, yakıt türü ve il gruplamalarında bir kez
+hesaplanıp sıkıştırılmış .npz dosyasına kaydedilir. Uygulama istek anında
+groupby yapmaz; yalnızca hücre araması yapar.
+
+Her hücre adet, toplam, en düşük ve en yüksek fiyatın yanında logaritmik
+fiyat aralıklarına bölünmüş seyrek bir histogram tutar. Bunların hepsi
+toplanabilir olduğundan yeni ilanlar küpe eklenirken küp baştan
+hesaplanmaz; medyan histogramdan (aralık içi interpolasyonla) okunur.
+
+Küpü yeniden oluşturmak için:
+    python market_stats.py
+"""
+
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import BASE_DIR, DATA_PATH, data_stamp
+
+MARKET_STATS_PATH = os.path.join(BASE_DIR, 'car_market_stats.npz')
+
+# Küp formatı değiştiğinde artırılır
+CUBE_VERSION = 1
+
+PRICE_COLUMN = 'fiyat(TRY)'
+DIMENSION_COLUMNS = ['marka', 'seri', 'model', 'yıl', 'yakitTuru', 'il']
+
+# Saklanan gruplamalar: isim → boyutlar
+GROUPINGS = {
+    'genel': (),
+    'marka': ('marka',),
+    'seri': ('marka', 'seri'),
+    'model': ('marka', 'seri', 'model'),
+    'model_yil': ('marka', 'seri', 'model', 'yıl'),
+    'model_yakit': ('marka', 'seri', 'model', 'yakitTuru'),
+    'yil': ('yıl',),
+    'yakit': ('yakitTuru',),
+    'il': ('il',)
+}
+
+# Medyan histogramı: 10 bin - 100 milyon TL arası logaritmik aralıklar
+# (aralık genişliği ~%3,7)
+HISTOGRAM_BINS = 256
+LOG_PRICE_RANGE = (4.0, 8.0)
+
+STAT_COLUMNS = ['adet', 'toplam', 'en_dusuk', 'en_yuksek']
+
+
+def price_bins(prices):
+    """Fiyatların histogram aralığı numarası"""
+    low, high = LOG_PRICE_RANGE
+    positions = (np.log10(np.maximum(prices, 1)) - low) / (high - low) * HISTOGRAM_BINS
+    return np.clip(positions.astype(np.int64), 0, HISTOGRAM_BINS - 1)
+
+
+def bin_edge(bins):
+    low, high = LOG_PRICE_RANGE
+    return 10 ** (low + np.asarray(bins) / HISTOGRAM_BINS * (high - low))
+
+
+def dimension_keys(df, dims):
+    """Boyut değerlerini metne çevir; yıl tamsayı olarak yazılır"""
+    keys = {}
+    for column in dims:
+        values = df[column]
+        if column == 'yıl':
+            values = values.round().astype('Int64')
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Kategoriler bir kez metne çevrilir, satırlar kodlarla seçilir
+            categories = values.cat.categories.astype('string').array
+            keys[column] = categories.take(values.cat.codes.to_numpy(), allow_fill=True)
+        else:
+            keys[column] = values.astype('string')
+    return pd.DataFrame(keys, index=df.index)
+
+
+def factorize_keys(keys, dims):
+    """Anahtar satırlarının hücre kodları ve sıralı tekil anahtarlar"""
+    if not dims:
+        return np.zeros(len(keys), dtype=np.int64), pd.DataFrame(index=range(int(len(keys) > 0)))
+    grouped = keys.groupby(list(dims), sort=True)
+    return grouped.ngroup().to_numpy(), grouped.size().index.to_frame(index=False)
+
+
+def aggregate_listings(df):
+    """İlanları her gruplama için (anahtarlar, istatistikler, histogram) parçalarına indir"""
+    df = df.dropna(subset=[PRICE_COLUMN])
+    prices = df[PRICE_COLUMN].to_numpy(dtype=np.float64)
+    bins = price_bins(prices)
+
+    cube = {}
+    for name, dims in GROUPINGS.items():
+        keys = dimension_keys(df, dims)
+        known = keys.notna().all(axis=1).to_numpy()
+        codes, unique_keys = factorize_keys(keys[known], dims)
+
+        cells = pd.DataFrame({'hucre': codes, 'fiyat': prices[known], 'aralik': bins[known]})
+        stats = cells.groupby('hucre')['fiyat'].agg(['count', 'sum', 'min', 'max'])
+        stats.columns = STAT_COLUMNS
+        histogram = cells.groupby(['hucre', 'aralik']).size().rename('adet').reset_index()
+        cube[name] = (unique_keys.reset_index(drop=True), stats.reset_index(drop=True), histogram)
+    return cube
+
+
+def cell_extremes(current, dims, stale_keys):
+    """
+    Verilen hücrelerin güncel ilanlardan en düşük/en yüksek fiyatları
+
+    Anahtarlar yalnızca hücrelerin kategorilerine uyan satırlar için metne
+    çevrilir. Sonuç hücre sırasıyla (en düşük, en yüksek) dizileridir.
+    """
+    if not dims:
+        prices = current[PRICE_COLUMN].to_numpy(dtype=np.float64)
+        return np.array([prices.min()]), np.array([prices.max()])
+
+    stale = pd.DataFrame(stale_keys, columns=list(dims)).assign(hucre=np.arange(len(stale_keys)))
+    candidates = current
+    for column in dims:
+        if column == 'yıl':
+            years = stale[column].astype(float).unique()
+            candidates = candidates[candidates[column].round().isin(years).to_numpy()]
+        else:
+            candidates = candidates[candidates[column].isin(stale[column].unique()).to_numpy()]
+    keys = dimension_keys(candidates, dims).astype(object).assign(
+        fiyat=candidates[PRICE_COLUMN].to_numpy(dtype=np.float64))
+    extremes = keys.merge(stale, on=list(dims)).groupby('hucre')['fiyat'].agg(['min', 'max'])
+    extremes = extremes.reindex(range(len(stale_keys)))
+    return extremes['min'].to_numpy(), extremes['max'].to_numpy()
+
+
+def apply_delta(arrays, name, dims, keys, signs, prices, current_listings):
+    """
+    Bir gruplamanın kayıtlı dizilerine eklenen (+1) ve çıkarılan (-1) ilanları uygula
+
+    Yalnızca değişen ilanların hücreleri güncellenir. Çıkarılan fiyat
+    hücrenin en düşük/en yüksek değeriyse o hücrenin uçları
+    `current_listings()` ile okunan güncel ilanlardan yeniden hesaplanır.
+    Boşalan hücreler atılır; yeni hücreler anahtar sırasına yerleştirilir.
+    """
+    cell_keys = arrays[f'{name}.keys']
+    lookup = {key: i for i, key in enumerate(map(tuple, cell_keys.tolist()))}
+    n_cells = len(lookup)
+    cells = np.array([lookup.setdefault(key, len(lookup)) for key in map(tuple, keys.tolist())], dtype=np.int64)
+    added = len(lookup) > n_cells
+    if added:
+        cell_keys = np.array(list(lookup), dtype=str).reshape(len(lookup), len(dims))
+
+    stats = np.vstack([arrays[f'{name}.stats'],
+                       np.tile([0.0, 0.0, np.inf, -np.inf], (len(lookup) - n_cells, 1))])
+    np.add.at(stats[:, 0], cells, signs)
+    np.add.at(stats[:, 1], cells, signs * prices)
+    adding = signs > 0
+    np.minimum.at(stats[:, 2], cells[adding], prices[adding])
+    np.maximum.at(stats[:, 3], cells[adding], prices[adding])
+
+    removing = ~adding
+    stale = cells[removing][(prices[removing] <= stats[cells[removing], 2])
+                            | (prices[removing] >= stats[cells[removing], 3])]
+    stale = np.unique(stale[stats[stale, 0] > 0])
+    if len(stale):
+        stats[stale, 2], stats[stale, 3] = cell_extremes(current_listings(), dims, cell_keys[stale])
+
+    # Histogram (hücre, aralık) kodlarıyla birleştirilir
+    codes = np.concatenate([arrays[f'{name}.hist_cell'].astype(np.int64) * HISTOGRAM_BINS + arrays[f'{name}.hist_bin'],
+                            cells * HISTOGRAM_BINS + price_bins(prices)])
+    codes, inverse = np.unique(codes, return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([arrays[f'{name}.hist_count'], signs])).astype(np.int64)
+    codes, counts = codes[counts > 0], counts[counts > 0]
+
+    kept = np.flatnonzero(stats[:, 0] > 0)
+    if added and dims:
+        kept = kept[np.lexsort(cell_keys[kept].T[::-1])]
+    mapping = np.full(len(stats), -1, dtype=np.int64)
+    mapping[kept] = np.arange(len(kept))
+    codes = mapping[codes // HISTOGRAM_BINS] * HISTOGRAM_BINS + codes % HISTOGRAM_BINS
+    order = np.argsort(codes, kind='stable')
+
+    arrays[f'{name}.keys'] = cell_keys[kept]
+    arrays[f'{name}.stats'] = stats[kept]
+    arrays[f'{name}.hist_cell'] = (codes[order] // HISTOGRAM_BINS).astype(np.int32)
+    arrays[f'{name}.hist_bin'] = (codes[order] % HISTOGRAM_BINS).astype(np.int16)
+    arrays[f'{name}.hist_count'] = counts[order]
+
+
+def save_cube(cube, meta, path):
+    arrays = {'meta': np.array(json.dumps(meta, ensure_ascii=False))}
+    for name, dims in GROUPINGS.items():
+        keys, stats, histogram = cube[name]
+        arrays[f'{name}.keys'] = keys[list(dims)].to_numpy(dtype=str).reshape(len(stats), len(dims))
+        arrays[f'{name}.stats'] = stats[STAT_COLUMNS].to_numpy(dtype=np.float64)
+        arrays[f'{name}.hist_cell'] = histogram['hucre'].to_numpy(dtype=np.int32)
+        arrays[f'{name}.hist_bin'] = histogram['aralik'].to_numpy(dtype=np.int16)
+        arrays[f'{name}.hist_count'] = histogram['adet'].to_numpy(dtype=np.int64)
+    np.savez_compressed(path, **arrays)
+
+
+def listing_columns():
+    return ['ilanID', PRICE_COLUMN] + DIMENSION_COLUMNS
+
+
+def build_market_stats(df=None, data_path=DATA_PATH, output_path=MARKET_STATS_PATH):
+    """Küpü veri setinden baştan oluşturup kaydet"""
+    if df is None:
+        from dataset import load_dataset
+        df = load_dataset(listing_columns(), data_path=data_path)
+
+    meta = {
+        'version': CUBE_VERSION,
+        'data_sha256': data_stamp(data_path) if os.path.exists(data_path) else None,
+        'rows': int(df[PRICE_COLUMN].notna().sum())
+    }
+    save_cube(aggregate_listings(df), meta, output_path)
+    return load_market_stats_file(output_path)
+
+
+def update_market_stats(new_listings, removed_listings=None, current_listings=None, data_sha256=None,
+                        data_path=DATA_PATH, path=MARKET_STATS_PATH):
+    """
+    Yeni ilanları mevcut küpe ekle
+
+    Küp baştan hesaplanmaz; yalnızca yeni satırların hücreleri kayıtlı
+    dizilerde güncellenir. Fiyatı güncellenen ilanların eski satırları
+    `removed_listings` ile geri alınır; bir uç değer geri alındıysa
+    `current_listings()` ile güncel tablo okunur. Aynı ilanların iki kez
+    eklenmemesi çağıranın sorumluluğundadır.
+    """
+    if not os.path.exists(path):
+        return build_market_stats(data_path=data_path, output_path=path)
+
+    with np.load(path) as stored:
+        arrays = dict(stored)
+    meta = json.loads(str(arrays['meta']))
+
+    parts, signs = [new_listings], [np.ones(len(new_listings))]
+    if removed_listings is not None and len(removed_listings):
+        parts.append(removed_listings)
+        signs.append(-np.ones(len(removed_listings)))
+    delta = pd.concat([part[[PRICE_COLUMN] + DIMENSION_COLUMNS] for part in parts], ignore_index=True)
+    priced = delta[PRICE_COLUMN].notna().to_numpy()
+    delta, signs = delta[priced], np.concatenate(signs)[priced]
+    prices = delta[PRICE_COLUMN].to_numpy(dtype=np.float64)
+    keys = dimension_keys(delta, DIMENSION_COLUMNS)
+
+    current = None
+
+    def current_priced():
+        nonlocal current
+        if current is None:
+            current = current_listings().dropna(subset=[PRICE_COLUMN])
+        return current
+
+    for name, dims in GROUPINGS.items():
+        known = keys[list(dims)].notna().all(axis=1).to_numpy()
+        apply_delta(arrays, name, dims, keys.loc[known, list(dims)].to_numpy(dtype=str),
+                    signs[known], prices[known], current_priced)
+
+    if data_sha256 is None and os.path.exists(data_path):
+        data_sha256 = data_stamp(data_path)
+    meta = {**meta, 'data_sha256': data_sha256, 'rows': int(arrays['genel.stats'][:, 0].sum())}
+    arrays['meta'] = np.array(json.dumps(meta, ensure_ascii=False))
+    np.savez_compressed(path, **arrays)
+    load_market_stats.cache_clear()
+    return load_market_stats_file(path)
+
+
+class MarketStats:
+    """Hücre aramasıyla sorgulanan fiyat istatistikleri küpü"""
+
+    def __init__(self, arrays):
+        self.meta = json.loads(str(arrays['meta']))
+        self.keys = {}
+        self.stats = {}
+        self.cells = {}
+        self.children = {}
+        self.histograms = {}
+        for name, dims in GROUPINGS.items():
+            keys = arrays[f'{name}.keys']
+            self.keys[name] = keys
+            self.stats[name] = arrays[f'{name}.stats']
+            rows = [tuple(key) for key in keys.tolist()]
+            self.cells[name] = {key: i for i, key in enumerate(rows)}
+
+            # Üst anahtara göre alt hücreler (ör. bir modelin yılları)
+            children = {}
+            for i, key in enumerate(rows):
+                children.setdefault(key[:-1], []).append(i)
+            self.children[name] = {prefix: np.array(cells) for prefix, cells in children.items()}
+
+            hist_cell = arrays[f'{name}.hist_cell']
+            offsets = np.searchsorted(hist_cell, np.arange(len(keys) + 1))
+            self.histograms[name] = (offsets, arrays[f'{name}.hist_bin'], arrays[f'{name}.hist_count'])
+
+    @property
+    def rows(self):
+        return self.meta['rows']
+
+    def cell_count(self, grouping):
+        """Gruplamadaki hücre sayısı (ör. marka sayısı)"""
+        return len(self.keys[grouping])
+
+    def median(self, grouping, cell):
+        """
+        Hücrenin histogramdan medyanı
+
+        Ortadaki sıra istatistikleri (çift adette iki tane) bulundukları
+        aralığın içinde logaritmik olarak konumlandırılır; hata aralık
+        genişliğinin yarısını aşmaz. İki ve daha az ilanda kesin değerdir.
+        """
+        count, _, low, high = self.stats[grouping][cell]
+        if count <= 2:
+            return (low + high) / 2
+
+        offsets, bins, counts = self.histograms[grouping]
+        bins = bins[offsets[cell]:offsets[cell + 1]]
+        counts = counts[offsets[cell]:offsets[cell + 1]]
+        cumulative = np.cumsum(counts)
+
+        ranks = np.array([(count + 1) // 2, count // 2 + 1])
+        positions = np.searchsorted(cumulative, ranks)
+        fractions = (ranks - (cumulative[positions] - counts[positions]) - 0.5) / counts[positions]
+        lower, upper = bin_edge(bins[positions]), bin_edge(bins[positions] + 1)
+        return float(np.clip(lower * (upper / lower) ** fractions, low, high).mean())
+
+    def summary(self, grouping, *key):
+        """Tek hücrenin özeti; hücre yoksa None"""
+        cell = self.cells[grouping].get(tuple(str(value) for value in key))
+        if cell is None:
+            return None
+        return self.cell_summary(grouping, cell)
+
+    def cell_summary(self, grouping, cell):
+        count, total, low, high = self.stats[grouping][cell]
+        return {
+            'adet': int(count),
+            'ortalama': total / count,
+            'medyan': self.median(grouping, cell),
+            'en_dusuk': low,
+            'en_yuksek': high
+        }
+
+    def breakdown(self, grouping, *prefix):
+        """
+        Üst anahtarın alt hücreleri tablosu
+
+        Örneğin breakdown('model_yil', marka, seri, model) modelin yıllara
+        göre fiyatlarını verir.
+        """
+        dims = GROUPINGS[grouping]
+        cells = self.children[grouping].get(tuple(str(value) for value in prefix), np.array([], dtype=int))
+        result = pd.DataFrame([self.cell_summary(grouping, cell) for cell in cells],
+                              columns=['adet', 'ortalama', 'medyan', 'en_dusuk', 'en_yuksek'])
+        result.insert(0, dims[-1], self.keys[grouping][cells, -1] if len(cells) else [])
+        return result
+
+
+def load_market_stats_file(path):
+    with np.load(path) as arrays:
+        return MarketStats(arrays)
+
+
+@lru_cache(maxsize=None)
+def load_market_stats(path=MARKET_STATS_PATH, data_path=DATA_PATH):
+    """Küpü işlem başına bir kez yükle; yoksa veya veri değiştiyse oluştur"""
+    if os.path.exists(path):
+        stats = load_market_stats_file(path)
+        if stats.meta.get('version') == CUBE_VERSION and (
+            not os.path.exists(data_path) or stats.meta.get('data_sha256') == data_stamp(data_path)
+        ):
+            return stats
+
+    return build_market_stats(data_path=data_path, output_path=path)
+
+
+def main():
+    """Küpü yeniden oluştur"""
+    stats = build_market_stats()
+    print(f"✅ Piyasa istatistikleri küpü kaydedildi: {MARKET_STATS_PATH}")
+    print(f"   {stats.rows:,} ilan, "
+          + ", ".join(f"{name} {stats.cell_count(name):,}" for name in GROUPINGS) + " hücre")
+    print(f"   Boyut: {os.path.getsize(MARKET_STATS_PATH) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
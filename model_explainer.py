@@ -1,28 +1,29 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-from sklearn.preprocessing import LabelEncoder
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import shap
+from dataset import load_dataset
+from explanations import DEFAULT_BACKEND, explain, load_explainer
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_shared_model
+from preprocessing import REQUIRED_COLUMNS
 import warnings
 warnings.filterwarnings('ignore')
 
 class ModelExplainer:
-    def __init__(self, model, df):
+    def __init__(self, model, df, backend=DEFAULT_BACKEND):
         self.model = model
         self.df = df
+        self.backend = backend
         self.explainer = None
         self.setup_shap()
     
     def setup_shap(self):
-        """SHAP explainer'ı kur"""
+        """Süreç genelinde paylaşılan açıklayıcıyı al (varsayılan: XGBoost pred_contribs)"""
         try:
-            # Örnek veri ile SHAP explainer oluştur
-            sample_data = self.prepare_sample_data()
-            self.explainer = shap.TreeExplainer(self.model)
+            self.explainer = load_explainer(self.backend)
             return True
         except Exception as e:
             st.warning(f"SHAP kurulumu başarısız: {e}")
@@ -30,72 +31,12 @@ class ModelExplainer:
     
     def prepare_sample_data(self):
         """Model için örnek veri hazırla"""
-        # Veri setinden rastgele bir örnek al
-        sample = self.df.sample(1)
+        pipeline = load_feature_pipeline()
         
-        # Sütun isimlerini düzelt
-        sample = sample.rename(columns={
-            'kilometre(Km)': 'yıl_temp',
-            'yıl': 'kilometre(Km)',
-            'hasarGecmisi': 'tramer'
-        })
-        sample = sample.rename(columns={'yıl_temp': 'yıl'})
+        # Temizlenmiş veri setinden rastgele bir örnek al
+        sample = self.df.dropna(subset=REQUIRED_COLUMNS).sample(1)
         
-        # Encoding işlemleri
-        le_marka = LabelEncoder()
-        le_seri = LabelEncoder()
-        le_model = LabelEncoder()
-        le_kasa = LabelEncoder()
-        le_cekis = LabelEncoder()
-        
-        le_marka.fit(self.df['marka'])
-        le_seri.fit(self.df['seri'])
-        le_model.fit(self.df['model'])
-        le_kasa.fit(self.df['kasaTipi'])
-        le_cekis.fit(self.df['cekisTipi'])
-        
-        # One-hot encoding için tüm kategoriler
-        vites_categories = ['Düz', 'Otomatik', 'Yarı Otomatik']
-        yakit_categories = ['Benzin', 'Dizel', 'Hibrit', 'Elektrik', 'LPG & Benzin']
-        renk_categories = self.df['renk'].dropna().unique()
-        
-        # Özellik vektörü oluştur
-        features = []
-        
-        # Sayısal özellikler
-        features.extend([
-            sample['kilometre(Km)'].iloc[0],
-            sample['yıl'].iloc[0],
-            sample['motorHacmi(Cc)'].iloc[0],
-            sample['motorGucu(HP)'].iloc[0],
-            sample['aracVergisi(TRY)'].iloc[0],
-            sample['tramer'].iloc[0]
-        ])
-        
-        # Encoded özellikler
-        features.extend([
-            le_marka.transform([sample['marka'].iloc[0]])[0],
-            le_seri.transform([sample['seri'].iloc[0]])[0],
-            le_model.transform([sample['model'].iloc[0]])[0],
-            le_kasa.transform([sample['kasaTipi'].iloc[0]])[0],
-            le_cekis.transform([sample['cekisTipi'].iloc[0]])[0],
-            0  # hasar_skoru
-        ])
-        
-        # One-hot encoded özellikler
-        # Vites
-        for vites in vites_categories:
-            features.append(1 if sample['vitesTipi'].iloc[0] == vites else 0)
-        
-        # Yakıt
-        for yakit in yakit_categories:
-            features.append(1 if sample['yakitTuru'].iloc[0] == yakit else 0)
-        
-        # Renk
-        for renk in renk_categories:
-            features.append(1 if sample['renk'].iloc[0] == renk else 0)
-        
-        return np.array(features).reshape(1, -1)
+        return pipeline.transform(sample)
     
     def get_feature_importance(self):
         """Özellik önem sıralaması"""
@@ -111,15 +52,8 @@ class ModelExplainer:
             st.warning("Bu model türü için özellik önem bilgisi mevcut değil")
             return None
         
-        # Özellik isimleri (basitleştirilmiş)
-        feature_names = [
-            'Kilometre', 'Yıl', 'Motor Hacmi', 'Motor Gücü', 'Araç Vergisi', 'Tramer',
-            'Marka', 'Seri', 'Model', 'Kasa Tipi', 'Çekiş Tipi', 'Hasar Skoru',
-            'Vites_Düz', 'Vites_Otomatik', 'Vites_Yarı Otomatik',
-            'Yakıt_Benzin', 'Yakıt_Dizel', 'Yakıt_Elektrik', 'Yakıt_Hibrit', 'Yakıt_LPG',
-            'Renk_Beyaz', 'Renk_Siyah', 'Renk_Gri', 'Renk_Kırmızı', 'Renk_Mavi',
-            'Renk_Diğer'
-        ]
+        # Model sırasıyla özellik isimleri
+        feature_names = load_feature_pipeline().display_names()
         
         # En önemli özellikleri seç
         indices = np.argsort(importance)[::-1][:top_n]
@@ -148,8 +82,7 @@ class ModelExplainer:
             return None
         
         try:
-            shap_values = self.explainer.shap_values(features)
-            return shap_values
+            return explain(features, self.backend)
         except Exception as e:
             st.warning(f"SHAP değerleri hesaplanamadı: {e}")
             return None
@@ -160,14 +93,11 @@ class ModelExplainer:
         if shap_values is None:
             return None
         
-        # Basit özellik isimleri
-        feature_names = [
-            'Kilometre', 'Yıl', 'Motor Hacmi', 'Motor Gücü', 'Araç Vergisi', 'Tramer',
-            'Marka', 'Seri', 'Model', 'Kasa Tipi', 'Çekiş Tipi', 'Hasar Skoru'
-        ]
+        # Model sırasıyla özellik isimleri
+        feature_names = load_feature_pipeline().display_names()
         
         # En etkili özellikleri seç
-        shap_vals = shap_values[0][:len(feature_names)]
+        shap_vals = shap_values[0]
         indices = np.argsort(np.abs(shap_vals))[::-1][:10]
         
         fig = go.Figure()
@@ -200,15 +130,19 @@ class ModelExplainer:
         }
         return info
 
+@st.cache_resource
+def load_model_explainer(backend=DEFAULT_BACKEND):
+    """Model, veri seti ve açıklayıcı süreç başına bir kez kurulur"""
+    return ModelExplainer(load_shared_model(), load_dataset(), backend)
+
 def create_explainer_interface():
     """Açıklanabilirlik arayüzü"""
     st.markdown("## 🔍 Model Açıklanabilirliği")
     
     # Model yükle
     try:
-        model = joblib.load('best_car_price_model.pkl')
-        df = pd.read_csv('cars_tr.csv')
-        explainer = ModelExplainer(model, df)
+        explainer = load_model_explainer()
+        model = explainer.model
     except Exception as e:
         st.error(f"Model yüklenemedi: {e}")
         return
@@ -228,15 +162,12 @@ def create_explainer_interface():
         # Özellik önem tablosu
         importance = explainer.get_feature_importance()
         if importance is not None:
-            feature_names = [
-                'Kilometre', 'Yıl', 'Motor Hacmi', 'Motor Gücü', 'Araç Vergisi', 'Tramer',
-                'Marka', 'Seri', 'Model', 'Kasa Tipi', 'Çekiş Tipi', 'Hasar Skoru'
-            ]
+            feature_names = load_feature_pipeline().display_names()
             
             importance_df = pd.DataFrame({
                 'Özellik': feature_names,
-                'Önem Skoru': importance[:len(feature_names)],
-                'Yüzde': (importance[:len(feature_names)] / importance[:len(feature_names)].sum() * 100).round(2)
+                'Önem Skoru': importance,
+                'Yüzde': (importance / importance.sum() * 100).round(2)
             }).sort_values('Önem Skoru', ascending=False)
             
             st.dataframe(importance_df, use_container_width=True)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Model Yükleyici
+
+Eğitilmiş XGBRegressor'ı joblib ile yükler ve isteğe bağlı olarak
+XGBoost'un yerel formatına (UBJ/JSON) aktarır. Yerel formattaki model
+sklearn sarmalayıcısı ve DMatrix oluşturmadan `Booster.inplace_predict`
+ile float32 dizi üzerinde tahmin yapar.
+
+Yerel modeli dışa aktarmak için:
+    python model_loader.py
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from preprocessing import BASE_DIR, MODEL_PATH, file_sha256
+
+NATIVE_MODEL_PATH = os.path.join(BASE_DIR, 'best_car_price_model.ubj')
+
+# Yerel modelin hangi pickle'dan üretildiğini tutan Booster özniteliği
+SOURCE_ATTR = 'source_sha256'
+
+
+def load_sklearn_model(path=MODEL_PATH):
+    """joblib ile kaydedilmiş XGBRegressor'ı yükle"""
+    import joblib
+
+    return joblib.load(path)
+
+
+@lru_cache(maxsize=None)
+def load_shared_model(path=MODEL_PATH):
+    """Regressor'ı işlem başına bir kez yükle; uygulama, sayfalar ve açıklayıcı aynı nesneyi kullanır"""
+    return load_sklearn_model(path)
+
+
+def export_native_model(model=None, model_path=MODEL_PATH, output_path=NATIVE_MODEL_PATH):
+    """Regressor'ı XGBoost yerel formatına aktar (.ubj veya .json)"""
+    if model is None:
+        model = load_sklearn_model(model_path)
+
+    booster = model.get_booster()
+    booster.set_attr(**{SOURCE_ATTR: file_sha256(model_path)})
+    booster.save_model(output_path)
+    return output_path
+
+
+class NativePricePredictor:
+    """Booster.inplace_predict ile tahmin yapan hafif sarmalayıcı"""
+
+    def __init__(self, path=NATIVE_MODEL_PATH):
+        import xgboost as xgb
+
+        self.path = path
+        self.booster = xgb.Booster(model_file=path)
+        self.source_sha256 = self.booster.attr(SOURCE_ATTR)
+
+    def predict(self, features):
+        """Özellik matrisinden fiyat tahmini"""
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        return self.booster.inplace_predict(features)
+
+
+def load_predictor(prefer_native=True, model_path=MODEL_PATH, native_path=NATIVE_MODEL_PATH):
+    """
+    Tahmin için kullanılacak nesneyi döndür
+
+    Yerel model mevcut ve güncel pickle'dan üretilmişse NativePricePredictor,
+    aksi halde joblib ile yüklenen XGBRegressor döner. İkisi de `predict` ve
+    modelin üretildiği pickle'ın özetini (`source_sha256`) sunar.
+    """
+    if prefer_native and os.path.exists(native_path):
+        predictor = NativePricePredictor(native_path)
+        if not os.path.exists(model_path) or predictor.source_sha256 == file_sha256(model_path):
+            return predictor
+
+    model = load_sklearn_model(model_path)
+    model.source_sha256 = file_sha256(model_path)
+    return model
+
+
+def predictor_stat(model_path=MODEL_PATH, native_path=NATIVE_MODEL_PATH):
+    """
+    Tahmin nesnesinin dosyalarının (mtime_ns, boyut) değerleri
+
+    Uzun süre çalışan süreçler bu değer değiştiğinde `load_predictor` ile
+    tahmin nesnesini yeniden yükler; dosyalar özetlenmez.
+    """
+    stats = []
+    for path in (model_path, native_path):
+        try:
+            stat = os.stat(path)
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stats.append(None)
+    return tuple(stats)
+
+
+def main():
+    """Yerel modeli dışa aktar"""
+    path = export_native_model()
+    print(f"✅ Yerel XGBoost modeli kaydedildi: {path}")
+    print(f"   Boyut: {os.path.getsize(path) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
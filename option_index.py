@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Seçenek İndeksi
+
+Kenar çubuğundaki filtreli seçenekleri (marka → seri → model → teknik
+özellikler) veri setinden bir kez çıkarıp küçük bir JSON dosyasına kaydeder.
+Uygulama her yeniden çalıştırmada DataFrame filtrelemek yerine sözlük
+araması yapar. Yalnızca modelin eğitimde gördüğü kategoriler seçenek
+olur; tahmin servisinin reddettiği değerler kenar çubuğunda da çıkmaz.
+
+İndeksi yeniden oluşturmak için:
+    python option_index.py
+"""
+
+import json
+import os
+from functools import lru_cache
+
+from dataset import load_dataset
+from preprocessing import BASE_DIR, DATA_PATH, data_stamp, load_preprocessing
+
+OPTION_INDEX_PATH = os.path.join(BASE_DIR, 'car_options_index.json')
+
+# İndeks formatı değiştiğinde artırılır
+INDEX_VERSION = 2
+
+# Model seçildikten sonra filtrelenen teknik özellikler
+TECHNICAL_COLUMNS = ['vitesTipi', 'yakitTuru', 'kasaTipi', 'cekisTipi']
+
+# Kenar çubuğundaki genel seçenek listeleri
+UNIQUE_COLUMNS = ['marka', 'seri', 'model', 'vitesTipi', 'yakitTuru', 'kasaTipi', 'renk', 'cekisTipi']
+
+
+def known_values(df):
+    """Modelin eğitim sözlüklerinde olmayan kategorileri eksik değere çevir"""
+    preprocessing = load_preprocessing()
+    vocabularies = {**preprocessing.vocabularies, **preprocessing.one_hot}
+    return df.assign(**{
+        column: df[column].where(df[column].isin(vocabularies[column]))
+        for column in UNIQUE_COLUMNS if column in df and column in vocabularies
+    })
+
+
+def sorted_unique(series):
+    """Eksik değerler hariç sıralı unique değerler"""
+    return sorted(series.dropna().unique().tolist())
+
+
+def build_tree(df):
+    """marka → seri → model → {teknik özellik: seçenekler} ağacını çıkar"""
+    tree = {}
+    hierarchy = df.dropna(subset=['marka', 'seri', 'model'])
+    models = hierarchy[['marka', 'seri', 'model']].drop_duplicates()
+    for marka, seri, model in sorted(models.itertuples(index=False, name=None)):
+        tree.setdefault(marka, {}).setdefault(seri, {})[model] = {column: [] for column in TECHNICAL_COLUMNS}
+
+    # Model başına tekil değerler gruplar tek tek taranmadan, tekil satırlardan toplanır
+    for column in TECHNICAL_COLUMNS:
+        pairs = hierarchy[['marka', 'seri', 'model', column]].dropna().drop_duplicates()
+        for marka, seri, model, value in sorted(pairs.itertuples(index=False, name=None)):
+            tree[marka][seri][model][column].append(value)
+
+    # Serisi veya modeli eksik kayıtların markaları ve serileri de listede kalsın
+    for marka in sorted_unique(df['marka']):
+        tree.setdefault(marka, {})
+    for marka, seri in df.dropna(subset=['marka', 'seri'])[['marka', 'seri']].drop_duplicates().itertuples(index=False):
+        tree[marka].setdefault(seri, {})
+
+    return tree
+
+
+def build_option_index(df=None, data_path=DATA_PATH, output_path=OPTION_INDEX_PATH):
+    """İndeksi veri setinden oluşturup kaydet"""
+    if df is None:
+        df = load_dataset(UNIQUE_COLUMNS, data_path=data_path)
+    df = known_values(df)
+
+    index = {
+        'version': INDEX_VERSION,
+        'data_sha256': data_stamp(data_path),
+        'unique_values': {column: sorted_unique(df[column]) for column in UNIQUE_COLUMNS},
+        'tree': build_tree(df)
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    return OptionIndex(index)
+
+
+def merge_tree(tree, additions):
+    """Yeni ilanların ağacını mevcut ağaca ekle (seçenekler birleşim olarak kalır)"""
+    for marka, series in additions.items():
+        target_series = tree.setdefault(marka, {})
+        for seri, models in series.items():
+            target_models = target_series.setdefault(seri, {})
+            for model, options in models.items():
+                target = target_models.setdefault(model, {column: [] for column in TECHNICAL_COLUMNS})
+                for column in TECHNICAL_COLUMNS:
+                    target[column] = sorted(set(target[column]) | set(options[column]))
+    return tree
+
+
+def update_option_index(new_listings, data_sha256, path=OPTION_INDEX_PATH):
+    """
+    Yeni ilanların seçeneklerini kayıtlı indekse ekle
+
+    Yalnızca yeni satırlar taranır. Güncellenen ilanların eski değerleri
+    indeksten çıkarılmaz; seçenekler yalnızca genişler. Modelin tanımadığı
+    kategoriler eklenmez.
+    """
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+
+    new_listings = known_values(new_listings)
+
+    index['data_sha256'] = data_sha256
+    index['unique_values'] = {
+        column: sorted(set(values) | set(new_listings[column].dropna().unique().tolist()))
+        for column, values in index['unique_values'].items()
+    }
+    index['tree'] = merge_tree(index['tree'], build_tree(new_listings))
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    return OptionIndex(index)
+
+
+class OptionIndex:
+    """Hiyerarşik seçenek indeksi"""
+
+    EMPTY = ()
+
+    def __init__(self, index):
+        self.data_sha256 = index.get('data_sha256')
+        self.unique_values = {
+            column: tuple(values) for column, values in index['unique_values'].items()
+        }
+
+        # Her seviyedeki seçenekler önceden sıralı tuple olarak tutulur
+        self.series = {}
+        self.models = {}
+        self.technical = {}
+        for marka, series in index['tree'].items():
+            self.series[marka] = tuple(sorted(series))
+            for seri, models in series.items():
+                self.models[(marka, seri)] = tuple(sorted(models))
+                for model, options in models.items():
+                    self.technical[(marka, seri, model)] = {
+                        column: tuple(options[column]) for column in TECHNICAL_COLUMNS
+                    }
+
+    def filtered_options(self, marka=None, seri=None, model=None):
+        """Seçilen marka/seri/model için uygun seçenekler"""
+        technical = self.technical.get((marka, seri, model), {}) if model else {}
+        options = {
+            'seri': self.series.get(marka, self.EMPTY) if marka else self.EMPTY,
+            'model': self.models.get((marka, seri), self.EMPTY) if seri else self.EMPTY
+        }
+        for column in TECHNICAL_COLUMNS:
+            options[column] = technical.get(column, self.EMPTY)
+        return options
+
+
+@lru_cache(maxsize=None)
+def load_option_index(path=OPTION_INDEX_PATH, data_path=DATA_PATH):
+    """İndeksi işlem başına bir kez yükle; yoksa veya veri değiştiyse oluştur"""
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION and (
+            not os.path.exists(data_path) or index.get('data_sha256') == data_stamp(data_path)
+        ):
+            return OptionIndex(index)
+
+    return build_option_index(data_path=data_path, output_path=path)
+
+
+def main():
+    """İndeksi yeniden oluştur"""
+    index = build_option_index()
+    print(f"✅ Seçenek indeksi kaydedildi: {OPTION_INDEX_PATH}")
+    print(f"   Marka: {len(index.series)}, Seri: {len(index.models)}, Model: {len(index.technical)}")
+    print(f"   Boyut: {os.path.getsize(OPTION_INDEX_PATH) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
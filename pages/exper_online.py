@@ -1,36 +1,25 @@
 import streamlit as st
 import numpy as np
-import tempfile
 import os
 import subprocess
 import time
 import io
+from importlib.util import find_spec
 
-# Import with error handling
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
+from camera_pipeline import PIPELINES, summary_markdown
+from detection import (BATCH_SIZES, DEFAULT_BATCH_SIZE, DEFAULT_TILE_OVERLAP, DEFAULT_TILE_SIZE,
+                       DEFAULT_TILE_WORKERS, TILE_SIZES, TiledDetector, decode_image, detect, detect_batch,
+                       draw_detections, encode_jpeg, image_size, shift_detections, summarize_vehicle,
+                       tile_windows)
+from detection_cache import content_key, load_detection_cache
+from yolo_export import IMAGE_SIZE, resolve_yolo_model, yolo_model_stat
 
-try:
-    from PIL import Image
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
-    YOLO = None
-
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# Ağır paketler (cv2, ultralytics, torch) sayfa açılırken değil, ilgili özellik
+# çalıştığında içe aktarılır; burada yalnızca kurulu olup olmadıkları kontrol edilir
+CV2_AVAILABLE = find_spec('cv2') is not None
+PIL_AVAILABLE = find_spec('PIL') is not None
+YOLO_AVAILABLE = find_spec('ultralytics') is not None
+TORCH_AVAILABLE = find_spec('torch') is not None
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -101,20 +90,40 @@ st.markdown("""
 # Ana başlık
 st.markdown('<h1 class="main-header">🔍 Exper Online - YOLO11 Tespit Sistemi</h1>', unsafe_allow_html=True)
 
+# Sunulan model: dışa aktarılmış güncel ONNX/INT8 modeli varsa ONNX Runtime ile
+# çalışır. Model dosyalarının stat değeri anahtarda olduğu için best.pt değişince
+# veya sonradan ONNX/INT8 dışa aktarılınca model yeniden çözülür; özet, tespit
+# önbelleğinde sonuçları bu modele bağlar
+@st.cache_resource(max_entries=1)
+def resolve_served_model(model_stat):
+    """Sunulan modelin (dosya, arka uç, özet) üçlüsü"""
+    from preprocessing import file_sha256
+    
+    model_path, backend = resolve_yolo_model()
+    model_sha256 = file_sha256(model_path) if os.path.exists(model_path) else None
+    return model_path, backend, model_sha256
+
+def served_model():
+    return resolve_served_model(yolo_model_stat())
+
 # Model yükleme fonksiyonu
-@st.cache_resource
-def load_yolo_model():
+@st.cache_resource(max_entries=1)
+def load_yolo_model(model_path, backend, model_sha256):
     """YOLO11 modelini yükle"""
     if not YOLO_AVAILABLE:
         st.error("❌ ultralytics paketi yüklü değil. Model yüklenemiyor.")
         return None
         
     try:
-        model_path = "model/best.pt"
         if not os.path.exists(model_path):
             st.error(f"Model dosyası bulunamadı: {model_path}")
             return None
         
+        from ultralytics import YOLO
+        
+        if backend != 'torch':
+            return YOLO(model_path, task='detect')
+        
         # Farklı yükleme yöntemleri dene
         try:
             # Yöntem 1: Standart YOLO yükleme
@@ -126,6 +135,7 @@ def load_yolo_model():
             try:
                 # Yöntem 2: Torch ile yükleme
                 if TORCH_AVAILABLE:
+                    import torch
                     model = torch.load(model_path, map_location='cpu')
                     return model
                 else:
@@ -155,6 +165,8 @@ def load_yolo_model():
 # YOLO tespit fonksiyonu
 def run_yolo_detection(image, model):
     """YOLO ile tespit yap"""
+    from PIL import Image
+    
     try:
         # Görüntüyü PIL'den numpy array'e çevir
         if isinstance(image, Image.Image):
@@ -165,27 +177,7 @@ def run_yolo_detection(image, model):
         # Model tipini kontrol et
         if hasattr(model, 'predict'):
             # YOLO modeli
-            results = model(image_array)
-            
-            # Sonuçları işle
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Koordinatları al
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
-                        
-                        detections.append({
-                            'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                            'confidence': float(confidence),
-                            'class_id': class_id,
-                            'class_name': model.names[class_id] if hasattr(model, 'names') and class_id < len(model.names) else f'Class_{class_id}'
-                        })
-            
-            return detections, results
+            return detect(image_array, model)
         else:
             # Torch modeli - basit tespit simülasyonu
             st.warning("Model YOLO formatında değil, basit tespit simülasyonu yapılıyor...")
@@ -204,32 +196,59 @@ def run_yolo_detection(image, model):
         st.error(f"Tespit sırasında hata oluştu: {str(e)}")
         return [], None
 
-# Görüntü üzerine tespit sonuçlarını çiz
-def draw_detections(image, detections):
-    """Tespit sonuçlarını görüntü üzerine çiz"""
-    image_with_detections = image.copy()
+# Toplu YOLO tespit fonksiyonu
+def run_batch_detection(images, model, batch_size, progress=None):
+    """Fotoğrafları toplu tespit et; her fotoğrafın tespit listesini döndür"""
+    if not hasattr(model, 'predict'):
+        # Torch modeli - fotoğraf başına basit tespit simülasyonu
+        return [run_yolo_detection(image, model)[0] for image in images]
     
-    for detection in detections:
-        x1, y1, x2, y2 = detection['bbox']
-        confidence = detection['confidence']
-        class_name = detection['class_name']
-        
-        # Bounding box çiz
-        cv2.rectangle(image_with_detections, (x1, y1), (x2, y2), (0, 255, 0), 2)
-        
-        # Etiket yaz
-        label = f"{class_name}: {confidence:.2f}"
-        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-        
-        # Etiket arka planı
-        cv2.rectangle(image_with_detections, (x1, y1 - label_size[1] - 10), 
-                     (x1 + label_size[0], y1), (0, 255, 0), -1)
-        
-        # Etiket metni
-        cv2.putText(image_with_detections, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    # Hatalar çağırana iletilir; başarısız sonuçlar önbelleğe yazılmaz
+    return detect_batch(images, model, batch_size, progress=progress)
+
+# Tespit önbelleği (DETECTION_CACHE_DB ile süreçler arası paylaşılabilir;
+# kayıtlar tespiti yapan modelin özetiyle işaretlenir)
+@st.cache_resource
+def load_detections_cache():
+    return load_detection_cache()
+
+def upload_keys(uploaded_files, max_side, tiling=None):
+    """Yüklenen dosyaların içerik anahtarları (yükleme ve ayar başına bir kez hesaplanır)"""
+    known = st.session_state.setdefault('icerik_anahtarlari', {})
+    keys = []
+    for uploaded_file in uploaded_files:
+        variant = (uploaded_file.file_id, max_side, tiling)
+        if variant not in known:
+            known[variant] = content_key(uploaded_file.getbuffer(), max_side, tiling)
+        keys.append(known[variant])
+    return keys
+
+# Karolu modda tam çözünürlüklü kare yalnızca tespit sırasında çözülür
+def decode_full(uploaded_file):
+    """Yüklenen dosyanın tam çözünürlüklü BGR dizisi"""
+    return decode_image(uploaded_file.getbuffer(), None)
+
+def full_size(uploaded_file):
+    """Yüklenen fotoğrafın tam çözünürlüklü (genişlik, yükseklik) boyutu"""
+    size = image_size(uploaded_file.getbuffer())
+    if size is None:
+        # Başlık okunamazsa kare bir kez çözülüp bırakılır
+        height, width = decode_full(uploaded_file).shape[:2]
+        size = width, height
+    return size
+
+# Karolu tespitin iş parçacıkları sunulan model dosyasından kendi modellerini yükler
+def new_yolo_model(model_path):
+    """Karolu tespit iş parçacığı için ayrı YOLO modeli"""
+    from ultralytics import YOLO
     
-    return image_with_detections
+    return YOLO(model_path, task='detect')
+
+# Karo ayarları çağrı başına verilir; önbellek iş parçacığı sayısına ve sunulan
+# modele göre tutulur (her kayıt kendi iş parçacığı havuzunu ve modellerini taşır)
+@st.cache_resource(max_entries=2)
+def load_tiled_detector(workers, model_path, model_sha256):
+    return TiledDetector(lambda: new_yolo_model(model_path), workers)
 
 # Dependency availability check
 missing_deps = []
@@ -249,12 +268,30 @@ if missing_deps:
     st.code(f"pip install {' '.join(missing_deps)}", language="bash")
     st.stop()
 
-# Model yükle
-model = load_yolo_model()
+# Model ilk tespit isteğinde yüklenir (süreç genelinde bir kez)
+def require_yolo_model(served=None):
+    """Sunulan modeli döndür; yüklenemezse sayfayı durdur"""
+    model = load_yolo_model(*(served or served_model()))
+    if model is None:
+        st.error("❌ YOLO modeli yüklenemedi. Lütfen model dosyasının doğru konumda olduğundan emin olun.")
+        st.stop()
+    return model
 
-if model is None:
-    st.error("❌ YOLO modeli yüklenemedi. Lütfen model dosyasının doğru konumda olduğundan emin olun.")
-    st.stop()
+# Kamera modları ve istatistiklerin yenilenme aralığı (saniye)
+CAMERA_MODES = {
+    'paralel': "⚡ Paralel boru hattı",
+    'sirali': "🐢 Sıralı (tek iş parçacığı)"
+}
+STATS_REFRESH_S = 0.5
+
+def camera_detector(model):
+    """Kamera döngüsünün tespit fonksiyonu (iş parçacığında Streamlit çağrısı yapmaz)"""
+    if hasattr(model, 'predict'):
+        return lambda image: detect(image, model)[0]
+    
+    # YOLO formatında olmayan model için simülasyon uyarısı bir kez gösterilir
+    detections, _ = run_yolo_detection(np.zeros((1, 1, 3), dtype=np.uint8), model)
+    return lambda image: detections
 
 # Ana içerik
 tab1, tab2 = st.tabs(["📸 Fotoğraf Yükleme", "📹 Real-time Kamera"])
@@ -262,71 +299,145 @@ tab1, tab2 = st.tabs(["📸 Fotoğraf Yükleme", "📹 Real-time Kamera"])
 with tab1:
     st.markdown('<div class="upload-section">', unsafe_allow_html=True)
     st.markdown("### 📸 Fotoğraf Yükleme")
-    st.markdown("Tespit etmek istediğiniz fotoğrafı yükleyin")
+    st.markdown("Bir araca ait fotoğrafları yükleyin; tespitler araç bazında özetlenir")
     
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Dosya seçin",
         type=['png', 'jpg', 'jpeg'],
-        help="PNG, JPG veya JPEG formatında görüntü yükleyin"
+        accept_multiple_files=True,
+        help="PNG, JPG veya JPEG formatında bir veya daha fazla görüntü yükleyin"
+    )
+    batch_size = st.select_slider(
+        "Toplu tespit boyutu",
+        options=BATCH_SIZES,
+        value=DEFAULT_BATCH_SIZE,
+        help="Tek model çağrısında işlenen fotoğraf (karolu modda karo) sayısı"
+    )
+    tiled = st.checkbox(
+        "🔬 Karolu yüksek çözünürlüklü tespit",
+        help="Küçük çizik ve göçükler için fotoğraf tam çözünürlükte örtüşen karolarla taranır (daha yavaş)"
     )
+    tiling = None
+    if tiled:
+        col_tile, col_overlap, col_workers = st.columns(3)
+        tile_size = col_tile.select_slider("Karo boyutu", options=TILE_SIZES, value=DEFAULT_TILE_SIZE)
+        overlap = col_overlap.slider("Örtüşme", 0.0, 0.5, DEFAULT_TILE_OVERLAP, 0.05)
+        workers = col_workers.number_input("İş parçacığı", 1, os.cpu_count() or 1, DEFAULT_TILE_WORKERS)
+        tiling = (tile_size, overlap)
     
-    if uploaded_file is not None:
-        # Görüntüyü yükle
-        image = Image.open(uploaded_file)
+    if uploaded_files:
+        # Görüntüler yükleme tamponundan kopyalanmadan bir kez modelin girdi
+        # boyutunda BGR diziye çözülür. Karolu modda bu diziler yalnızca
+        # önizlemedir: tam çözünürlüklü kare tespit sırasında fotoğraf başına
+        # çözülür ve sonraki fotoğrafa geçmeden bırakılır
+        max_side = None if tiled else IMAGE_SIZE
+        images = [decode_image(uploaded_file.getbuffer(), IMAGE_SIZE) for uploaded_file in uploaded_files]
+        sizes = [full_size(uploaded_file) for uploaded_file in uploaded_files] if tiled else None
+        names = [uploaded_file.name for uploaded_file in uploaded_files]
         
-        # Görüntüyü göster
-        col1, col2 = st.columns(2)
+        # Görüntüleri göster
+        with st.expander(f"🖼️ Yüklenen Görüntüler ({len(images)})", expanded=len(images) == 1):
+            columns = st.columns(min(len(images), 4))
+            for i, (image, name) in enumerate(zip(images, names)):
+                columns[i % len(columns)].image(image, caption=name, channels="BGR", width='stretch')
         
-        with col1:
-            st.image(image, caption="Yüklenen Görüntü", width='stretch')
-        
-        # Tespit butonu
+        # Tespit butonu; sonuçlar sonraki yeniden çalıştırmalarda (ör. indirme)
+        # aynı fotoğraflar için önbellekten çizilir
+        keys = upload_keys(uploaded_files, max_side, tiling)
         if st.button("🔍 Tespit Yap", type="primary", use_container_width=True):
-            with st.spinner("Tespit yapılıyor..."):
-                # YOLO tespiti yap
-                detections, results = run_yolo_detection(image, model)
+            st.session_state['tespit_edilen'] = keys
+        
+        if st.session_state.get('tespit_edilen') == keys:
+            detection_cache = load_detections_cache()
+            served = served_model()
+            progress_bar = st.progress(0.0, text="Tespit yapılıyor...")
+            detected = []
+            
+            def progress(done, total):
+                progress_bar.progress(done / total, text=f"Tespit yapılıyor... {done}/{total}")
+            
+            def detect_missing(missing_images):
+                detected.extend(missing_images)
+                if tiled:
+                    # Karolu tespit kendi modellerini yükler; paylaşılan model yüklenmez
+                    detector = load_tiled_detector(int(workers), served[0], served[2])
+                    return detector.detect_many(missing_images, tile_size, overlap, batch_size,
+                                                progress=progress, decode=decode_full)
+                return run_batch_detection(missing_images, require_yolo_model(served), batch_size, progress=progress)
+            
+            started = time.perf_counter()
+            try:
+                # Karolu modda tespite önizlemeler değil yüklenen dosyalar verilir
+                inputs = uploaded_files if tiled else images
+                detections_per_image = detection_cache.detect(keys, inputs, detect_missing, served[2])
+            except Exception as e:
+                st.error(f"Tespit sırasında hata oluştu: {str(e)}")
+                detections_per_image = [[] for _ in images]
+            elapsed = time.perf_counter() - started
+            progress_bar.empty()
+            
+            cache_stats = detection_cache.stats()
+            st.caption(
+                f"⚡ Tespit önbelleği: {cache_stats['isabet']} isabet · {cache_stats['kayip']} kayıp · "
+                f"{cache_stats['kayit']} kayıt ({cache_stats['bayt'] / 1024:,.0f} KB)"
+            )
+            
+            vehicle_summary = summarize_vehicle(detections_per_image)
+            n_detections = sum(len(detections) for detections in detections_per_image)
+            
+            if n_detections:
+                # Araç bazında tespit özeti
+                st.markdown('<div class="result-box">', unsafe_allow_html=True)
+                st.markdown(f"### ✅ {len(images)} Fotoğrafta {n_detections} Nesne Tespit Edildi!")
+                if detected:
+                    st.markdown(f"{len(detected)} fotoğraf tespit edildi, {len(images) - len(detected)} önbellekten "
+                                f"({len(detected) / elapsed:.1f} fotoğraf/sn, toplu tespit boyutu {batch_size})")
+                else:
+                    st.markdown(f"Tüm sonuçlar önbellekten ({elapsed * 1000:.0f} ms)")
+                if tiled:
+                    tile_counts = [len(tile_windows(height, width, tile_size, overlap)) for width, height in sizes]
+                    st.markdown(f"Karolu tespit: fotoğraf başına ortalama {sum(tile_counts) / len(images):.0f} karo "
+                                f"({tile_size} px, %{overlap * 100:.0f} örtüşme)")
+                st.markdown('</div>', unsafe_allow_html=True)
                 
-                if detections:
-                    # Tespit sonuçlarını göster
-                    st.markdown('<div class="result-box">', unsafe_allow_html=True)
-                    st.markdown(f"### ✅ {len(detections)} Nesne Tespit Edildi!")
-                    
-                    # Tespit detayları
-                    for i, detection in enumerate(detections, 1):
-                        st.markdown(f"**{i}.** {detection['class_name']} - Güven: {detection['confidence']:.2%}")
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    # Görüntü üzerine tespitleri çiz
-                    image_array = np.array(image)
-                    image_with_detections = draw_detections(image_array, detections)
-                    
-                    with col2:
-                        st.image(image_with_detections, caption="Tespit Sonuçları", width='stretch')
-                    
-                    # Sonuçları indirme
-                    result_image = Image.fromarray(cv2.cvtColor(image_with_detections, cv2.COLOR_BGR2RGB))
-                    
-                    # Geçici dosya oluştur
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                        result_image.save(tmp_file.name)
-                        
-                        with open(tmp_file.name, 'rb') as f:
-                            st.download_button(
-                                label="📥 Tespit Sonuçlarını İndir",
-                                data=f.read(),
-                                file_name=f"detection_result_{int(time.time())}.jpg",
-                                mime="image/jpeg"
-                            )
-                    
-                    # Geçici dosyayı sil
-                    os.unlink(tmp_file.name)
+                lines = ['| Sınıf | Tespit | Fotoğraf | En Yüksek Güven |', '|---|---:|---:|---:|']
+                for name, entry in vehicle_summary.items():
+                    lines.append(f"| {name} | {entry['adet']} | {entry['fotograf']}/{len(images)} | {entry['en_yuksek_guven']:.2%} |")
+                st.markdown('\n'.join(lines))
                 
-                else:
-                    st.markdown('<div class="error-box">', unsafe_allow_html=True)
-                    st.markdown("### ❌ Hiçbir Nesne Tespit Edilemedi")
-                    st.markdown("Görüntüde tespit edilebilir nesne bulunamadı.")
-                    st.markdown('</div>', unsafe_allow_html=True)
+                # Fotoğraf bazında sonuçlar
+                for i, (image, name, detections) in enumerate(zip(images, names, detections_per_image)):
+                    if not detections:
+                        continue
+                    with st.expander(f"📷 {name} - {len(detections)} tespit"):
+                        col1, col2 = st.columns(2)
+                        
+                        # Tespitler çözülen tamponun üzerine çizilir (kopya yok);
+                        # karolu modun tam çözünürlük kutuları önizlemeye ölçeklenir
+                        boxes = detections
+                        if tiled:
+                            boxes = shift_detections(detections, scale=max(image.shape[:2]) / max(sizes[i]))
+                        draw_detections(image, boxes, inplace=True)
+                        with col1:
+                            st.image(image, caption="Tespit Sonuçları", channels="BGR", width='stretch')
+                        with col2:
+                            for i, detection in enumerate(detections, 1):
+                                st.markdown(f"**{i}.** {detection['class_name']} - Güven: {detection['confidence']:.2%}")
+                        
+                        # Sonuçları indirme (bellekte JPEG)
+                        st.download_button(
+                            label="📥 Tespit Sonuçlarını İndir",
+                            data=encode_jpeg(image),
+                            file_name=f"detection_result_{os.path.splitext(name)[0]}_{int(time.time())}.jpg",
+                            mime="image/jpeg",
+                            key=f"download_{name}"
+                        )
+            
+            else:
+                st.markdown('<div class="error-box">', unsafe_allow_html=True)
+                st.markdown("### ❌ Hiçbir Nesne Tespit Edilemedi")
+                st.markdown("Görüntülerde tespit edilebilir nesne bulunamadı.")
+                st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -335,48 +446,66 @@ with tab2:
     st.markdown("### 📹 Real-time Kamera Tespiti")
     st.markdown("Webcam kullanarak gerçek zamanlı tespit yapın")
     
+    source = st.text_input(
+        "Kaynak",
+        value="0",
+        help="Kamera numarası veya çevrimdışı deneme için video dosyası yolu"
+    )
+    mode = st.radio(
+        "Çalışma modu",
+        list(CAMERA_MODES),
+        format_func=CAMERA_MODES.get,
+        horizontal=True,
+        help="Paralel modda okuma ve tespit ayrı iş parçacıklarında çalışır, eski kareler atlanır"
+    )
+    
     # Kamera açma butonu
     if st.button("📹 Kamerayı Aç", type="primary", use_container_width=True):
         st.markdown("**Kamerayı kapatmak için 'q' tuşuna basın**")
         
         # Kamera başlat
-        cap = cv2.VideoCapture(0)
+        model = require_yolo_model()
+        pipeline = PIPELINES[mode](source, camera_detector(model))
         
-        if not cap.isOpened():
+        try:
+            pipeline.start()
+        except RuntimeError:
             st.error("❌ Kamera açılamadı!")
         else:
             # Streamlit placeholder
             frame_placeholder = st.empty()
-            stop_button = st.button("⏹️ Kamerayı Durdur")
+            stats_placeholder = st.empty()
+            st.button("⏹️ Kamerayı Durdur")
             
+            # Çizim ve gösterim bu iş parçacığında; tıklama sayfayı yeniden
+            # çalıştırınca finally bloğu boru hattını durdurur
+            last_stats = 0.0
             try:
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
+                while not pipeline.finished:
+                    result = pipeline.next_result()
+                    if result is None:
+                        continue
                     
-                    # YOLO tespiti yap
-                    detections, _ = run_yolo_detection(frame, model)
+                    started = time.perf_counter()
+                    frame = result.frame.image
+                    if result.detections:
+                        draw_detections(frame, result.detections, inplace=True)
                     
-                    # Tespit sonuçlarını çiz
-                    if detections:
-                        frame = draw_detections(frame, detections)
+                    frame_placeholder.image(frame, channels="BGR", width='stretch')
+                    pipeline.record_render(result, started)
                     
-                    # Görüntüyü göster
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frame_placeholder.image(frame_rgb, channels="RGB", width='stretch')
-                    
-                    # Durdurma kontrolü
-                    if stop_button:
-                        break
-                    
-                    # Kısa bekleme
-                    time.sleep(0.1)
+                    if started - last_stats >= STATS_REFRESH_S:
+                        stats_placeholder.markdown(summary_markdown(pipeline.summary()))
+                        last_stats = started
+                
+                if pipeline.error is not None:
+                    st.error(f"Kamera hatası: {str(pipeline.error)}")
                     
             except Exception as e:
                 st.error(f"Kamera hatası: {str(e)}")
             finally:
-                cap.release()
+                pipeline.stop()
+                stats_placeholder.markdown(summary_markdown(pipeline.summary()))
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1,14 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-from sklearn.preprocessing import LabelEncoder
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from conformal import load_conformal_table
+from dataset import load_dataset
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_shared_model
+from shap_summary import load_shap_summary, summary_stat
 import warnings
 warnings.filterwarnings('ignore')
 
+@st.cache_resource(max_entries=1)
+def cached_shap_summary(stat):
+    """Özeti dosyalar değişene kadar bir kez aç (model/veri özetleri her yenilemede hesaplanmaz)"""
+    return load_shap_summary()
+
 def create_explainability_page():
     """Model açıklanabilirliği sayfası"""
     
@@ -49,18 +57,20 @@ def create_explainability_page():
     
     # Model yükle
     try:
-        model = joblib.load('best_car_price_model.pkl')
-        df = pd.read_csv('cars_tr.csv')
+        model = load_shared_model()
+        df = load_dataset()
+        pipeline = load_feature_pipeline()
     except Exception as e:
         st.error(f"Model yüklenemedi: {e}")
         return
     
     # Sekmeler
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📊 Özellik Önemi", 
         "🔍 Tahmin Analizi", 
         "📈 Model Performansı", 
-        "🎯 Örnek Senaryolar"
+        "🎯 Örnek Senaryolar",
+        "🌐 Genel SHAP Özeti"
     ])
     
     with tab1:
@@ -70,30 +80,8 @@ def create_explainability_page():
         if hasattr(model, 'feature_importances_'):
             importance = model.feature_importances_
             
-            # Özellik isimleri - 43 özellik için
-            feature_names = [
-                'Kilometre', 'Yıl', 'Motor Hacmi', 'Motor Gücü', 'Araç Vergisi', 'Tramer',
-                'Marka', 'Seri', 'Model', 'Kasa Tipi', 'Çekiş Tipi', 'Hasar Skoru',
-                'Vites_Düz', 'Vites_Otomatik', 'Vites_Yarı Otomatik',
-                'Yakıt_Benzin', 'Yakıt_Dizel', 'Yakıt_Elektrik', 'Yakıt_Hibrit', 'Yakıt_LPG & Benzin'
-            ]
-            
-            # Renk kategorileri ekle
-            try:
-                renk_categories = df['renk'].dropna().unique()
-                feature_names.extend([f'Renk_{color}' for color in renk_categories])
-            except:
-                # Renk kategorileri yüklenemezse varsayılan renkler
-                default_colors = ['Beyaz', 'Siyah', 'Gri', 'Mavi', 'Kırmızı', 'Yeşil', 'Sarı', 'Turuncu', 'Mor', 'Kahverengi']
-                feature_names.extend([f'Renk_{color}' for color in default_colors])
-            
-            # Eksik özellik isimlerini tamamla (toplam 43 olmalı)
-            while len(feature_names) < 43:
-                feature_names.append(f'Özellik_{len(feature_names)}')
-            
-            # Fazla özellik isimlerini kırp
-            if len(feature_names) > len(importance):
-                feature_names = feature_names[:len(importance)]
+            # Model sırasıyla özellik isimleri
+            feature_names = pipeline.display_names()
             
             # En önemli 15 özellik
             top_n = st.slider("Gösterilecek özellik sayısı", 5, 20, 15)
@@ -139,49 +127,12 @@ def create_explainability_page():
             # Rastgele bir örnek seç
             sample = df.sample(1)
             
-            # Veri hazırlama (basitleştirilmiş)
+            # Veri hazırlama
             try:
-                # 43 özellik ile doldurulmuş vektör
-                features = np.zeros(43)
-                
-                # Temel özellikler - güçlü veri temizleme ile
-                def clean_numeric_value(value, default=0):
-                    """Sayısal değeri temizle ve float'a dönüştür"""
-                    if pd.isna(value) or value is None:
-                        return default
-                    
-                    if isinstance(value, (int, float)):
-                        return float(value)
-                    
-                    if isinstance(value, str):
-                        # String'den sayısal değeri çıkar
-                        import re
-                        # Sadece sayıları ve nokta/virgülü al
-                        cleaned = re.sub(r'[^\d.,]', '', str(value))
-                        if cleaned:
-                            # Nokta ve virgülü temizle (Türkçe sayı formatı)
-                            cleaned = cleaned.replace('.', '').replace(',', '.')
-                            try:
-                                return float(cleaned)
-                            except:
-                                return default
-                    return default
+                # Veri seti temizlenmiş olduğundan örnek doğrudan kodlanır
+                features = pipeline.transform(sample)
                 
-                # Kilometre değerini temizle
-                km_value = sample['kilometre(Km)'].iloc[0] if 'kilometre(Km)' in sample.columns else 100000
-                features[0] = clean_numeric_value(km_value, 100000)
-                
-                # Yıl değerini temizle
-                yil_value = sample['yıl'].iloc[0] if 'yıl' in sample.columns else 2020
-                features[1] = clean_numeric_value(yil_value, 2020)
-                features[2] = 1600  # motor_hacmi
-                features[3] = 120   # motor_gucu
-                features[4] = 2000  # arac_vergisi
-                features[5] = 0     # tramer
-                
-                # Diğer özellikler 0 olarak kalır
-                
-                prediction = model.predict([features])[0]
+                prediction = model.predict(features)[0]
                 
                 st.success(f"Örnek tahmin: {prediction:,.0f} TL")
                 
@@ -191,11 +142,15 @@ def create_explainability_page():
                 with col1:
                     st.metric("Tahmin", f"{prediction:,.0f} TL")
                 
+                conformal_table = load_conformal_table()
+                low, high = conformal_table.interval(prediction, sample['marka'].iloc[0])
+                
                 with col2:
-                    st.metric("Güven Aralığı", f"±{prediction*0.15:,.0f} TL")
+                    st.metric(f"Tahmin Aralığı (%{conformal_table.coverage * 100:.0f})",
+                              f"{low:,.0f} - {high:,.0f} TL")
                 
                 with col3:
-                    st.metric("Model Güvenilirliği", "Yüksek")
+                    st.metric("Gerçek Fiyat", f"{sample['fiyat(TRY)'].iloc[0]:,.0f} TL")
                 
             except Exception as e:
                 st.error(f"Tahmin analizi yapılamadı: {e}")
@@ -301,19 +256,14 @@ def create_explainability_page():
         
         # Basit tahmin (gerçek model için daha karmaşık olmalı)
         try:
-            # Model yükle ve tahmin yap
-            model = joblib.load('best_car_price_model.pkl')
-            
-            # Basit özellik vektörü oluştur
-            features = np.zeros(43)  # 43 özellik
-            features[0] = selected['features'][0]  # kilometre
-            features[1] = selected['features'][1]  # yıl
-            features[2] = selected['features'][2]  # motor_hacmi
-            features[3] = selected['features'][3]  # motor_gucu
-            features[4] = selected['features'][4]  # arac_vergisi
-            features[5] = selected['features'][5]  # tramer
+            # Senaryonun sayısal özellikleri (kategorik alanlar eksik değer olarak kalır)
+            record = pd.DataFrame([dict(zip(
+                ['kilometre(Km)', 'yıl', 'motorHacmi(Cc)', 'motorGucu(HP)', 'aracVergisi(TRY)', 'tramer'],
+                selected['features']
+            ))])
+            features = pipeline.transform(record)
             
-            prediction = model.predict([features])[0]
+            prediction = model.predict(features)[0]
             st.metric("Tahmini Fiyat", f"{prediction:,.0f} TL")
         except:
             base_price = np.random.randint(300000, 2000000)
@@ -334,5 +284,67 @@ def create_explainability_page():
         for feature, effect in feature_effects.items():
             st.markdown(f"• **{feature}:** {effect}")
 
+    with tab5:
+        st.markdown("### Tüm Veri Seti İçin SHAP Özeti")
+        st.markdown("Her ilanın SHAP değerleri önceden hesaplanmıştır; grafikler kayıtlı değerlerden çizilir.")
+        
+        # Bellek eşlemeli dosya açılır, değerler yeniden hesaplanmaz
+        summary = cached_shap_summary(summary_stat())
+        if summary is None:
+            st.info("SHAP özeti yok veya model değişmiş. Oluşturmak için: `python shap_summary.py`")
+        else:
+            feature_names = pipeline.display_names()
+            mean_abs = summary.mean_abs()
+            top_n = st.slider("Özetteki özellik sayısı", 5, 20, 12)
+            top_indices = np.argsort(mean_abs)[::-1][:top_n]
+            
+            # Beeswarm: her nokta bir ilan, renk özelliğin veri setindeki sırası (özetle kaydedilir)
+            rows = summary.sample(2000)
+            values = summary.values[rows][:, top_indices]
+            colors = summary.percentiles[rows][:, top_indices]
+            jitter = np.random.default_rng(0).uniform(-0.3, 0.3, size=values.shape)
+            
+            fig = go.Figure()
+            for rank, column in enumerate(top_indices):
+                fig.add_trace(go.Scattergl(
+                    x=values[:, rank],
+                    y=top_n - 1 - rank + jitter[:, rank],
+                    mode='markers',
+                    marker=dict(size=4, color=colors[:, rank], colorscale='RdBu_r',
+                                cmin=0, cmax=1, showscale=rank == 0,
+                                colorbar=dict(title="Özellik<br>değeri", tickvals=[0, 1],
+                                              ticktext=["Düşük", "Yüksek"])),
+                    name=feature_names[column],
+                    showlegend=False
+                ))
+            fig.update_layout(
+                title=f"SHAP Özeti ({len(rows):,} / {len(summary):,} ilan)",
+                xaxis_title="SHAP Değeri (Fiyat Etkisi, TL)",
+                yaxis=dict(tickvals=list(range(top_n)),
+                           ticktext=[feature_names[i] for i in top_indices][::-1]),
+                height=600
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Marka bazında ortalama |SHAP|
+            st.markdown("### Marka Bazında Ortalama |SHAP|")
+            marka = df['marka'].astype('category').iloc[pd.Index(df['ilanID']).get_indexer(summary.rows)]
+            by_marka = summary.mean_abs_by_group(marka.cat.codes.to_numpy(), len(marka.cat.categories))
+            by_marka = pd.DataFrame(by_marka[:, top_indices], index=marka.cat.categories,
+                                    columns=[feature_names[i] for i in top_indices]).dropna()
+            
+            fig = px.imshow(
+                by_marka,
+                labels={'x': 'Özellik', 'y': 'Marka', 'color': 'Ortalama |SHAP| (TL)'},
+                color_continuous_scale='Blues',
+                aspect='auto'
+            )
+            fig.update_layout(height=max(400, 22 * len(by_marka)))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.caption(f"Model özeti: {summary.meta['model_sha256'][:12]} · "
+                       f"arka uç: {summary.meta['backend']} · "
+                       f"beklenen değer: {summary.expected_value:,.0f} TL")
+
 if __name__ == "__main__":
     create_explainability_page()
@@ -0,0 +1,286 @@
+"""
+Tahmin Önbelleği
+
+Aynı araç yapılandırmasının tekrar tekrar fiyatlanmasını önler. Anahtar,
+form alanlarının kanonik halidir (metinler kırpılır, sayılar float olur,
+kilometre ayarlanabilir aralıklara yuvarlanır). Tahmin her zaman kanonik
+girdiyle yapılır; böylece aynı aralıktaki istekler aynı fiyatı alır.
+
+İşlem içi katman sınırlı boyutlu bir LRU'dur ve kayıtlar TTL sonunda
+düşer. İsteğe bağlı SQLite deposu, aynı makinedeki birden fazla uygulama
+veya servis sürecinin isabetleri paylaşmasını sağlar. Kayıtlar tahmini
+yapan nesnenin model özetiyle (`source_sha256`) işaretlenir; özet model
+dosyasından değil, çağıranın kullandığı tahmin nesnesinden gelir. Böylece
+dosya değişip tahmin nesnesi henüz yeniden yüklenmediyse eski modelin
+tahminleri yeni özetle saklanmaz.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from cleaning import FORM_FIELDS, parse_number
+
+# Anahtara giren alanlar (sıra sabittir)
+KEY_FIELDS = list(FORM_FIELDS) + ['boya_durumu']
+
+# Sayısal form alanları
+NUMERIC_FIELDS = ['yil', 'kilometre', 'motor_hacmi', 'motor_gucu', 'arac_vergisi', 'tramer']
+
+# Varsayılan ayarlar
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL = 3600
+DEFAULT_KM_BUCKET = 1000
+
+# Süreçler arası paylaşılan önbellek için SQLite dosyası (boşsa yalnızca işlem içi)
+CACHE_DB_ENV = 'PREDICTION_CACHE_DB'
+
+
+def canonical_value(field, value, km_bucket=DEFAULT_KM_BUCKET):
+    """Form alanının kanonik değeri"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+
+    if field in NUMERIC_FIELDS:
+        if isinstance(value, str):
+            value = parse_number(pd.Series([value])).iloc[0]
+            if value != value:
+                return None
+        value = float(value)
+        if field == 'kilometre' and km_bucket:
+            value = float(round(value / km_bucket) * km_bucket)
+        return value
+
+    return str(value).strip()
+
+
+def canonicalize(form, km_bucket=DEFAULT_KM_BUCKET):
+    """Form kaydını kanonik hale getir; anahtar ve tahmin girdisi olarak kullanılır"""
+    canonical = {field: canonical_value(field, form.get(field), km_bucket) for field in KEY_FIELDS}
+    return {field: value for field, value in canonical.items() if value is not None}
+
+
+def cache_key(canonical):
+    """Kanonik kaydın anahtarı"""
+    return tuple(canonical.get(field) for field in KEY_FIELDS)
+
+
+class SQLiteCacheStore:
+    """Süreçler arasında paylaşılan tahmin deposu"""
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self.local = threading.local()
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                " key TEXT PRIMARY KEY, model_sha256 TEXT, value REAL,"
+                " expires_at REAL, used_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS predictions_used ON predictions(used_at)")
+
+    def connect(self):
+        """İş parçacığı başına bir bağlantı"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self.local.connection = connection
+        return connection
+
+    def get(self, key, model_sha256, now):
+        connection = self.connect()
+        row = connection.execute(
+            "SELECT value FROM predictions WHERE key = ? AND model_sha256 = ? AND expires_at > ?",
+            (key, model_sha256, now)
+        ).fetchone()
+        if row is not None:
+            connection.execute("UPDATE predictions SET used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+        return None
+
+    def put(self, items, model_sha256, expires_at, now):
+        """Tahminleri yaz; sınır aşılınca süresi dolanları ve en eski kullanılanları sil"""
+        connection = self.connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                [(key, model_sha256, value, expires_at, now) for key, value in items]
+            )
+        count = connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        if count <= self.max_size:
+            return 0
+
+        with connection:
+            removed = connection.execute(
+                "DELETE FROM predictions WHERE expires_at <= ? OR model_sha256 != ?",
+                (now, model_sha256)
+            ).rowcount
+            overflow = count - removed - self.max_size
+            if overflow > 0:
+                removed += connection.execute(
+                    "DELETE FROM predictions WHERE key IN "
+                    "(SELECT key FROM predictions ORDER BY used_at LIMIT ?)",
+                    (overflow,)
+                ).rowcount
+        return removed
+
+    def clear(self):
+        with self.connect() as connection:
+            connection.execute("DELETE FROM predictions")
+
+
+class PredictionCache:
+    """LRU + TTL tahmin önbelleği (iş parçacığı güvenli)"""
+
+    def __init__(self, model_sha256=None, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL,
+                 km_bucket=DEFAULT_KM_BUCKET, store=None):
+        self.model_sha256 = model_sha256
+        self.max_size = max_size
+        self.ttl = ttl
+        self.km_bucket = km_bucket
+        self.store = store
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def set_model(self, model_sha256):
+        """Model değiştiyse işlem içi kayıtları temizle"""
+        with self.lock:
+            if model_sha256 != self.model_sha256:
+                self.model_sha256 = model_sha256
+                self.entries.clear()
+
+    def get(self, key, now=None, model_sha256=None):
+        """Anahtarın verilen modelle (varsayılan: güncel model) tahmini; yoksa veya süresi dolduysa None"""
+        now = time.time() if now is None else now
+        model_sha256 = self.model_sha256 if model_sha256 is None else model_sha256
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at, entry_sha256 = entry
+                if expires_at > now and entry_sha256 == model_sha256:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if expires_at <= now:
+                    del self.entries[key]
+                    self.expirations += 1
+
+        if self.store is not None:
+            value = self.store.get(json.dumps(key), model_sha256, now)
+            if value is not None:
+                with self.lock:
+                    self.hits += 1
+                    self._insert(key, value, now + self.ttl, model_sha256)
+                return value
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put_many(self, items, now=None, model_sha256=None):
+        """Verilen modelin (varsayılan: güncel model) (anahtar, tahmin) çiftlerini ekle"""
+        now = time.time() if now is None else now
+        model_sha256 = self.model_sha256 if model_sha256 is None else model_sha256
+        expires_at = now + self.ttl
+        with self.lock:
+            for key, value in items:
+                self._insert(key, value, expires_at, model_sha256)
+        if self.store is not None:
+            removed = self.store.put([(json.dumps(key), value) for key, value in items],
+                                     model_sha256, expires_at, now)
+            with self.lock:
+                self.evictions += removed
+
+    def _insert(self, key, value, expires_at, model_sha256):
+        self.entries[key] = (value, expires_at, model_sha256)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def predict(self, forms, predict_fn, model_sha256=None):
+        """
+        Form kayıtlarını önbellekle fiyatlandır
+
+        Önbellekte olmayan kanonik kayıtlar tek listede `predict_fn`'e verilir;
+        tekrarlanan kayıtlar bir kez tahmin edilir. `model_sha256`,
+        `predict_fn`'in kullandığı tahmin nesnesinin özetidir; verilirse
+        önbelleğin modeli buna geçer ve kayıtlar bu özetle okunup yazılır.
+        """
+        if model_sha256 is None:
+            model_sha256 = self.model_sha256
+        else:
+            self.set_model(model_sha256)
+        canonical = [canonicalize(form, self.km_bucket) for form in forms]
+        keys = [cache_key(record) for record in canonical]
+
+        results = {}
+        missing = {}
+        for key, record in zip(keys, canonical):
+            if key in results or key in missing:
+                continue
+            value = self.get(key, model_sha256=model_sha256)
+            if value is None:
+                missing[key] = record
+            else:
+                results[key] = value
+
+        if missing:
+            predictions = [float(value) for value in predict_fn(list(missing.values()))]
+            self.put_many(list(zip(missing, predictions)), model_sha256=model_sha256)
+            results.update(zip(missing, predictions))
+
+        return [results[key] for key in keys]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self):
+        """İsabet/kayıp/çıkarma sayaçları"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'isabet': self.hits,
+                'kayip': self.misses,
+                'cikarma': self.evictions,
+                'suresi_dolan': self.expirations,
+                'isabet_orani': round(self.hits / lookups, 4) if lookups else 0.0,
+                'boyut': len(self.entries),
+                'max_boyut': self.max_size,
+                'paylasimli': self.store is not None
+            }
+
+
+def load_prediction_cache(model_sha256=None, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL,
+                          km_bucket=DEFAULT_KM_BUCKET, db_path=None):
+    """
+    Model özetine bağlı önbellek oluştur
+
+    `model_sha256` tahmin nesnesinin `source_sha256` değeridir; verilmezse
+    özet her `predict` çağrısında verilmelidir. `db_path` verilmezse
+    PREDICTION_CACHE_DB ortam değişkenine bakılır; ikisi de yoksa önbellek
+    yalnızca işlem içidir.
+    """
+    db_path = db_path or os.environ.get(CACHE_DB_ENV)
+    store = SQLiteCacheStore(db_path, max_size=max_size) if db_path else None
+    return PredictionCache(
+        model_sha256=model_sha256,
+        max_size=max_size,
+        ttl=ttl,
+        km_bucket=km_bucket,
+        store=store
+    )
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Fiyat Tahmin Servisi
+
+Streamlit arayüzünden bağımsız, standart kütüphane ile yazılmış HTTP JSON
+servisi. Model ve kategori sözlükleri süreç başına bir kez yüklenir. Eş
+zamanlı istekler mikro-gruplara toplanır ve her grup tek `predict`
+çağrısıyla tahmin edilir.
+
+Kullanım:
+    python prediction_service.py --port 8000 --max-batch-size 64 --max-wait-ms 5
+
+İstek (tek kayıt veya kayıt listesi, alanlar kenar çubuğundaki gibi):
+    POST /predict
+    {"marka": "Fiat", "seri": "Egea", "model": "1.3 Multijet Easy",
+     "yil": 2018, "kilometre": 120000, "vites_tipi": "Düz", ...}
+
+Yanıt:
+    {"tahmini_fiyat": 562365.0}  veya  {"tahmini_fiyatlar": [...]}
+
+Bilinmeyen alanlar, eğitimde görülmemiş kategoriler ve sayı olmayan sayısal
+alanlar 400 ile, hatalı alanın adıyla reddedilir:
+    {"hata": "Bilinmeyen marka değeri: 'XYZ'"}
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from cleaning import FORM_DEFAULTS, FORM_FIELDS, PAINT_DAMAGE_SCORES, clean_form
+from feature_pipeline import load_feature_pipeline
+from model_loader import load_predictor
+from prediction_cache import DEFAULT_KM_BUCKET, DEFAULT_MAX_SIZE, DEFAULT_TTL, load_prediction_cache
+from preprocessing import load_preprocessing
+
+# İstekte kabul edilen alanlar
+REQUEST_FIELDS = set(FORM_FIELDS) | {'boya_durumu'}
+
+# Sayı olarak gönderilmesi gereken alanlar
+NUMERIC_FIELDS = {field for field, column in FORM_FIELDS.items() if column in FORM_DEFAULTS}
+
+# Tek istekteki en fazla kayıt sayısı
+MAX_RECORDS_PER_REQUEST = 10000
+
+# Bir isteğin tahmini beklediği en uzun süre (sn)
+REQUEST_TIMEOUT = 30
+
+
+def predict_records(records, predictor=None, pipeline=None):
+    """Form kayıtlarını tek `predict` çağrısıyla fiyatlandır"""
+    predictor = predictor or load_predictor()
+    pipeline = pipeline or load_feature_pipeline()
+    features = pipeline.transform(clean_form(pd.DataFrame.from_records(records)))
+    return np.round(predictor.predict(features)).astype(np.float64)
+
+
+class MicroBatcher:
+    """
+    Eş zamanlı istekleri tek tahmin çağrısında birleştirir
+
+    İlk kayıt geldikten sonra en fazla `max_wait_ms` beklenir veya
+    `max_batch_size` kayda ulaşılınca grup tahmin edilir. Her istek kendi
+    kayıtlarının sonuçlarını bir Future üzerinden alır.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.pending = queue.Queue()
+        self.batches = 0
+        self.records = 0
+        self.worker = threading.Thread(target=self.run, name='micro-batcher', daemon=True)
+        self.worker.start()
+
+    def submit(self, records):
+        """Kayıtları kuyruğa ekle; sonuçlar Future ile döner"""
+        future = Future()
+        self.pending.put((records, future))
+        return future
+
+    def collect(self):
+        """Bir sonraki grubu kuyruktan topla"""
+        batch = [self.pending.get()]
+        size = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def run(self):
+        """Grupları sırayla tahmin et"""
+        while True:
+            batch = self.collect()
+            records = [record for item, _ in batch for record in item]
+            try:
+                predictions = self.predict_fn(records)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.records += len(records)
+            start = 0
+            for item, future in batch:
+                future.set_result(predictions[start:start + len(item)].tolist())
+                start += len(item)
+
+    def stats(self):
+        """Toplam grup ve kayıt sayıları"""
+        return {
+            'gruplar': self.batches,
+            'kayitlar': self.records,
+            'ortalama_grup': round(self.records / self.batches, 2) if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000
+        }
+
+
+@lru_cache(maxsize=None)
+def allowed_values(preprocessing):
+    """Kategorik istek alanlarının eğitimde görülen değerleri"""
+    vocabularies = {**preprocessing.vocabularies, **preprocessing.one_hot}
+    allowed = {
+        field: frozenset(vocabularies[column])
+        for field, column in FORM_FIELDS.items() if column in vocabularies
+    }
+    allowed['boya_durumu'] = frozenset(PAINT_DAMAGE_SCORES)
+    return allowed
+
+
+def validate_record(record, allowed):
+    """Alan değerlerini denetle; hatalı alanı adıyla bildir"""
+    for field, value in record.items():
+        # null, alanın gönderilmemesiyle aynıdır
+        if value is None:
+            continue
+        if field in NUMERIC_FIELDS:
+            # bool JSON'da ayrı tiptir; NaN/Infinity json.loads ile gelebilir
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{field} alanı sayı olmalı: {value!r}")
+        elif field in allowed:
+            if not isinstance(value, str) or value not in allowed[field]:
+                raise ValueError(f"Bilinmeyen {field} değeri: {value!r}")
+
+
+def parse_payload(body, preprocessing=None):
+    """İstek gövdesini kayıt listesine çevir; tek kayıt olup olmadığını da döndür"""
+    allowed = allowed_values(preprocessing or load_preprocessing())
+    payload = json.loads(body)
+    single = isinstance(payload, dict)
+    records = [payload] if single else payload
+
+    if not isinstance(records, list) or not records:
+        raise ValueError("Gövde bir kayıt veya boş olmayan kayıt listesi olmalı")
+    if len(records) > MAX_RECORDS_PER_REQUEST:
+        raise ValueError(f"İstek başına en fazla {MAX_RECORDS_PER_REQUEST} kayıt gönderilebilir")
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError("Her kayıt bir JSON nesnesi olmalı")
+        unknown = set(record) - REQUEST_FIELDS
+        if unknown:
+            raise ValueError(f"Bilinmeyen alanlar: {sorted(unknown)}")
+        validate_record(record, allowed)
+    return records, single
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """/predict ve /health uç noktaları"""
+
+    protocol_version = 'HTTP/1.1'
+    batcher = None
+    cache = None
+    preprocessing = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            stats = {'durum': 'hazir', **self.batcher.stats()}
+            if self.cache is not None:
+                stats['onbellek'] = self.cache.stats()
+            self.send_json(200, stats)
+        else:
+            self.send_json(404, {'hata': 'Bulunamadı'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self.send_json(404, {'hata': 'Bulunamadı'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            records, single = parse_payload(self.rfile.read(length), self.preprocessing)
+        except ValueError as e:
+            self.send_json(400, {'hata': str(e)})
+            return
+
+        def predict(forms):
+            return self.batcher.submit(forms).result(timeout=REQUEST_TIMEOUT)
+
+        try:
+            if self.cache is None:
+                predictions = predict(records)
+            else:
+                # Önbellekte olmayan kayıtlar gruplayıcıya gider
+                predictions = self.cache.predict(records, predict)
+        except Exception as e:
+            self.send_json(500, {'hata': f"Tahmin yapılamadı: {e}"})
+            return
+
+        if single:
+            self.send_json(200, {'tahmini_fiyat': predictions[0]})
+        else:
+            self.send_json(200, {'tahmini_fiyatlar': predictions})
+
+    def log_message(self, format, *args):
+        # Yük altında her istek için satır yazılmaz
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    """Her bağlantıyı ayrı iş parçacığında karşılayan sunucu"""
+
+    daemon_threads = True
+    # Varsayılan dinleme kuyruğu (5) çok sayıda eş zamanlı bağlantıda taşar
+    request_queue_size = 128
+
+
+def create_server(host='127.0.0.1', port=8000, max_batch_size=64, max_wait_ms=5,
+                  cache_size=DEFAULT_MAX_SIZE, cache_ttl=DEFAULT_TTL, km_bucket=DEFAULT_KM_BUCKET,
+                  cache_db=None):
+    """Modeli yükleyip HTTP sunucusunu oluştur (cache_size=0 önbelleği kapatır)"""
+    predictor = load_predictor()
+    pipeline = load_feature_pipeline()
+    batcher = MicroBatcher(
+        lambda records: predict_records(records, predictor, pipeline),
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms
+    )
+
+    cache = None
+    if cache_size > 0:
+        # Tahmin nesnesi süreç boyunca sabit; önbellek onun özetine bağlanır
+        cache = load_prediction_cache(model_sha256=predictor.source_sha256, max_size=cache_size,
+                                      ttl=cache_ttl, km_bucket=km_bucket, db_path=cache_db)
+
+    handler = type('Handler', (PredictionHandler,), {
+        'batcher': batcher, 'cache': cache, 'preprocessing': pipeline.preprocessing
+    })
+    return PredictionServer((host, port), handler)
+
+
+def main():
+    """Komut satırı arayüzü"""
+    parser = argparse.ArgumentParser(description="Araç fiyat tahmini HTTP servisi")
+    parser.add_argument('--host', default='127.0.0.1', help="Dinlenecek adres")
+    parser.add_argument('--port', type=int, default=8000, help="Dinlenecek port")
+    parser.add_argument('--max-batch-size', type=int, default=64, help="Bir gruptaki en fazla kayıt")
+    parser.add_argument('--max-wait-ms', type=float, default=5, help="Grup dolması için en uzun bekleme (ms)")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_SIZE, help="Önbellek kayıt sınırı (0: kapalı)")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL, help="Önbellek kayıt ömrü (sn)")
+    parser.add_argument('--km-bucket', type=float, default=DEFAULT_KM_BUCKET, help="Kilometre yuvarlama aralığı")
+    parser.add_argument('--cache-db', help="Süreçler arası paylaşılan SQLite önbellek dosyası")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.max_batch_size, args.max_wait_ms,
+                           args.cache_size, args.cache_ttl, args.km_bucket, args.cache_db)
+    print(f"✅ Tahmin servisi hazır: http://{args.host}:{args.port}/predict "
+          f"(grup: {args.max_batch_size} kayıt / {args.max_wait_ms:g} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
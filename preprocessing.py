@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Ön İşleme Artefaktı
+
+Modelin eğitiminde (main.ipynb) kullanılan kategori sözlüklerini ve one-hot
+sütun sırasını bir kez hesaplayıp modelin yanına kaydeder. Uygulama her
+tahminde cars_tr.csv dosyasını okuyup LabelEncoder fit etmek yerine bu
+artefaktı işlem başına bir kez yükler.
+
+Artefaktı yeniden oluşturmak için:
+    python preprocessing.py
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, 'cars_tr.csv')
+MODEL_PATH = os.path.join(BASE_DIR, 'best_car_price_model.pkl')
+PREPROCESSING_PATH = os.path.join(BASE_DIR, 'car_price_preprocessing.json')
+
+# Artefakt formatı değiştiğinde artırılır
+ARTIFACT_VERSION = 2
+
+# Eğitimde LabelEncoder ile kodlanan sütunlar
+LABEL_COLUMNS = ['marka', 'seri', 'model', 'kasaTipi', 'cekisTipi']
+
+# Eğitimde pd.get_dummies ile kodlanan sütunlar ve önekleri
+ONE_HOT_COLUMNS = {
+    'vitesTipi': 'vites',
+    'yakitTuru': 'yakit',
+    'renk': 'renk'
+}
+
+# Eğitimde eksik olduğu için atılan satırların sütunları
+REQUIRED_COLUMNS = ['kasaTipi', 'cekisTipi', 'renk']
+
+# Eğitimde eksik değerleri doldurulan sayısal sütunlar ve yöntemleri
+FILL_STRATEGIES = {
+    'motorHacmi(Cc)': 'mean',
+    'motorGucu(HP)': 'mean',
+    'aracVergisi(TRY)': 'median'
+}
+
+# Notebook'ta REQUIRED_COLUMNS satırları atılmadan önce doldurulan sütunlar
+# (araç vergisi medyanı tüm satırlardan, motor ortalamaları kalan satırlardan)
+FILL_BEFORE_DROPNA = {'aracVergisi(TRY)'}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Dosyanın SHA-256 özetini hesapla"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_stamp_path(data_path=DATA_PATH):
+    """CSV özetinin kaydedildiği dosya (cars_tr.csv → cars_tr_sha256.json)"""
+    return os.path.splitext(data_path)[0] + '_sha256.json'
+
+
+def _save_data_stamp(data_path, sha256):
+    """Özeti CSV'nin (mtime_ns, boyut) değerleriyle kaydet; yazılamıyorsa atla"""
+    stat = os.stat(data_path)
+    record = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha256}
+    path = data_stamp_path(data_path)
+    try:
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+
+def data_stamp(data_path=DATA_PATH):
+    """
+    Artefaktları işaretleyen CSV özeti
+
+    Özet CSV'nin yanındaki kayıtta saklanır ve dosyanın (mtime_ns, boyut)
+    değerleri değişmedikçe yeniden hesaplanmaz. ingest.py satır eklediğinde
+    özet dosyanın tamamı okunmadan `extend_data_stamp` ile zincirlenir;
+    dosya başka bir yoldan değiştiyse tüm dosyanın SHA-256'sı alınır.
+    """
+    stat = os.stat(data_path)
+    try:
+        with open(data_stamp_path(data_path), encoding='utf-8') as f:
+            record = json.load(f)
+        if (record.get('mtime_ns'), record.get('size')) == (stat.st_mtime_ns, stat.st_size):
+            return record['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    sha256 = file_sha256(data_path)
+    _save_data_stamp(data_path, sha256)
+    return sha256
+
+
+def extend_data_stamp(data_path, previous, appended):
+    """CSV'nin sonuna `appended` baytları eklendikten sonraki özeti kaydet"""
+    sha256 = hashlib.sha256(f'{previous}:{hashlib.sha256(appended).hexdigest()}'.encode()).hexdigest()
+    _save_data_stamp(data_path, sha256)
+    return sha256
+
+
+def read_raw_dataset(path=DATA_PATH):
+    """Ham veri setini oku ve yer değiştirmiş sütun isimlerini düzelt"""
+    df = pd.read_csv(path)
+    df = df.rename(columns={
+        'kilometre(Km)': 'yıl_temp',
+        'yıl': 'kilometre(Km)',
+        'hasarGecmisi': 'tramer'
+    })
+    return df.rename(columns={'yıl_temp': 'yıl'})
+
+
+def fit_preprocessing(df, feature_columns, cleaned=None):
+    """Eğitimdeki adımlarla kategori sözlüklerini ve doldurma değerlerini çıkar"""
+    all_rows = df.index
+    df = df.dropna(subset=REQUIRED_COLUMNS)
+
+    # LabelEncoder sınıfları sıralı unique değerlerdir
+    vocabularies = {
+        column: sorted(df[column].dropna().unique().tolist())
+        for column in LABEL_COLUMNS
+    }
+
+    # pd.get_dummies sütunları da sıralı unique değerlerden oluşur
+    one_hot = {
+        column: sorted(df[column].dropna().unique().tolist())
+        for column in ONE_HOT_COLUMNS
+    }
+
+    feature_columns = list(feature_columns)
+    for column, prefix in ONE_HOT_COLUMNS.items():
+        missing = [f'{prefix}_{value}' for value in one_hot[column]
+                   if f'{prefix}_{value}' not in feature_columns]
+        if missing:
+            raise ValueError(f"Model sütunlarında bulunmayan kategoriler: {missing}")
+
+    # Eksik sayısal değerler notebook'taki sırayla, doldurulduğu adımdaki
+    # satırların ortalama/medyanı ile doldurulur
+    fill_values = {}
+    if cleaned is not None:
+        fill_values = {
+            column: float(getattr(
+                cleaned.loc[all_rows if column in FILL_BEFORE_DROPNA else df.index, column].astype('float64'),
+                strategy
+            )())
+            for column, strategy in FILL_STRATEGIES.items()
+        }
+
+    return {
+        'version': ARTIFACT_VERSION,
+        'vocabularies': vocabularies,
+        'one_hot': one_hot,
+        'fill_values': fill_values,
+        'feature_columns': feature_columns
+    }
+
+
+def build_preprocessing(data_path=DATA_PATH, model_path=MODEL_PATH,
+                        output_path=PREPROCESSING_PATH):
+    """Artefaktı veri setinden ve modelden oluşturup kaydet"""
+    import joblib
+    from dataset import load_dataset
+
+    model = joblib.load(model_path)
+    cleaned = load_dataset(data_path=data_path)
+    artifact = fit_preprocessing(cleaned, model.feature_names_in_, cleaned)
+    artifact['model_sha256'] = file_sha256(model_path)
+    artifact['data_sha256'] = data_stamp(data_path)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=1)
+
+    return Preprocessing(artifact)
+
+
+class Preprocessing:
+    """Yüklenmiş ön işleme artefaktı"""
+
+    def __init__(self, artifact):
+        if artifact.get('version') != ARTIFACT_VERSION:
+            raise ValueError(
+                f"Ön işleme artefaktı sürümü uyumsuz: {artifact.get('version')} "
+                f"(beklenen {ARTIFACT_VERSION})"
+            )
+        self.artifact = artifact
+        self.vocabularies = artifact['vocabularies']
+        self.one_hot = artifact['one_hot']
+        self.fill_values = artifact['fill_values']
+        self.feature_columns = artifact['feature_columns']
+        self.model_sha256 = artifact.get('model_sha256')
+
+        # Kategori -> kod sözlükleri
+        self.encoders = {
+            column: {value: code for code, value in enumerate(values)}
+            for column, values in self.vocabularies.items()
+        }
+        self.feature_index = {name: i for i, name in enumerate(self.feature_columns)}
+
+    @property
+    def n_features(self):
+        return len(self.feature_columns)
+
+    def encode(self, column, value):
+        """Kategorik değeri eğitimdeki koduna çevir"""
+        try:
+            return self.encoders[column][value]
+        except KeyError:
+            raise ValueError(f"Bilinmeyen {column} değeri: {value}") from None
+
+    def one_hot_columns(self, column):
+        """One-hot sütun isimleri (model sırasıyla)"""
+        prefix = ONE_HOT_COLUMNS[column]
+        return [f'{prefix}_{value}' for value in self.one_hot[column]]
+
+
+@lru_cache(maxsize=None)
+def load_preprocessing(path=PREPROCESSING_PATH):
+    """Artefaktı işlem başına bir kez yükle; yoksa veya sürümü eskiyse oluştur"""
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            artifact = json.load(f)
+        if artifact.get('version') == ARTIFACT_VERSION:
+            return Preprocessing(artifact)
+
+    return build_preprocessing(output_path=path)
+
+
+def main():
+    """Artefaktı yeniden oluştur"""
+    preprocessing = build_preprocessing()
+    print(f"✅ Ön işleme artefaktı kaydedildi: {PREPROCESSING_PATH}")
+    for column, values in preprocessing.vocabularies.items():
+        print(f"   {column}: {len(values)} kategori")
+    for column, value in preprocessing.fill_values.items():
+        print(f"   {column} doldurma değeri: {value:,.1f}")
+    print(f"   Özellik sayısı: {preprocessing.n_features}")
+
+
+if __name__ == "__main__":
+    main()
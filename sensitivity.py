@@ -0,0 +1,72 @@
+"""
+Fiyat Duyarlılık Eğrileri
+
+Seçilen araç yapılandırması için tahmini fiyatın kilometre, model yılı ve
+tramer tutarıyla nasıl değiştiğini hesaplar. Üç eğrinin tüm noktaları tek
+form tablosunda üretilir, bir kez temizlenip kodlanır ve tek `predict`
+çağrısıyla fiyatlandırılır.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prediction_cache import canonical_value
+
+# Eğri alanları: başlık, birim ve ızgara aralığı. Mevcut değer aralığın
+# dışındaysa üst sınır genişletilir
+CURVES = {
+    'kilometre': {'baslik': 'Kilometre', 'birim': 'km', 'min': 0, 'max': 500000},
+    'yil': {'baslik': 'Model Yılı', 'birim': '', 'min': 1990, 'max': 2024},
+    'tramer': {'baslik': 'Tramer Tutarı', 'birim': 'TL', 'min': 0, 'max': 200000}
+}
+
+# Kilometre ve tramer eğrilerindeki nokta sayısı
+DEFAULT_POINTS = 200
+
+
+def curve_grid(field, current=None, points=DEFAULT_POINTS):
+    """
+    Alanın ızgarası
+
+    Model yılı tamsayı yıllardan oluşur; ağaçlar yıllar arasında bölündüğü
+    için ara değerler yeni bilgi taşımaz.
+    """
+    spec = CURVES[field]
+    if field == 'yil':
+        upper = spec['max'] if current is None else max(spec['max'], int(current))
+        return np.arange(spec['min'], upper + 1, dtype=np.float64)
+
+    upper = spec['max'] if current is None else max(spec['max'], current * 1.2)
+    return np.linspace(spec['min'], upper, points)
+
+
+def sensitivity_forms(form, points=DEFAULT_POINTS):
+    """Üç eğrinin tüm noktalarını içeren form tablosu ve eğri dilimleri"""
+    current = {field: canonical_value(field, form.get(field), km_bucket=0) for field in CURVES}
+    grids = {field: curve_grid(field, current[field], points) for field in CURVES}
+    n_rows = sum(len(grid) for grid in grids.values())
+
+    columns = {field: [value] * n_rows for field, value in form.items() if field not in CURVES}
+    slices = {}
+    start = 0
+    for field, grid in grids.items():
+        # Alan kendi eğrisinde ızgara değerini, diğer eğrilerde formdaki değerini alır
+        values = np.full(n_rows, np.nan if current[field] is None else current[field])
+        values[start:start + len(grid)] = grid
+        columns[field] = values
+        slices[field] = slice(start, start + len(grid))
+        start += len(grid)
+
+    return pd.DataFrame(columns), grids, slices
+
+
+def price_curves(form, predict_forms, points=DEFAULT_POINTS):
+    """
+    Kilometre, yıl ve tramer için fiyat eğrileri
+
+    `predict_forms` form tablosunu alıp fiyat dizisi döndürür ve bir kez
+    çağrılır. Sonuç {alan: (ızgara, fiyatlar)} sözlüğüdür.
+    """
+    forms, grids, slices = sensitivity_forms(form, points)
+    prices = np.asarray(predict_forms(forms), dtype=np.float64)
+    return {field: (grids[field], prices[slices[field]]) for field in CURVES}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Genel SHAP Özeti
+
+Temizlenmiş veri setinin her satırı için SHAP değerlerini parçalar halinde,
+süreç havuzunda hesaplar ve N×43 float32 diziyi bellek eşlemeli .npy
+dosyasına yazar. Satır sırası ilan numaralarıyla, beeswarm renkleri için
+özellik değerlerinin veri setindeki yüzdelik sıraları ayrı dosyalarda tutulur.
+Açıklanabilirlik sayfası özet grafikleri bu dosyalardan, yeniden hesap
+yapmadan çizer.
+
+Özet yalnızca model dosyasının (veya veri setinin) özeti değiştiğinde
+yeniden oluşturulur:
+    python shap_summary.py --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from explanations import BACKENDS, DEFAULT_BACKEND, explain, load_explainer
+from preprocessing import BASE_DIR, DATA_PATH, MODEL_PATH, data_stamp, file_sha256
+
+SUMMARY_PATH = os.path.join(BASE_DIR, 'shap_values.npy')
+SUMMARY_ROWS_PATH = os.path.join(BASE_DIR, 'shap_values_rows.npy')
+SUMMARY_PERCENTILES_PATH = os.path.join(BASE_DIR, 'shap_values_percentiles.npy')
+SUMMARY_META_PATH = os.path.join(BASE_DIR, 'shap_values.json')
+
+# Özet formatı değiştiğinde artırılır
+SUMMARY_VERSION = 2
+
+# Özetlerde bir seferde belleğe alınan satır sayısı
+READ_CHUNK_SIZE = 50000
+
+
+def init_worker(backend):
+    """Her süreçte açıklayıcıyı bir kez kur"""
+    load_explainer(backend)
+
+
+def explain_chunk(path, start, features, backend):
+    """Parçanın SHAP değerlerini hesaplayıp bellek eşlemeli dosyadaki yerine yaz"""
+    values = np.load(path, mmap_mode='r+')
+    values[start:start + len(features)] = explain(features, backend)
+    values.flush()
+    return len(features)
+
+
+def read_meta(path=SUMMARY_META_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_current(meta, model_path=MODEL_PATH, data_path=DATA_PATH):
+    """Özet mevcut model ve veri setiyle üretilmiş mi"""
+    return (
+        meta is not None
+        and meta.get('version') == SUMMARY_VERSION
+        and meta.get('model_sha256') == file_sha256(model_path)
+        and (not os.path.exists(data_path) or meta.get('data_sha256') == data_stamp(data_path))
+    )
+
+
+def summary_stat(paths=(SUMMARY_META_PATH, SUMMARY_PATH, MODEL_PATH, DATA_PATH)):
+    """
+    Dosyaların (mtime_ns, boyut) değerleri; eksik dosyalar None
+
+    Sayfa özeti bu değerlerle önbelleğe alır; dosyalar yalnızca biri
+    değiştiğinde yeniden özetlenir.
+    """
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stats.append(None)
+        else:
+            stats.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+def feature_percentiles(features):
+    """Her özelliğin veri setindeki yüzdelik sırası (eksikler 0.5)"""
+    ranks = pd.DataFrame(features).rank(pct=True).to_numpy(dtype=np.float32)
+    return np.nan_to_num(ranks, nan=0.5)
+
+
+def build_shap_summary(workers=1, chunk_size=1000, backend=DEFAULT_BACKEND,
+                       output_path=SUMMARY_PATH, rows_path=SUMMARY_ROWS_PATH,
+                       percentiles_path=SUMMARY_PERCENTILES_PATH,
+                       meta_path=SUMMARY_META_PATH, model_path=MODEL_PATH, data_path=DATA_PATH):
+    """
+    Tüm veri setinin SHAP değerlerini hesaplayıp kaydet
+
+    Değerler önce geçici dosyaya yazılır ve iş bitince yerine taşınır;
+    sayfa hiçbir zaman yarım kalmış bir dosyayı okumaz. Meta dosyası en son
+    yazılır.
+    """
+    from dataset import load_dataset
+    from feature_pipeline import load_feature_pipeline
+
+    df = load_dataset(data_path=data_path)
+    pipeline = load_feature_pipeline()
+    features = pipeline.transform(df)
+
+    temp_path = output_path + '.tmp.npy'
+    np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float32,
+                              shape=features.shape).flush()
+
+    starts = range(0, len(features), chunk_size)
+    if workers <= 1:
+        for start in starts:
+            explain_chunk(temp_path, start, features[start:start + chunk_size], backend)
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(backend,)) as pool:
+            futures = [pool.submit(explain_chunk, temp_path, start,
+                                   features[start:start + chunk_size], backend)
+                       for start in starts]
+            for future in futures:
+                future.result()
+
+    os.replace(temp_path, output_path)
+    np.save(rows_path, df['ilanID'].to_numpy(dtype=np.int64))
+    np.save(percentiles_path, feature_percentiles(features))
+
+    meta = {
+        'version': SUMMARY_VERSION,
+        'backend': backend,
+        'model_sha256': file_sha256(model_path),
+        'data_sha256': data_stamp(data_path),
+        'rows': len(features),
+        'feature_columns': pipeline.feature_columns,
+        'expected_value': float(np.ravel(load_explainer(backend).expected_value)[0])
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+
+    return ShapSummary(np.load(output_path, mmap_mode='r'), np.load(rows_path), meta,
+                       np.load(percentiles_path, mmap_mode='r'))
+
+
+class ShapSummary:
+    """Bellek eşlemeli SHAP değerleri, satır indeksi ve özellik yüzdelikleri"""
+
+    def __init__(self, values, rows, meta, percentiles):
+        self.values = values
+        self.rows = rows
+        self.meta = meta
+        self.percentiles = percentiles
+        self.feature_columns = meta['feature_columns']
+        self.expected_value = meta['expected_value']
+
+    def __len__(self):
+        return len(self.values)
+
+    def chunks(self):
+        for start in range(0, len(self.values), READ_CHUNK_SIZE):
+            yield start, np.abs(self.values[start:start + READ_CHUNK_SIZE])
+
+    def mean_abs(self):
+        """Özellik başına ortalama |SHAP|"""
+        total = np.zeros(self.values.shape[1])
+        for _, chunk in self.chunks():
+            total += chunk.sum(axis=0)
+        return total / max(len(self), 1)
+
+    def mean_abs_by_group(self, codes, n_groups):
+        """
+        Grup başına (ör. marka) ortalama |SHAP|, (n_groups, 43)
+
+        `codes` satır sırasıyla grup kodlarıdır; eksik gruplar -1 olur.
+        """
+        codes = np.asarray(codes)
+        totals = np.zeros((n_groups, self.values.shape[1]))
+        counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+        for start, chunk in self.chunks():
+            chunk_codes = codes[start:start + len(chunk)]
+            known = chunk_codes >= 0
+            for column in range(chunk.shape[1]):
+                totals[:, column] += np.bincount(chunk_codes[known], weights=chunk[known, column],
+                                                 minlength=n_groups)
+        with np.errstate(invalid='ignore'):
+            return totals / counts[:, None]
+
+    def sample(self, n, seed=0):
+        """Grafikler için satır sırasıyla rastgele n satırın konumları"""
+        if n >= len(self):
+            return np.arange(len(self))
+        return np.sort(np.random.default_rng(seed).choice(len(self), n, replace=False))
+
+
+def load_shap_summary(path=SUMMARY_PATH, rows_path=SUMMARY_ROWS_PATH,
+                      percentiles_path=SUMMARY_PERCENTILES_PATH, meta_path=SUMMARY_META_PATH,
+                      model_path=MODEL_PATH, data_path=DATA_PATH):
+    """Özeti bellek eşlemeyle aç; yoksa veya model/veri değiştiyse None"""
+    meta = read_meta(meta_path)
+    if not is_current(meta, model_path, data_path) or not os.path.exists(path):
+        return None
+    return ShapSummary(np.load(path, mmap_mode='r'), np.load(rows_path), meta,
+                       np.load(percentiles_path, mmap_mode='r'))
+
+
+def main():
+    """Özeti gerekiyorsa yeniden oluştur"""
+    parser = argparse.ArgumentParser(description="Tüm veri seti için SHAP değerlerini hesapla")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Paralel süreç sayısı")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Parça başına satır sayısı")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND, help="Açıklama arka ucu")
+    parser.add_argument('--force', action='store_true', help="Model değişmemiş olsa da yeniden oluştur")
+    args = parser.parse_args()
+
+    if not args.force and is_current(read_meta()):
+        print(f"✅ SHAP özeti güncel: {SUMMARY_PATH}")
+        return
+
+    start = time.perf_counter()
+    summary = build_shap_summary(args.workers, args.chunk_size, args.backend)
+    elapsed = time.perf_counter() - start
+    print(f"✅ SHAP özeti kaydedildi: {SUMMARY_PATH}")
+    print(f"   {len(summary):,} satır × {len(summary.feature_columns)} özellik, "
+          f"{elapsed:.1f} sn ({args.workers} süreç, {args.backend})")
+    print(f"   Boyut: {os.path.getsize(SUMMARY_PATH) / 1024:,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+YOLO Hasar Modeli Dışa Aktarımı
+
+Exper Online'daki `model/best.pt` modelini CPU'da hızlı çalışması için bir
+kez ONNX'e aktarır ve isteğe bağlı olarak yerel fotoğraflarla kalibre
+edilmiş INT8 (statik, QDQ) sürümünü üretir. ONNX modelleri ultralytics
+tarafından ONNX Runtime ile çalıştırılır; sonuç nesneleri PyTorch modeliyle
+aynıdır.
+
+Dışa aktarılan dosyalar kaynak modelin SHA-256 özetini ONNX meta verisinde
+taşır; best.pt değişirse eski dosyalar kullanılmaz.
+
+Kullanım:
+    python yolo_export.py
+    python yolo_export.py --int8 --calibration fotograflar/ --calibration-count 128
+"""
+
+import argparse
+import glob
+import os
+import shutil
+from importlib.util import find_spec
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+YOLO_MODEL_PATH = os.path.join(BASE_DIR, 'model', 'best.pt')
+ONNX_MODEL_PATH = os.path.join(BASE_DIR, 'model', 'best.onnx')
+INT8_MODEL_PATH = os.path.join(BASE_DIR, 'model', 'best.int8.onnx')
+
+# Kullanılacak arka uç: auto (INT8 > ONNX > torch), int8, onnx veya torch
+BACKEND_ENV = 'YOLO_BACKEND'
+BACKENDS = ['int8', 'onnx', 'torch']
+
+IMAGE_SIZE = 640
+CALIBRATION_COUNT = 64
+
+# ONNX meta verisinde kaynak modelin özeti
+SOURCE_KEY = 'source_sha256'
+
+
+def onnx_metadata(path):
+    """ONNX modelinin meta verisi (metadata_props)"""
+    import onnx
+
+    model = onnx.load(path, load_external_data=False)
+    return {prop.key: prop.value for prop in model.metadata_props}
+
+
+def stamp_metadata(path, metadata):
+    """ONNX modelinin meta verisine anahtarlar ekle"""
+    import onnx
+
+    model = onnx.load(path)
+    existing = {prop.key: prop for prop in model.metadata_props}
+    for key, value in metadata.items():
+        if key in existing:
+            existing[key].value = str(value)
+        else:
+            model.metadata_props.add(key=key, value=str(value))
+    onnx.save(model, path)
+
+
+def export_onnx(model_path=YOLO_MODEL_PATH, output_path=ONNX_MODEL_PATH, imgsz=IMAGE_SIZE):
+    """best.pt'yi dinamik boyutlu (toplu tespit için) FP32 ONNX'e aktar"""
+    from ultralytics import YOLO
+
+    from preprocessing import file_sha256
+
+    exported = YOLO(model_path).export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+    if os.path.abspath(exported) != os.path.abspath(output_path):
+        shutil.move(exported, output_path)
+    stamp_metadata(output_path, {SOURCE_KEY: file_sha256(model_path)})
+    return output_path
+
+
+def calibration_images(directory, count=CALIBRATION_COUNT):
+    """Kalibrasyon klasöründeki ilk `count` fotoğraf"""
+    paths = sorted(
+        path for pattern in ('*.jpg', '*.jpeg', '*.png')
+        for path in glob.glob(os.path.join(directory, pattern))
+    )
+    if not paths:
+        raise FileNotFoundError(f"Kalibrasyon fotoğrafı bulunamadı: {directory}")
+    return paths[:count]
+
+
+def letterbox(path, imgsz=IMAGE_SIZE):
+    """Fotoğrafı ultralytics gibi oranı koruyarak kare girdiye yerleştir (1x3xHxW, 0-1)"""
+    import numpy as np
+    from PIL import Image, ImageOps
+
+    image = ImageOps.pad(Image.open(path).convert('RGB'), (imgsz, imgsz), color=(114, 114, 114))
+    return (np.asarray(image, dtype=np.float32) / 255.0).transpose(2, 0, 1)[None]
+
+
+def calibration_reader(paths, input_name, imgsz=IMAGE_SIZE):
+    """quantize_static için fotoğrafları tek tek veren okuyucu"""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class Reader(CalibrationDataReader):
+        def __init__(self):
+            self.batches = ({input_name: letterbox(path, imgsz)} for path in paths)
+
+        def get_next(self):
+            return next(self.batches, None)
+
+    return Reader()
+
+
+def detect_head_nodes(path):
+    """
+    Detect başlığının evrişim dalları (cv2/cv3) dışındaki düğümleri (DFL,
+    Sigmoid, Concat...)
+
+    Kutu çözme adımları INT8'de doğruluğu en çok bozan kısımdır; FP32 kalırlar.
+    """
+    import onnx
+
+    graph = onnx.load(path).graph
+    modules = [node.name.split('/')[1] for node in graph.node if node.name.startswith('/model.')]
+    if not modules:
+        return []
+    head = max(modules, key=lambda module: int(module.split('.')[1]))
+    return [node.name for node in graph.node
+            if node.name.startswith(f'/{head}/')
+            and not node.name.startswith((f'/{head}/cv2', f'/{head}/cv3'))]
+
+
+def quantize_int8(onnx_path=ONNX_MODEL_PATH, output_path=INT8_MODEL_PATH, calibration_dir=None,
+                  count=CALIBRATION_COUNT, imgsz=IMAGE_SIZE):
+    """FP32 ONNX modelini yerel fotoğraflarla kalibre ederek INT8'e çevir"""
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    reader = calibration_reader(calibration_images(calibration_dir, count), input_name, imgsz)
+    quantize_static(
+        onnx_path, output_path, reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        nodes_to_exclude=detect_head_nodes(onnx_path)
+    )
+    # Sınıf isimleri, stride ve girdi boyutu ultralytics için FP32 modelden taşınır
+    stamp_metadata(output_path, {**onnx_metadata(onnx_path), 'quantization': 'int8'})
+    return output_path
+
+
+def resolve_yolo_model(backend=None, model_path=YOLO_MODEL_PATH, onnx_path=ONNX_MODEL_PATH,
+                       int8_path=INT8_MODEL_PATH):
+    """
+    Exper Online'ın yükleyeceği (dosya, arka uç) çifti
+
+    `backend` verilmezse YOLO_BACKEND ortam değişkeni, o da yoksa 'auto'
+    kullanılır: güncel INT8 > güncel ONNX > best.pt. ONNX dosyaları
+    onnxruntime kurulu değilse veya başka bir best.pt'den üretilmişse atlanır.
+    """
+    backend = backend or os.environ.get(BACKEND_ENV, 'auto')
+    candidates = BACKENDS if backend == 'auto' else [backend]
+    paths = {'int8': int8_path, 'onnx': onnx_path, 'torch': model_path}
+
+    source_sha256 = None
+    for name in candidates:
+        path = paths[name]
+        if name == 'torch' or not os.path.exists(path):
+            continue
+        if find_spec('onnxruntime') is None or find_spec('onnx') is None:
+            break
+        if os.path.exists(model_path):
+            if source_sha256 is None:
+                from preprocessing import file_sha256
+
+                source_sha256 = file_sha256(model_path)
+            if onnx_metadata(path).get(SOURCE_KEY) != source_sha256:
+                continue
+        return path, name
+    return model_path, 'torch'
+
+
+def yolo_model_stat(model_path=YOLO_MODEL_PATH, onnx_path=ONNX_MODEL_PATH, int8_path=INT8_MODEL_PATH):
+    """
+    Model dosyalarının (mtime_ns, boyut) değerleri
+
+    Exper Online bu değer değiştiğinde (ör. sonradan ONNX/INT8 dışa
+    aktarımı) modeli `resolve_yolo_model` ile yeniden çözüp yükler.
+    """
+    stats = []
+    for path in (model_path, onnx_path, int8_path):
+        try:
+            stat = os.stat(path)
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stats.append(None)
+    return tuple(stats)
+
+
+def main():
+    """ONNX (ve isteğe bağlı INT8) modelini dışa aktar"""
+    parser = argparse.ArgumentParser(description="YOLO hasar modelini ONNX / INT8 olarak dışa aktar")
+    parser.add_argument('--model', default=YOLO_MODEL_PATH, help="Kaynak PyTorch modeli")
+    parser.add_argument('--imgsz', type=int, default=IMAGE_SIZE, help="Girdi boyutu")
+    parser.add_argument('--int8', action='store_true', help="INT8 modeli de üret")
+    parser.add_argument('--calibration', default=None, help="INT8 kalibrasyon fotoğrafları klasörü")
+    parser.add_argument('--calibration-count', type=int, default=CALIBRATION_COUNT, help="Kalibrasyon fotoğraf sayısı")
+    args = parser.parse_args()
+
+    if args.int8 and args.calibration is None:
+        parser.error("--int8 için --calibration klasörü gerekli")
+
+    path = export_onnx(args.model, imgsz=args.imgsz)
+    print(f"✅ ONNX modeli kaydedildi: {path} ({os.path.getsize(path) / 1024 ** 2:.1f} MB)")
+    if args.int8:
+        path = quantize_int8(path, calibration_dir=args.calibration, count=args.calibration_count, imgsz=args.imgsz)
+        print(f"✅ INT8 modeli kaydedildi: {path} ({os.path.getsize(path) / 1024 ** 2:.1f} MB)")
+    print(f"   Exper Online arka ucu: {resolve_yolo_model(model_path=args.model)[1]}")
+
+
+if __name__ == "__main__":
+    main()